@@ -22,12 +22,13 @@ setup(
     python_requires=">=3.10",
     install_requires=[
         "litellm>=1.70.0",
-        "graphviz>=0.20.0"
+        "graphviz>=0.20.0",
+        "orjson>=3.9.0"
     ],
     extras_require={
         "web": [
             "fastapi>=0.104.0",
-            "uvicorn>=0.24.0"
+            "uvicorn[standard]>=0.24.0"
         ]
     },
     classifiers=[
@@ -11,5 +11,6 @@ from thinagents.core.agent import Agent
 from thinagents.core.response_models import ThinagentResponse
 from thinagents.memory import BaseMemory, InMemoryStore, FileMemory, ConversationInfo
 from thinagents.core.mcp import MCPServerConfig
+from thinagents.core.cache import CacheBackend, MemoryCache, SemanticCache
 
-__all__ = ["tool", "Toolkit", "Agent", "ThinagentResponse", "BaseMemory", "InMemoryStore", "FileMemory", "ConversationInfo", "MCPServerConfig"]
\ No newline at end of file
+__all__ = ["tool", "Toolkit", "Agent", "ThinagentResponse", "BaseMemory", "InMemoryStore", "FileMemory", "ConversationInfo", "MCPServerConfig", "CacheBackend", "MemoryCache", "SemanticCache"]
\ No newline at end of file
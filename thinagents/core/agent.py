@@ -2,11 +2,12 @@
 Module implementing the Agent class for orchestrating LLM interactions and tool execution.
 """
 
+import hashlib
 import json
 import logging
 import asyncio
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, Iterator, AsyncIterator, TypeVar, Generic, cast, overload, Literal
-from concurrent.futures import TimeoutError
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union, Iterator, AsyncIterator, TypeVar, Generic, cast, overload, Literal
+from concurrent.futures import Future, TimeoutError
 import litellm
 from litellm import completion as litellm_completion
 from pydantic import BaseModel, ValidationError # type: ignore
@@ -14,20 +15,42 @@ from thinagents.tools.tool import ThinAgentsTool, tool as tool_decorator
 from thinagents.tools.toolkit import Toolkit
 from thinagents.memory import BaseMemory, ConversationInfo
 from thinagents.utils.prompts import PromptConfig
+from thinagents.utils.serialization import TOON_FORMAT_HINT, ToolResultFormat, encode_for_llm, from_json, to_json
 from thinagents.core.response_models import (
     ThinagentResponse,
     ThinagentResponseStream,
     UsageMetrics,
-    CompletionTokensDetails,
-    PromptTokensDetails,
 )
 from thinagents.core.mcp import MCPManager, MCPServerConfig, normalize_mcp_servers
+from thinagents.core.cache import CacheBackend, SemanticCache, make_cache_key
 from thinagents.utils.thread_pool_manager import (
     ThreadPoolConfig,
     get_thread_pool_manager,
     execute_tool_in_thread,
+    ToolNotStartedError,
 )
 
+def _pydantic_default(obj: Any) -> Any:
+    """JSON `default` hook that serializes pydantic models nested in tool results."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    return from_json(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    return to_json(obj, default=_pydantic_default)
+
+try:
+    from json_repair import repair_json
+    JSON_REPAIR_AVAILABLE = True
+except ImportError:  # pragma: no cover - json_repair is optional
+    repair_json = None  # type: ignore[assignment]
+    JSON_REPAIR_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 _ExpectedContentType = TypeVar('_ExpectedContentType', bound=BaseModel)
@@ -36,6 +59,13 @@ DEFAULT_MAX_STEPS = 15
 DEFAULT_TOOL_TIMEOUT = 30.0
 MAX_JSON_CORRECTION_ATTEMPTS = 3
 
+# Fields of a litellm assistant message that are replayed to the model
+_ASSISTANT_MESSAGE_FIELDS: Dict[str, Any] = {
+    "role": True,
+    "content": True,
+    "tool_calls": {"__all__": {"id": True, "type": True, "function": {"name", "arguments"}}},
+}
+
 
 class AgentError(Exception):
     """Base exception for Agent-related errors."""
@@ -57,6 +87,15 @@ class AsyncToolInSyncContextError(AgentError):
     pass
 
 
+def _unwrap_tool_schema(schema_data: Any) -> Dict:
+    """Extract the OpenAI tool schema from the `tool_schema()` wrapper format."""
+    if isinstance(schema_data, dict) and "tool_schema" in schema_data:
+        # new format with return_type metadata
+        return schema_data["tool_schema"]
+    # legacy format - direct schema
+    return schema_data
+
+
 def generate_tool_schemas(
     tools: List[Union[ThinAgentsTool, Callable, Toolkit]],
 ) -> Tuple[List[Dict], Dict[str, Callable]]:
@@ -72,54 +111,22 @@ def generate_tool_schemas(
     Raises:
         AgentError: If tool schema generation fails.
     """
-    tool_schemas = []
+    tool_schemas: List[Dict] = []
     tool_maps: Dict[str, Callable] = {}
 
     for tool in tools:
         try:
             if isinstance(tool, Toolkit):
                 # Handle toolkit instances by extracting their tools
-                toolkit_tools = tool.get_tools()
-                for toolkit_tool in toolkit_tools:
-                    schema_data = toolkit_tool.tool_schema()
-                    tool_maps[toolkit_tool.__name__] = toolkit_tool
-                    
-                    # extract the actual OpenAI tool schema from our wrapper format
-                    if isinstance(schema_data, dict) and "tool_schema" in schema_data:
-                        # new format with return_type metadata
-                        actual_schema = schema_data["tool_schema"]
-                    else:
-                        # legacy format - direct schema
-                        actual_schema = schema_data
-                    
-                    tool_schemas.append(actual_schema)
+                resolved_tools = tool.get_tools()
             elif isinstance(tool, ThinAgentsTool) or hasattr(tool, 'tool_schema'):
-                schema_data = tool.tool_schema()
-                tool_maps[tool.__name__] = tool
-                
-                # extract the actual OpenAI tool schema from our wrapper format
-                if isinstance(schema_data, dict) and "tool_schema" in schema_data:
-                    # new format with return_type metadata
-                    actual_schema = schema_data["tool_schema"]
-                else:
-                    # legacy format - direct schema
-                    actual_schema = schema_data
-                
-                tool_schemas.append(actual_schema)
+                resolved_tools = [tool]
             else:
-                _tool = tool_decorator(tool)
-                schema_data = _tool.tool_schema()
-                tool_maps[_tool.__name__] = _tool
-                
-                # extract the actual OpenAI tool schema from our wrapper format
-                if isinstance(schema_data, dict) and "tool_schema" in schema_data:
-                    # new format with return_type metadata
-                    actual_schema = schema_data["tool_schema"]
-                else:
-                    # legacy format - direct schema
-                    actual_schema = schema_data
-                
-                tool_schemas.append(actual_schema)
+                resolved_tools = [tool_decorator(tool)]
+
+            for resolved in resolved_tools:
+                tool_maps[resolved.__name__] = resolved
+                tool_schemas.append(_unwrap_tool_schema(resolved.tool_schema()))
         except Exception as e:
             logger.error(f"Failed to generate schema for tool {tool}: {e}")
             raise AgentError(f"Tool schema generation failed for {tool}: {e}") from e
@@ -127,6 +134,12 @@ def generate_tool_schemas(
     return tool_schemas, tool_maps
 
 
+def _supports_prompt_caching(model: str) -> bool:
+    """Whether the model accepts Anthropic-style `cache_control` breakpoints."""
+    model_name = model.lower()
+    return model_name.startswith("anthropic/") or "claude" in model_name
+
+
 def _validate_agent_config(
     name: str,
     model: str,
@@ -161,11 +174,21 @@ class Agent(Generic[_ExpectedContentType]):
         thread_pool_config: Optional[ThreadPoolConfig] = None,
         response_format: Optional[Type[_ExpectedContentType]] = None,
         enable_schema_validation: bool = True,
+        fast_validate: bool = True,
         description: Optional[str] = None,
         tool_timeout: float = DEFAULT_TOOL_TIMEOUT,
         memory: Optional[BaseMemory] = None,
         mcp_servers: Optional[List[MCPServerConfig]] = None,
+        mcp_cache_dir: Optional[str] = None,
         granular_stream: bool = True,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: int = 3600,
+        prompt_caching: Optional[bool] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        dedupe_tool_calls: bool = True,
+        tool_result_format: ToolResultFormat = "json",
+        tool_cache: Optional[CacheBackend] = None,
+        tool_cache_ttl: int = 300,
         **kwargs,
     ):
         """
@@ -202,6 +225,10 @@ class Agent(Generic[_ExpectedContentType]):
                 This should be a Pydantic model.
             enable_schema_validation: If True, enables schema validation for the response format.
                 Defaults to True.
+            fast_validate: If True, the response format is validated only once by the agent itself
+                (which also drives the JSON correction retries) and litellm's own JSON schema
+                validation is left disabled. Set to False to also have litellm validate every
+                completion. Defaults to True.
             description: Optional description for the agent.
             tool_timeout: Timeout in seconds for tool execution. Defaults to 30.0.
             memory: Optional BaseMemory instance for storing conversation history and context.
@@ -212,6 +239,34 @@ class Agent(Generic[_ExpectedContentType]):
                 Each server config should be a dict with 'command' and 'args' keys.
                 Example: [{"command": "uv", "args": ["run", "weather_server.py"]}]
                 MCP tools will be loaded asynchronously and are only available when using arun().
+            mcp_cache_dir: Optional directory (e.g. "~/.cache/thinagents/mcp") where MCP tool listings are
+                persisted, keyed by a hash of each server config, so later processes skip tool discovery.
+                Entries expire after a day; delete the directory after changing a server's tools.
+            cache: Optional CacheBackend (e.g. `MemoryCache`) used to reuse LLM responses for
+                identical requests (model, endpoint, messages, tools, response_format and every
+                other completion kwarg). Caching only applies when `temperature=0` is passed
+                explicitly.
+            cache_ttl: Time-to-live in seconds for cached responses. Defaults to 3600.
+            prompt_caching: Whether to mark the system prompt and tool definitions with Anthropic
+                `cache_control` breakpoints so the provider can reuse the static prefix across calls. Defaults to
+                None, which enables it automatically for Anthropic/Claude models. Changing the
+                prompt or instructions between runs defeats the provider cache.
+            semantic_cache: Optional SemanticCache used to return a previous final response for an
+                identical or semantically similar input, skipping the LLM entirely. Only applies to
+                non-streaming runs without conversation history. Hits are returned with
+                finish_reason="cache_hit".
+            dedupe_tool_calls: If True, identical calls (same tool and arguments) to a tool declared
+                with `@tool(cacheable=True)` in a single step are executed once and the result is
+                shared by every matching tool_call_id. Tools that are not marked cacheable are
+                always run once per call, so repeated side effects are preserved. Defaults to True.
+            tool_result_format: Encoding used for structured (dict/list/pydantic) tool results sent
+                back to the model: "json" (default), "toon" for compact Token-Oriented Object
+                Notation on flat/tabular data, or "yaml" (requires PyYAML). Results without a
+                compact form fall back to JSON. String results are always passed through as-is.
+            tool_cache: Optional CacheBackend used to reuse results of tools declared with
+                `@tool(cacheable=True)` for identical arguments, across steps and runs. The same
+                cache can be shared by several agents.
+            tool_cache_ttl: Time-to-live in seconds for cached tool results. Defaults to 300.
             **kwargs: Additional keyword arguments that will be passed directly to the `litellm.completion` function.
         """
         _validate_agent_config(name, model, max_steps)
@@ -230,8 +285,13 @@ class Agent(Generic[_ExpectedContentType]):
 
         self.response_format_model_type = response_format
         self.enable_schema_validation = enable_schema_validation
+        self.fast_validate = fast_validate
+        # Schema text for JSON correction prompts, rendered on the first failure
+        self._response_schema_json: Optional[str] = None
         if self.response_format_model_type:
-            litellm.enable_json_schema_validation = self.enable_schema_validation
+            # The agent validates structured output itself; litellm's validation would parse
+            # and validate the same payload a second time on every completion.
+            litellm.enable_json_schema_validation = self.enable_schema_validation and not self.fast_validate
 
         self.propagate_subagent_instructions = propagate_subagent_instructions
 
@@ -247,12 +307,23 @@ class Agent(Generic[_ExpectedContentType]):
 
         self.kwargs = kwargs
 
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.prompt_caching = _supports_prompt_caching(model) if prompt_caching is None else prompt_caching
+        self.semantic_cache = semantic_cache
+        self.dedupe_tool_calls = dedupe_tool_calls
+        if tool_result_format not in ("json", "toon", "yaml"):
+            raise ValueError("tool_result_format must be one of 'json', 'toon' or 'yaml'")
+        self.tool_result_format: ToolResultFormat = tool_result_format
+        self.tool_cache = tool_cache
+        self.tool_cache_ttl = tool_cache_ttl
+
         self._provided_tools = tools or []
 
         self.granular_stream = granular_stream
         """Whether to emit per-character ThinagentResponseStream chunks when streaming"""
 
-        self._mcp_manager = MCPManager()
+        self._mcp_manager = MCPManager(cache_dir=mcp_cache_dir)
         self._mcp_servers_config = normalize_mcp_servers(mcp_servers)
         if self._mcp_servers_config:
             self._mcp_manager.add_servers(self._mcp_servers_config)
@@ -265,6 +336,7 @@ class Agent(Generic[_ExpectedContentType]):
         self._is_subagent = False
         self._sub_agent_map: Dict[str, "Agent"] = {}
         self._current_conversation_id: Optional[str] = None
+        self._system_message: Optional[Dict[str, Any]] = None
 
         self._initialize_tools()
 
@@ -278,6 +350,7 @@ class Agent(Generic[_ExpectedContentType]):
             ]
             combined_tools = (self._provided_tools or []) + sub_agent_tools
             self.tool_schemas, self.tool_maps = generate_tool_schemas(combined_tools)
+            self._refresh_tool_schemas_digest()
             
             # Collect toolkit contexts
             self._toolkit_contexts = self._collect_toolkit_contexts()
@@ -287,6 +360,37 @@ class Agent(Generic[_ExpectedContentType]):
             logger.error(f"Failed to initialize tools for agent '{self.name}': {e}")
             raise AgentError(f"Tool initialization failed: {e}") from e
 
+    def _refresh_tool_schemas_digest(self) -> None:
+        """
+        Encode the tool schemas once so per-step cache keys don't re-serialize them, and
+        rebuild the tool list sent with each request.
+
+        With prompt caching enabled the last tool definition carries a `cache_control`
+        breakpoint, so the provider caches the whole (static) tool block. The same list
+        object is reused for every request until the tools change.
+        """
+        self._tool_schemas_digest = hashlib.sha256(
+            json.dumps(self.tool_schemas, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        if self.prompt_caching and self.tool_schemas:
+            self._request_tools: List[Dict] = [
+                *self.tool_schemas[:-1],
+                {**self.tool_schemas[-1], "cache_control": {"type": "ephemeral"}},
+            ]
+        else:
+            self._request_tools = self.tool_schemas
+
+    async def aclose(self) -> None:
+        """
+        Release resources held across runs: pooled MCP sessions of this agent and its sub-agents.
+
+        Must be awaited on the event loop the agent ran on. Pooled sessions are otherwise
+        closed when that loop shuts down.
+        """
+        await self._mcp_manager.aclose()
+        for sa in self.sub_agents:
+            await sa.aclose()
+
     async def _ensure_mcp_tools_loaded(self) -> None:
         """Load MCP tools once (deduplicated) if configured."""
         if not self._mcp_servers_config or self._mcp_tools_loaded:
@@ -310,6 +414,7 @@ class Agent(Generic[_ExpectedContentType]):
                     new_schema_count += 1
 
             self.tool_maps.update(mcp_mappings)
+            self._refresh_tool_schemas_digest()
 
             logger.info(
                 f"Loaded {new_schema_count} new MCP tools (total {len(mcp_schemas)}) for agent '{self.name}'"
@@ -369,6 +474,17 @@ class Agent(Generic[_ExpectedContentType]):
                 logger.error(f"Sub-agent '{sa.name}' execution failed: {e}")
                 raise ToolExecutionError(f"Sub-agent execution failed: {e}") from e
 
+        async def _adelegate_to_sub_agent(input: str) -> Any:
+            """Delegate input to the sub-agent without blocking the event loop."""
+            try:
+                if self._is_streaming and self._stream_intermediate_steps:
+                    return {"__subagent_stream__": True, "agent": sa, "input": input}
+                else:
+                    return await sa.arun(input, conversation_id=self._current_conversation_id, _is_subagent_call=True)
+            except Exception as e:
+                logger.error(f"Sub-agent '{sa.name}' execution failed: {e}")
+                raise ToolExecutionError(f"Sub-agent execution failed: {e}") from e
+
         _delegate_to_sub_agent.__name__ = tool_name
         _delegate_to_sub_agent.__doc__ = sa.description or (
             f"Forward the input to the '{sa.name}' sub-agent and return its response."
@@ -376,7 +492,11 @@ class Agent(Generic[_ExpectedContentType]):
         
         self._sub_agent_map[tool_name] = sa
 
-        return tool_decorator(_delegate_to_sub_agent)
+        sub_agent_tool = tool_decorator(_delegate_to_sub_agent)
+        # Picked up by _execute_tool_async, so sub-agents called from arun() run on the
+        # event loop alongside each other instead of occupying a worker thread each
+        sub_agent_tool.__acall__ = _adelegate_to_sub_agent  # type: ignore[attr-defined]
+        return sub_agent_tool
 
     def _collect_toolkit_contexts(self) -> List[str]:
         """Collect contexts from all toolkits in the tools list."""
@@ -394,13 +514,17 @@ class Agent(Generic[_ExpectedContentType]):
         
         return contexts
 
-    def _execute_tool(self, tool_name: str, tool_args: dict) -> Any:
+    def _execute_tool(self, tool_name: str, tool_args: dict, tool: Optional[Callable] = None, run_inline: bool = False) -> Any:
         """
         Executes a tool by name with the provided arguments.
         
         Args:
             tool_name: Name of the tool to execute
             tool_args: Arguments to pass to the tool
+            tool: The already resolved tool, to skip the tool_maps lookup
+            run_inline: Call the tool on the current thread even when concurrent execution is
+                enabled. Used when the caller is already running on a thread pool worker; that
+                caller is then responsible for applying tool_timeout to the call.
             
         Returns:
             Tool execution result
@@ -408,7 +532,8 @@ class Agent(Generic[_ExpectedContentType]):
         Raises:
             ToolExecutionError: If tool execution fails
         """
-        tool = self.tool_maps.get(tool_name)
+        if tool is None:
+            tool = self.tool_maps.get(tool_name)
         if tool is None:
             raise ToolExecutionError(f"Tool '{tool_name}' not found.")
 
@@ -419,21 +544,21 @@ class Agent(Generic[_ExpectedContentType]):
             )
 
         try:
-            logger.debug(f"Executing tool '{tool_name}' with args: {tool_args}")
+            logger.debug("Executing tool '%s' with args: %s", tool_name, tool_args)
 
-            if self.concurrent_tool_execution:
+            if self.concurrent_tool_execution and not run_inline:
                 # Use the thread pool manager for efficient execution
                 future = self._thread_pool_manager.submit_tool_execution(tool, tool_args, self.tool_timeout)
                 try:
                     result = future.result(timeout=self.tool_timeout)
-                    logger.debug(f"Tool '{tool_name}' executed successfully")
+                    logger.debug("Tool '%s' executed successfully", tool_name)
                     return result
                 except TimeoutError as e:
                     logger.error(f"Tool '{tool_name}' execution timed out after {self.tool_timeout}s")
                     raise ToolExecutionError(f"Tool '{tool_name}' execution timed out") from e
             else:
                 result = tool(**tool_args)
-                logger.debug(f"Tool '{tool_name}' executed successfully")
+                logger.debug("Tool '%s' executed successfully", tool_name)
                 return result
 
         except Exception as e:
@@ -467,9 +592,57 @@ class Agent(Generic[_ExpectedContentType]):
         # Add toolkit contexts if any
         if hasattr(self, '_toolkit_contexts') and self._toolkit_contexts:
             base_prompt += "\n\n" + "\n\n".join(self._toolkit_contexts)
+        if self.tool_result_format == "toon" and self.tool_maps:
+            base_prompt += "\n\n" + TOON_FORMAT_HINT
         self._built_system_prompt = base_prompt
         return base_prompt
 
+    def _get_system_message(self, prompt_vars: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return the system message for a run.
+
+        The message is built once and reused when no prompt_vars are given, since the
+        prompt is then constant for the lifetime of the agent. Templated prompts are
+        rebuilt on every call.
+        """
+        if prompt_vars:
+            return self._make_system_message(self._build_system_prompt(prompt_vars=prompt_vars))
+        if self._system_message is None:
+            self._system_message = self._make_system_message(self._build_system_prompt())
+        return self._system_message.copy()
+
+    def invalidate_prompt_cache(self) -> None:
+        """
+        Discard the cached system message.
+
+        Call this after changing `prompt`, `instructions`, or sub-agent instructions on an
+        existing agent so the next run rebuilds the system prompt.
+        """
+        self._system_message = None
+
+    def _make_system_message(self, system_prompt: str) -> Dict[str, Any]:
+        """Wrap the system prompt in a message, adding a cache breakpoint when prompt caching is on."""
+        if not self.prompt_caching:
+            return {"role": "system", "content": system_prompt}
+        return {
+            "role": "system",
+            "content": [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ],
+        }
+
+    def _extract_response_meta(
+        self, response: Any
+    ) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[str], Optional[UsageMetrics]]:
+        """Return (response_id, created_timestamp, model_used, system_fingerprint, metrics) of an LLM response."""
+        return (
+            getattr(response, "id", None),
+            getattr(response, "created", None),
+            getattr(response, "model", None),
+            getattr(response, "system_fingerprint", None),
+            self._extract_usage_metrics(response),
+        )
+
     def _extract_usage_metrics(self, response: Any) -> Optional[UsageMetrics]:
         """Extract usage metrics from LLM response."""
         try:
@@ -477,39 +650,47 @@ class Agent(Generic[_ExpectedContentType]):
             if not raw_usage:
                 return None
 
-            ct_details_data = getattr(raw_usage, "completion_tokens_details", None)
-            pt_details_data = getattr(raw_usage, "prompt_tokens_details", None)
-
-            ct_details = None
-            if ct_details_data:
-                ct_details = CompletionTokensDetails(
-                    accepted_prediction_tokens=getattr(ct_details_data, "accepted_prediction_tokens", None),
-                    audio_tokens=getattr(ct_details_data, "audio_tokens", None),
-                    reasoning_tokens=getattr(ct_details_data, "reasoning_tokens", None),
-                    rejected_prediction_tokens=getattr(ct_details_data, "rejected_prediction_tokens", None),
-                    text_tokens=getattr(ct_details_data, "text_tokens", None),
-                )
-
-            pt_details = None
-            if pt_details_data:
-                pt_details = PromptTokensDetails(
-                    audio_tokens=getattr(pt_details_data, "audio_tokens", None),
-                    cached_tokens=getattr(pt_details_data, "cached_tokens", None),
-                    text_tokens=getattr(pt_details_data, "text_tokens", None),
-                    image_tokens=getattr(pt_details_data, "image_tokens", None),
-                )
-            
-            return UsageMetrics(
-                completion_tokens=getattr(raw_usage, "completion_tokens", None),
-                prompt_tokens=getattr(raw_usage, "prompt_tokens", None),
-                total_tokens=getattr(raw_usage, "total_tokens", None),
-                completion_tokens_details=ct_details,
-                prompt_tokens_details=pt_details,
-            )
+            # Read straight from the provider's usage object (including the nested
+            # token details) instead of copying each field by hand
+            return UsageMetrics.model_validate(raw_usage, from_attributes=True)
+        except ValidationError as e:
+            logger.warning(f"Failed to parse usage metrics from {type(raw_usage).__name__}: {e}")
+            return None
         except Exception as e:
             logger.warning(f"Failed to extract usage metrics: {e}")
             return None
 
+    def _validate_response_content(self, raw_content: Any) -> Tuple[Any, Any]:
+        """
+        Validate structured output against the response format.
+
+        Most invalid payloads are malformed JSON (trailing commas, single quotes,
+        truncation), so when json_repair is installed a local repair is tried before
+        the caller falls back to asking the model for a correction.
+
+        Returns:
+            The validated model and the content it was parsed from (repaired if needed).
+
+        Raises:
+            ValidationError, json.JSONDecodeError: If the content is still invalid.
+        """
+        model_type = cast(Type[BaseModel], self.response_format_model_type)
+        try:
+            return model_type.model_validate_json(raw_content), raw_content
+        except (ValidationError, json.JSONDecodeError):
+            if not JSON_REPAIR_AVAILABLE or not isinstance(raw_content, str):
+                raise
+            try:
+                repaired = repair_json(raw_content)
+            except Exception as e:
+                logger.debug(f"json_repair failed: {e}")
+                repaired = None
+            if not isinstance(repaired, str) or not repaired or repaired == raw_content:
+                raise
+        parsed_model = model_type.model_validate_json(repaired)
+        logger.info("Structured output validated after local JSON repair")
+        return parsed_model, repaired
+
     def _handle_json_correction(
         self, 
         messages: List[Dict], 
@@ -531,11 +712,13 @@ class Agent(Generic[_ExpectedContentType]):
         
         schema_info = "unknown schema"
         if self.response_format_model_type:
-            try:
-                schema_dict = self.response_format_model_type.model_json_schema()
-                schema_info = json.dumps(schema_dict) if isinstance(schema_dict, dict) else str(schema_dict)
-            except Exception:
-                schema_info = str(self.response_format_model_type)
+            if self._response_schema_json is None:
+                try:
+                    schema_dict = self.response_format_model_type.model_json_schema()
+                    self._response_schema_json = _json_dumps(schema_dict) if isinstance(schema_dict, dict) else str(schema_dict)
+                except Exception:
+                    self._response_schema_json = str(self.response_format_model_type)
+            schema_info = self._response_schema_json
         
         correction_prompt = (
             f"The JSON is invalid: {error}. Please fix the JSON and return it. "
@@ -600,52 +783,100 @@ class Agent(Generic[_ExpectedContentType]):
         
         return serialized_calls
 
+    def _assistant_message_to_dict(self, message: Any, tool_calls: List[Any]) -> Dict[str, Any]:
+        """
+        Convert the assistant message of a tool-calling step into a message dict.
+
+        litellm messages are pydantic models, so dump only the fields we send back to the
+        model in one pass; anything else goes through the manual serialization path.
+        """
+        if hasattr(message, "model_dump") and all(hasattr(tc, "function") for tc in tool_calls):
+            try:
+                msg_dict = message.model_dump(include=_ASSISTANT_MESSAGE_FIELDS)
+                msg_dict["role"] = msg_dict.get("role") or "assistant"
+                if not tool_calls:
+                    msg_dict.pop("tool_calls", None)
+                return msg_dict
+            except Exception as e:
+                logger.debug(f"Falling back to manual assistant message serialization: {e}")
+
+        msg_dict = {
+            "role": getattr(message, "role", "assistant"),
+            "content": getattr(message, "content", None),
+        }
+
+        if tool_calls and isinstance(tool_calls, list):
+            msg_dict["tool_calls"] = self._serialize_tool_calls(tool_calls)
+
+        return msg_dict
+
     def _process_tool_call_result(self, tool_call_result: Any) -> str:
         """Process tool call result and convert to string for LLM."""
         try:
             if isinstance(tool_call_result, ThinagentResponse):
                 # Result from a sub-agent
-                sub_agent_content_data = tool_call_result.content
-                if isinstance(sub_agent_content_data, BaseModel): 
-                    return sub_agent_content_data.model_dump_json()
-                elif isinstance(sub_agent_content_data, str):
-                    return sub_agent_content_data
-                else:
-                    return json.dumps(sub_agent_content_data)
-            elif isinstance(tool_call_result, BaseModel):
-                return tool_call_result.model_dump_json()
-            elif isinstance(tool_call_result, str):
+                tool_call_result = tool_call_result.content
+            if isinstance(tool_call_result, str):
                 return tool_call_result
-            else:
-                return json.dumps(tool_call_result)
+            if self.tool_result_format == "json":
+                if isinstance(tool_call_result, BaseModel):
+                    return tool_call_result.model_dump_json()
+                return _json_dumps(tool_call_result)
+            if isinstance(tool_call_result, BaseModel):
+                tool_call_result = tool_call_result.model_dump(mode="json")
+            return encode_for_llm(tool_call_result, self.tool_result_format, json_dumps=_json_dumps)
         except Exception as e:
             logger.warning(f"Failed to serialize tool result: {e}")
             return str(tool_call_result)
 
-    def _execute_single_tool_call(self, tc: Any) -> Dict[str, Any]:
-        # sourcery skip: extract-method
-        """Parse, execute, and format a single tool call."""
-        tool_call_name = tc.function.name
-        tool_call_id = tc.id
-        tool = self.tool_maps.get(tool_call_name)
-        return_type = getattr(tool, "return_type", "content")
+    def _parse_tool_call_args(self, tc: Any) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Parse the JSON arguments of a tool call.
+
+        Returns:
+            A ``(tool_call_args, error_message)`` pair where exactly one is set. The error
+            message is a ready-to-send tool message describing the parse failure.
+        """
         try:
-            tool_call_args = json.loads(tc.function.arguments)
+            return _json_loads(tc.function.arguments), None
         except json.JSONDecodeError as e:
-            logger.error(f"Error parsing tool arguments for {tool_call_name} (ID: {tool_call_id}): {e}")
-            return {
-                "tool_call_id": tool_call_id,
+            logger.error("Error parsing tool arguments for %s (ID: %s): %s", tc.function.name, tc.id, e)
+            return None, {
+                "tool_call_id": tc.id,
                 "role": "tool",
-                "name": tool_call_name,
-                "content": json.dumps({
+                "name": tc.function.name,
+                "content": _json_dumps({
                     "error": str(e),
                     "message": "Failed to parse arguments",
                 }),
                 "status": "failed",
             }
 
+    def _execute_single_tool_call(
+        self,
+        tc: Any,
+        tool_call_args: Optional[Dict[str, Any]] = None,
+        run_inline: bool = False,
+    ) -> Dict[str, Any]:
+        # sourcery skip: extract-method
+        """Parse (unless already parsed), execute, and format a single tool call."""
+        tool_call_name = tc.function.name
+        tool_call_id = tc.id
+        tool = self.tool_maps.get(tool_call_name)
+        return_type = getattr(tool, "return_type", "content")
+        if tool_call_args is None:
+            tool_call_args, parse_error = self._parse_tool_call_args(tc)
+            if parse_error is not None:
+                return parse_error
+
         try:
-            raw_result = self._execute_tool(tool_call_name, tool_call_args)
+            tool_cache_key = self._tool_cache_key(tool_call_name, tool_call_args, tool)
+            cached_result = self._get_cached_tool_result(tool_cache_key)
+            if cached_result is not None:
+                raw_result = cached_result[0]
+            else:
+                raw_result = self._execute_tool(tool_call_name, tool_call_args, tool=tool, run_inline=run_inline)
+                self._store_cached_tool_result(tool_cache_key, raw_result)
             if return_type == "content_and_artifact" and isinstance(raw_result, tuple) and len(raw_result) == 2:
                 content_value, artifact = raw_result
                 self._tool_artifacts[tool_call_name] = artifact
@@ -665,12 +896,12 @@ class Agent(Generic[_ExpectedContentType]):
                 tool_message["artifact"] = artifact
             return tool_message
         except ToolExecutionError as e:
-            logger.error(f"Tool execution error for {tool_call_name} (ID: {tool_call_id}): {e}")
+            logger.error("Tool execution error for %s (ID: %s): %s", tool_call_name, tool_call_id, e)
             return {
                 "tool_call_id": tool_call_id,
                 "role": "tool",
                 "name": tool_call_name,
-                "content": json.dumps({
+                "content": _json_dumps({
                     "error": str(e),
                     "message": "Tool execution failed",
                 }),
@@ -760,33 +991,186 @@ class Agent(Generic[_ExpectedContentType]):
                 raise
             raise AgentError(f"Agent execution failed: {e}") from e
 
-    def _run_loop(self, messages: List[Dict[str, Any]], conversation_id: Optional[str] = None) -> ThinagentResponse[_ExpectedContentType]:
-        """Shared synchronous step loop."""
+    def run_many(
+        self,
+        inputs: List[str],
+        prompt_vars: Optional[Dict[str, Any]] = None,
+        max_workers: int = 100,
+        return_exceptions: bool = False,
+    ) -> List[Union[ThinagentResponse[_ExpectedContentType], AgentError]]:
+        """
+        Run the agent on several independent inputs, batching the first LLM request.
+
+        The first completion for every input is sent through `litellm.batch_completion`,
+        which issues the requests in parallel. Inputs whose first response asks for tools
+        (or fails structured-output validation) then continue through the regular step
+        loop one at a time. Memory is not used; each input is its own conversation.
+
+        Args:
+            inputs: The user inputs to run.
+            prompt_vars: Optional dictionary of variables to substitute into the prompt template.
+            max_workers: Maximum number of parallel requests made by litellm.
+            return_exceptions: If True, an input whose run fails gets its AgentError (or
+                MaxStepsExceededError) in its result slot and the remaining inputs still run.
+                If False (default), the first failing input raises and the results already
+                computed are discarded.
+
+        Returns:
+            List[ThinagentResponse[_ExpectedContentType]]: One response per input, in order.
+            With return_exceptions=True, failed inputs hold their error instead.
+
+        Raises:
+            AgentError: If agent execution fails and return_exceptions is False
+            MaxStepsExceededError: If max steps are exceeded for an input and return_exceptions is False
+        """
+        if not inputs:
+            return []
+        if any(not item or not isinstance(item, str) for item in inputs):
+            raise ValueError("Inputs must be non-empty strings")
+
+        self._is_subagent = False
+        self._current_conversation_id = None
+
+        all_messages = [self._build_messages_with_memory(item, None, prompt_vars=prompt_vars) for item in inputs]
+        logger.info(f"Agent '{self.name}' starting batched execution of {len(inputs)} inputs")
+
+        try:
+            batch_responses = litellm.batch_completion(
+                model=self.model,
+                messages=all_messages,
+                api_key=self.api_key,
+                api_base=self.api_base,
+                api_version=self.api_version,
+                tools=self._request_tools,
+                response_format=self.response_format_model_type,
+                max_workers=max_workers,
+                **self.kwargs,
+            )
+        except Exception as e:
+            logger.error(f"Batched LLM completion failed: {e}")
+            raise AgentError(f"Batched LLM completion failed: {e}") from e
+
+        results: List[Union[ThinagentResponse[_ExpectedContentType], AgentError]] = []
+        for messages, response in zip(all_messages, batch_responses):
+            if isinstance(response, Exception):
+                # litellm returns the exception in place; retry this input on its own
+                logger.warning(f"Batched completion failed for one input, retrying individually: {response}")
+                response = None
+            self._tool_artifacts = {}
+            try:
+                results.append(self._run_loop(messages, initial_response=response))
+            except Exception as e:
+                logger.error(f"Agent '{self.name}' batched execution failed: {e}")
+                if isinstance(e, AgentError):
+                    error = e
+                else:
+                    error = AgentError(f"Agent execution failed: {e}")
+                    error.__cause__ = e
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+        return results
+
+    def _response_cache_key(self, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """Return the cache key for this request, or None if caching does not apply."""
+        if self.cache is None:
+            return None
+        # Only an explicit temperature=0 is deterministic; most providers default higher
+        if self.kwargs.get("temperature") != 0:
+            return None
+        request_options = {**self.kwargs, "api_base": self.api_base, "api_version": self.api_version}
+        try:
+            return make_cache_key(
+                self.model, messages, self._tool_schemas_digest, self.response_format_model_type, request_options
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Skipping response cache, messages not hashable: {e}")
+            return None
+
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[Any]:
+        if cache_key is None or self.cache is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.debug(f"Response cache hit for agent '{self.name}'")
+        return litellm.ModelResponse(**cached)
+
+    def _store_cached_response(self, cache_key: Optional[str], response: Any) -> None:
+        if cache_key is None or self.cache is None:
+            return
+        try:
+            self.cache.set(cache_key, response.model_dump(), ttl=self.cache_ttl)
+        except Exception as e:
+            logger.debug(f"Failed to cache LLM response: {e}")
+
+    def _tool_cache_key(self, tool_name: str, tool_args: Dict[str, Any], tool: Optional[Callable]) -> Optional[str]:
+        """Return the tool cache key for this call, or None if the result must not be cached."""
+        if self.tool_cache is None or not getattr(tool, "cacheable", False):
+            return None
+        try:
+            canonical_args = json.dumps(tool_args, sort_keys=True, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Skipping tool cache for '{tool_name}', arguments not hashable: {e}")
+            return None
+        return hashlib.blake2b(f"{tool_name}\x00{canonical_args}".encode()).hexdigest()
+
+    def _get_cached_tool_result(self, cache_key: Optional[str]) -> Optional[Tuple[Any]]:
+        """Return the cached raw tool result wrapped in a 1-tuple (so None results can be cached)."""
+        if cache_key is None or self.tool_cache is None:
+            return None
+        cached = self.tool_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Tool cache hit for agent '%s'", self.name)
+        return cached
+
+    def _store_cached_tool_result(self, cache_key: Optional[str], raw_result: Any) -> None:
+        if cache_key is None or self.tool_cache is None:
+            return
+        try:
+            self.tool_cache.set(cache_key, (raw_result,), ttl=self.tool_cache_ttl)
+        except Exception as e:
+            logger.debug(f"Failed to cache tool result: {e}")
+
+    def _run_loop(
+        self,
+        messages: List[Dict[str, Any]],
+        conversation_id: Optional[str] = None,
+        initial_response: Optional[Any] = None,
+    ) -> ThinagentResponse[_ExpectedContentType]:
+        """
+        Shared synchronous step loop.
+
+        If initial_response is given (e.g. from a batched request), it is used as the
+        completion for the first step instead of calling the model.
+        """
         steps = 0
         json_correction_attempts = 0
         while steps < self.max_steps:
+            if initial_response is not None:
+                cache_key = None
+                response, initial_response = initial_response, None
+            else:
+                cache_key = self._response_cache_key(messages)
+                response = self._get_cached_response(cache_key)
             try:
-                response = litellm_completion(
-                    model=self.model,
-                    messages=messages,
-                    api_key=self.api_key,
-                    api_base=self.api_base,
-                    api_version=self.api_version,
-                    tools=self.tool_schemas,
-                    response_format=self.response_format_model_type,
-                    **self.kwargs,
-                )
-                assert not isinstance(response, litellm.CustomStreamWrapper), "Response should not be a stream in _run_loop"
+                if response is None:
+                    response = litellm_completion(
+                        model=self.model,
+                        messages=messages,
+                        api_key=self.api_key,
+                        api_base=self.api_base,
+                        api_version=self.api_version,
+                        tools=self._request_tools,
+                        response_format=self.response_format_model_type,
+                        **self.kwargs,
+                    )
+                    assert not isinstance(response, litellm.CustomStreamWrapper), "Response should not be a stream in _run_loop"
+                    self._store_cached_response(cache_key, response)
             except Exception as e:
                 logger.error(f"LLM completion failed: {e}")
                 raise AgentError(f"LLM completion failed: {e}") from e
 
-            response_id = getattr(response, "id", None)
-            created_timestamp = getattr(response, "created", None)
-            model_used = getattr(response, "model", None)
-            system_fingerprint = getattr(response, "system_fingerprint", None)
-            metrics = self._extract_usage_metrics(response)
-
             try:
                 if not hasattr(response, 'choices') or not response.choices:  # type: ignore
                     logger.error("Response has no choices")
@@ -799,11 +1183,23 @@ class Agent(Generic[_ExpectedContentType]):
                 raise AgentError(f"Failed to parse LLM response: {e}") from e
 
             if finish_reason == "stop" and not tool_calls:
-                return self._handle_completion(
+                # Response metadata is only reported with the final answer, so it is not
+                # extracted for intermediate tool-call steps
+                response_id, created_timestamp, model_used, system_fingerprint, metrics = (
+                    self._extract_response_meta(response)
+                )
+                result = self._handle_completion(
                     message, response_id, created_timestamp, model_used,
                     finish_reason, metrics, system_fingerprint, messages,
                     json_correction_attempts, conversation_id
                 )
+                if result is None:
+                    # A correction prompt was appended; ask the model again
+                    json_correction_attempts += 1
+                    continue
+                if conversation_id is not None and self.memory is not None:
+                    self._save_messages_to_memory(messages, conversation_id)
+                return result
             if finish_reason == "tool_calls" or tool_calls:
                 self._handle_tool_calls(tool_calls, message, messages, conversation_id)
                 steps += 1
@@ -814,12 +1210,38 @@ class Agent(Generic[_ExpectedContentType]):
         logger.warning(f"Agent '{self.name}' reached max steps ({self.max_steps})")
         raise MaxStepsExceededError(f"Max steps ({self.max_steps}) reached without final answer.")
 
+    def _semantic_cache_namespace(self, conversation_id: Optional[str], prompt_vars: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Namespace for semantic cache entries, or None when the cache does not apply."""
+        if self.semantic_cache is None or (conversation_id and self.memory):
+            return None
+        system_message = self._get_system_message(prompt_vars)
+        response_format_name = getattr(self.response_format_model_type, "__name__", None)
+        raw = json.dumps(
+            [self.model, system_message["content"], self._tool_schemas_digest, response_format_name],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _semantic_cache_hit(self, cached: ThinagentResponse) -> ThinagentResponse[_ExpectedContentType]:
+        logger.info(f"Semantic cache hit for agent '{self.name}'")
+        return cast(ThinagentResponse[_ExpectedContentType], cached.model_copy(update={"finish_reason": "cache_hit"}))
+
     def _run_sync(self, input: str, conversation_id: Optional[str] = None, prompt_vars: Optional[Dict[str, Any]] = None) -> ThinagentResponse[_ExpectedContentType]:
         """Synchronous execution of the agent."""
+        namespace = self._semantic_cache_namespace(conversation_id, prompt_vars)
+        if namespace is not None:
+            cached = cast(SemanticCache, self.semantic_cache).lookup(namespace, input)
+            if cached is not None:
+                return self._semantic_cache_hit(cached)
+
         self._tool_artifacts: dict[str, Any] = {}  # initialize storage for tool artifacts
         messages = self._build_messages_with_memory(input, conversation_id, prompt_vars=prompt_vars)
         
-        return self._run_loop(messages, conversation_id)
+        result = self._run_loop(messages, conversation_id)
+        if namespace is not None:
+            cast(SemanticCache, self.semantic_cache).store(namespace, input, result)
+        return result
 
     def _handle_completion(
         self, 
@@ -833,22 +1255,27 @@ class Agent(Generic[_ExpectedContentType]):
         messages: List[Dict],
         json_correction_attempts: int,
         conversation_id: Optional[str] = None,
-    ) -> ThinagentResponse[_ExpectedContentType]:
-        """Handle completion response without tool calls."""
+    ) -> Optional[ThinagentResponse[_ExpectedContentType]]:
+        """
+        Handle completion response without tool calls.
+
+        Returns None when structured output failed validation and a correction prompt was
+        appended to messages; the calling step loop then queries the model again.
+        """
         raw_content_from_llm = message.content
 
         if self.response_format_model_type:
             try:
-                parsed_model = self.response_format_model_type.model_validate_json(raw_content_from_llm)
+                parsed_model, raw_content_from_llm = self._validate_response_content(raw_content_from_llm)
                 final_content = cast(_ExpectedContentType, parsed_model)
                 content_type_to_return = self.response_format_model_type.__name__
                 if json_correction_attempts > 0:
                     logger.info(f"JSON content successfully corrected and validated after {json_correction_attempts} attempt(s).")
             except (ValidationError, json.JSONDecodeError) as e:
                 if self._handle_json_correction(messages, raw_content_from_llm, e, json_correction_attempts):
-                    # Retry the loop with the updated messages (which now contain the
-                    # correction prompt) instead of rebuilding from scratch.
-                    return self._run_loop(messages, conversation_id)
+                    # The caller's loop retries with the updated messages (which now
+                    # contain the correction prompt), so async runs stay non-blocking.
+                    return None
                 # Max attempts reached, return error
                 logger.error(f"JSON validation failed after {MAX_JSON_CORRECTION_ATTEMPTS} attempts. Error: {e}. Raw content: {raw_content_from_llm}")
                 final_content = cast(_ExpectedContentType, f"JSON validation failed after {MAX_JSON_CORRECTION_ATTEMPTS} attempts: {e}")
@@ -860,12 +1287,6 @@ class Agent(Generic[_ExpectedContentType]):
         assistant_response_message = {"role": "assistant", "content": raw_content_from_llm}
         messages.append(assistant_response_message)
 
-        if conversation_id is not None and self.memory is not None:
-            try:
-                self._save_messages_to_memory(messages, conversation_id)
-            except Exception as e:
-                logger.warning(f"An unexpected error occurred when calling _save_messages_to_memory from _handle_completion for conversation '{conversation_id}': {e}")
-
         return ThinagentResponse(
             content=final_content,
             content_type=content_type_to_return,
@@ -884,60 +1305,129 @@ class Agent(Generic[_ExpectedContentType]):
                             is_subagent=self._is_subagent,
         )
 
+    def _coalesce_tool_calls(
+        self, pending: List[Tuple[int, Any, Dict[str, Any]]]
+    ) -> Tuple[List[Tuple[int, Any, Dict[str, Any]]], List[Tuple[int, int, Any]]]:
+        """
+        Collapse identical tool calls (same name and arguments) issued in one step. Only
+        tools declared ``cacheable`` are collapsed; any other tool may have side effects that
+        the model intends to repeat.
+
+        Returns:
+            The unique calls to execute, and for each duplicate a
+            ``(slot_index, source_slot_index, tool_call)`` triple whose result is copied
+            from the call at ``source_slot_index``.
+        """
+        if not self.dedupe_tool_calls or len(pending) < 2:
+            return pending, []
+
+        unique: List[Tuple[int, Any, Dict[str, Any]]] = []
+        duplicates: List[Tuple[int, int, Any]] = []
+        first_index_by_key: Dict[str, int] = {}
+        for i, tc, args in pending:
+            if not getattr(self.tool_maps.get(tc.function.name), "cacheable", False):
+                unique.append((i, tc, args))
+                continue
+            try:
+                key = f"{tc.function.name}:{json.dumps(args, sort_keys=True, default=str)}"
+            except (TypeError, ValueError):
+                unique.append((i, tc, args))
+                continue
+            source_index = first_index_by_key.get(key)
+            if source_index is None:
+                first_index_by_key[key] = i
+                unique.append((i, tc, args))
+            else:
+                duplicates.append((i, source_index, tc))
+
+        if duplicates:
+            logger.debug(f"Coalesced {len(duplicates)} duplicate tool call(s) for agent '{self.name}'")
+        return unique, duplicates
+
+    def _partition_tool_calls(
+        self, pending: List[Tuple[int, Any, Dict[str, Any]]]
+    ) -> Tuple[List[Tuple[int, Any, Dict[str, Any]]], List[Tuple[int, Any, Dict[str, Any]]]]:
+        """
+        Split tool calls into I/O-bound calls, which may run concurrently, and sync tools
+        declared with ``io_bound=False``, which are run sequentially.
+        """
+        if not self.concurrent_tool_execution or len(pending) < 2:
+            return pending, []
+
+        io_bound: List[Tuple[int, Any, Dict[str, Any]]] = []
+        cpu_bound: List[Tuple[int, Any, Dict[str, Any]]] = []
+        for call in pending:
+            tool = self.tool_maps.get(call[1].function.name)
+            if tool is not None and not getattr(tool, "io_bound", True) and not getattr(tool, "is_async_tool", False):
+                cpu_bound.append(call)
+            else:
+                io_bound.append(call)
+        return io_bound, cpu_bound
+
     def _handle_tool_calls(self, tool_calls: List[Any], message: Any, messages: List[Dict], conversation_id: Optional[str] = None) -> None:
         """Handle tool calls execution."""
         tool_call_outputs: List[Dict[str, Any]] = []
 
         if tool_calls:
-            if self.concurrent_tool_execution and len(tool_calls) > 1:
-                # Use thread pool manager for concurrent execution
-                tool_call_funcs = [(self._execute_single_tool_call, {"tc": tc}) for tc in tool_calls]
-
-                try:
-                    # Execute all tool calls concurrently
-                    results = self._thread_pool_manager.execute_tools_concurrently(
-                        list(tool_call_funcs),
-                        timeout=self.tool_timeout,
-                        max_concurrent=self.max_concurrent_tools,
-                    )
+            # Parse all arguments up front; malformed calls get their error message
+            # directly and are never dispatched to the executor
+            slots: List[Optional[Dict[str, Any]]] = []
+            pending: List[Tuple[int, Any, Dict[str, Any]]] = []
+            for i, tc in enumerate(tool_calls):
+                tool_call_args, parse_error = self._parse_tool_call_args(tc)
+                slots.append(parse_error)
+                if parse_error is None:
+                    pending.append((i, tc, cast(Dict[str, Any], tool_call_args)))
+            pending, duplicates = self._coalesce_tool_calls(pending)
+            # CPU-bound tools gain nothing from worker threads (they only contend for
+            # the GIL), so they run inline, one after another, after the I/O-bound batch
+            pending, cpu_bound = self._partition_tool_calls(pending)
+
+            if self.concurrent_tool_execution and len(pending) > 1:
+                # Use thread pool manager for concurrent execution. Each call already runs
+                # on a pool worker, so the tool is invoked inline rather than being
+                # submitted to the same pool a second time. tool_timeout is passed down as the
+                # per-call timeout the pool enforces from each call's start.
+                tool_call_funcs = [
+                    (self._execute_single_tool_call, {"tc": tc, "tool_call_args": args, "run_inline": True})
+                    for _, tc, args in pending
+                ]
+                results = self._thread_pool_manager.execute_tools_concurrently(
+                    tool_call_funcs,
+                    timeout=self.tool_timeout,
+                    max_concurrent=self.max_concurrent_tools,
+                )
 
-                    # Process results
-                    for i, result in enumerate(results):
-                        if isinstance(result, Exception):
-                            failed_tc = tool_calls[i]
-                            logger.error(f"Tool call {failed_tc.function.name} (ID: {failed_tc.id}) failed: {result}")
-                            tool_call_outputs.append({
-                                "tool_call_id": failed_tc.id,
-                                "role": "tool",
-                                "name": failed_tc.function.name,
-                                "content": json.dumps({
-                                    "error": str(result),
-                                    "message": "Failed to retrieve tool result from concurrent execution",
-                                }),
-                            })
-                        else:
-                            tool_call_outputs.append(result)
-                except Exception as e:
-                    logger.error(f"Error in concurrent tool execution: {e}")
-                    # Fallback to sequential execution
-                    tool_call_outputs.extend(
-                        self._execute_single_tool_call(tc) for tc in tool_calls
-                    )
+                # Process results
+                for (i, failed_tc, args), result in zip(pending, results):
+                    if isinstance(result, ToolNotStartedError):
+                        # Never ran, so it is safe to run it here instead
+                        logger.warning(f"Running tool call {failed_tc.function.name} (ID: {failed_tc.id}) sequentially: {result}")
+                        slots[i] = self._execute_single_tool_call(failed_tc, args)
+                    elif isinstance(result, Exception):
+                        logger.error("Tool call %s (ID: %s) failed: %s", failed_tc.function.name, failed_tc.id, result)
+                        slots[i] = {
+                            "tool_call_id": failed_tc.id,
+                            "role": "tool",
+                            "name": failed_tc.function.name,
+                            "content": _json_dumps({
+                                "error": str(result),
+                                "message": "Failed to retrieve tool result from concurrent execution",
+                            }),
+                        }
+                    else:
+                        slots[i] = result
             else:
-                tool_call_outputs.extend(
-                    self._execute_single_tool_call(tc) for tc in tool_calls
-                )
+                for i, tc, args in pending:
+                    slots[i] = self._execute_single_tool_call(tc, args)
+            for i, tc, args in cpu_bound:
+                slots[i] = self._execute_single_tool_call(tc, args, run_inline=True)
+
+            for i, source_index, tc in duplicates:
+                slots[i] = {**cast(Dict[str, Any], slots[source_index]), "tool_call_id": tc.id}
+            tool_call_outputs = cast(List[Dict[str, Any]], slots)
         try:
-            msg_dict = {
-                "role": getattr(message, "role", "assistant"),
-                "content": getattr(message, "content", None),
-            }
-
-            if tool_calls and isinstance(tool_calls, list):
-                msg_dict["tool_calls"] = self._serialize_tool_calls(tool_calls)
-
-            messages.append(msg_dict)
-            messages.extend(tool_call_outputs)
+            messages.extend((self._assistant_message_to_dict(message, tool_calls), *tool_call_outputs))
         except Exception as e:
             logger.error(f"Failed to add messages to conversation: {e}")
             raise AgentError(f"Failed to add messages to conversation: {e}") from e
@@ -993,7 +1483,121 @@ class Agent(Generic[_ExpectedContentType]):
             self._stream_intermediate_steps = False
             self._stream_subagents = False
 
+    def _text_chunk(
+        self,
+        content: str,
+        chunk: Any = None,
+        finish_reason: Optional[str] = None,
+        stream_options: Optional[Any] = None,
+    ) -> ThinagentResponseStream[Any]:
+        """
+        Build a streamed text chunk without running Pydantic validation.
+
+        Text chunks are yielded once per token and every field comes from the agent
+        or the provider chunk, so validating them buys nothing on the hottest path.
+        """
+        return ThinagentResponseStream.model_construct(
+            content=content,
+            content_type="str",
+            response_id=getattr(chunk, "id", None),
+            created_timestamp=getattr(chunk, "created", None),
+            model_used=getattr(chunk, "model", None),
+            finish_reason=finish_reason,
+            system_fingerprint=getattr(chunk, "system_fingerprint", None),
+            stream_options=stream_options,
+            agent_name=self.name,
+            is_subagent=self._is_subagent,
+        )
+
+    def _dispatch_streamed_tool_call(self, call_name: str, call_args: str, call_id: Optional[str]) -> Optional[Tuple[Tuple[Optional[str], str, Dict[str, Any]], Future]]:
+        """
+        Start a streamed tool call on the thread pool as soon as its arguments are complete.
+
+        The arguments of a tool call arrive in pieces; once they form a complete JSON object
+        nothing more can follow, so the tool can start while the rest of the stream (finish
+        chunk, further deltas) is still being received. Only plain sync tools are dispatched
+        early; sub-agents and async tools keep the regular path.
+
+        Returns:
+            The (call_id, call_name, parsed arguments) that were dispatched and the pending
+            future, or None. Callers compare the parsed arguments, not the raw string, since
+            trailing whitespace after the closing brace does not change the call.
+        """
+        if not self.concurrent_tool_execution or call_name in self._sub_agent_map:
+            return None
+        tool = self.tool_maps.get(call_name)
+        if tool is None or getattr(tool, "is_async_tool", False):
+            return None
+        # A complete object must end with its closing brace; checking first avoids
+        # re-parsing the whole buffer on every argument delta
+        if not call_args.rstrip().endswith("}"):
+            return None
+        try:
+            parsed_args = _json_loads(call_args)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed_args, dict):
+            return None
+        logger.debug(f"Dispatching streamed tool call '{call_name}' before the stream finished")
+        future = self._thread_pool_manager.submit_tool_execution(tool, parsed_args, self.tool_timeout)
+        return (call_id, call_name, parsed_args), future
+
+    def _collect_streamed_tool_call(self, call_name: str, future: Future) -> Any:
+        """Wait for a tool call started by _dispatch_streamed_tool_call."""
+        try:
+            return future.result(timeout=self.tool_timeout)
+        except TimeoutError as e:
+            logger.error(f"Tool '{call_name}' execution timed out after {self.tool_timeout}s")
+            raise ToolExecutionError(f"Tool '{call_name}' execution timed out") from e
+        except Exception as e:
+            logger.error(f"Tool '{call_name}' execution failed: {e}")
+            raise ToolExecutionError(f"Tool '{call_name}' execution failed: {e}") from e
+
+    def _record_streamed_tool_call(
+        self,
+        early_dispatch: Tuple[Tuple[Optional[str], str, Dict[str, Any]], Future],
+        messages: List[Dict[str, Any]],
+    ) -> Tuple[str, str]:
+        """
+        Wait for an early-dispatched tool call that is not the step's executed call and
+        record it in messages as its own assistant tool_call and tool reply, so the model
+        sees the result of a side effect it triggered.
+
+        Returns:
+            The serialised tool result and its status ("success" or "failed").
+        """
+        (early_id, early_name, early_args), future = early_dispatch
+        status = "success"
+        try:
+            result = self._collect_streamed_tool_call(early_name, future)
+        except ToolExecutionError as e:
+            logger.error(f"Tool execution failed in stream: {e}")
+            result = {"error": str(e), "message": "Tool execution failed"}
+            status = "failed"
+        tool = self.tool_maps.get(early_name)
+        if getattr(tool, "return_type", "content") == "content_and_artifact" and isinstance(result, tuple) and len(result) == 2:
+            result = result[0]
+        content = self._process_tool_call_result(result)
+        tool_call_id = early_id or f"call_{early_name}"
+        messages.extend((
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": tool_call_id,
+                        "type": "function",
+                        "function": {"name": early_name, "arguments": _json_dumps(early_args)},
+                    }
+                ],
+            },
+            {"role": "tool", "tool_call_id": tool_call_id, "content": content, "status": status},
+        ))
+        return content, status
+
     def _run_stream_impl(self, messages, step_count, accumulated_content, arg_accumulators, stream_intermediate_steps, conversation_id):
+        # Streamed text is collected as parts and joined once when the reply is saved
+        content_parts: List[str] = [accumulated_content] if accumulated_content else []
         while step_count < self.max_steps:
             step_count += 1
 
@@ -1001,6 +1605,8 @@ class Agent(Generic[_ExpectedContentType]):
             call_args: str = ""
             call_id: Optional[str] = None
             final_finish_reason: Optional[str] = None
+            early_dispatch: Optional[Tuple[Tuple[Optional[str], str, Dict[str, Any]], Future]] = None
+            seen_call_ids: Set[str] = set()
 
             try:    
                 for chunk in litellm_completion(
@@ -1009,7 +1615,7 @@ class Agent(Generic[_ExpectedContentType]):
                     api_key=self.api_key,
                     api_base=self.api_base,
                     api_version=self.api_version,
-                    tools=self.tool_schemas,
+                    tools=self._request_tools,
                     response_format=None,
                     stream=True,
                     **self.kwargs,
@@ -1017,24 +1623,7 @@ class Agent(Generic[_ExpectedContentType]):
 
                     if isinstance(chunk, tuple) and len(chunk) == 2:
                         raw, opts = chunk
-                        yield ThinagentResponseStream(
-                            content=raw,
-                            content_type="str",
-                            tool_name=None,
-                            tool_call_id=None,
-                            tool_call_args=None,
-                            response_id=None,
-                            created_timestamp=None,
-                            model_used=None,
-                            finish_reason=None,
-                            metrics=None,
-                            system_fingerprint=None,
-                            artifact=None,
-                            stream_options=opts,
-                            tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                        )
+                        yield self._text_chunk(raw, stream_options=opts)
                         continue
 
                     try:
@@ -1055,6 +1644,7 @@ class Agent(Generic[_ExpectedContentType]):
                             if hasattr(tc, "function"):
                                 if tc.id:
                                     call_id = tc.id
+                                    seen_call_ids.add(call_id)
                                     if call_id is not None and call_id not in arg_accumulators:
                                         arg_accumulators[call_id] = ""
                                 if tc.function.name:
@@ -1062,6 +1652,9 @@ class Agent(Generic[_ExpectedContentType]):
                                 if tc.function.arguments is not None and call_id is not None:
                                     arg_accumulators[call_id] = arg_accumulators.get(call_id, "") + tc.function.arguments
                                     call_args = arg_accumulators[call_id]
+                                    # Only the first call of a single-call stream starts early
+                                    if early_dispatch is None and call_name and len(seen_call_ids) == 1:
+                                        early_dispatch = self._dispatch_streamed_tool_call(call_name, call_args, call_id)
 
                     fc = getattr(delta, "function_call", None)
                     if fc is not None:
@@ -1078,50 +1671,19 @@ class Agent(Generic[_ExpectedContentType]):
                     # Otherwise, stream content tokens
                     text = getattr(delta, "content", None)
                     if text:
-                        accumulated_content += text  # Accumulate content
+                        content_parts.append(text)  # Accumulate content
                         if self.granular_stream and len(text) > 1:
                             for ch in text:
-                                yield ThinagentResponseStream(
-                                    content=ch,
-                                    content_type="str",
-                                    tool_name=None,
-                                    tool_call_id=None,
-                                    tool_call_args=None,
-                                    response_id=getattr(chunk, "id", None),
-                                    created_timestamp=getattr(chunk, "created", None),
-                                    model_used=getattr(chunk, "model", None),
-                                    finish_reason=final_finish_reason,
-                                    metrics=None,
-                                    system_fingerprint=getattr(chunk, "system_fingerprint", None),
-                                    artifact=None,
-                                    stream_options=None,
-                                    tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                                )
+                                yield self._text_chunk(ch, chunk, finish_reason=final_finish_reason)
                             continue
-                        yield ThinagentResponseStream(
-                            content=text,
-                            content_type="str",
-                            tool_name=None,
-                            tool_call_id=None,
-                            tool_call_args=None,
-                            response_id=getattr(chunk, "id", None),
-                            created_timestamp=getattr(chunk, "created", None),
-                            model_used=getattr(chunk, "model", None),
-                            finish_reason=final_finish_reason,
-                            metrics=None,
-                            system_fingerprint=getattr(chunk, "system_fingerprint", None),
-                            artifact=None,
-                            stream_options=None,
-                            tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                        )
+                        yield self._text_chunk(text, chunk, finish_reason=final_finish_reason)
 
                     # Check for completion without tool calls
                     if finish_reason == "stop":
+                        if early_dispatch is not None:
+                            self._record_streamed_tool_call(early_dispatch, messages)
                         # Save accumulated content to memory if available
+                        accumulated_content = "".join(content_parts)
                         if conversation_id and self.memory and accumulated_content:
                             final_assistant_message = {"role": "assistant", "content": accumulated_content}
                             messages.append(final_assistant_message)
@@ -1152,6 +1714,11 @@ class Agent(Generic[_ExpectedContentType]):
 
             except Exception as e:
                 logger.error(f"Streaming error: {e}")
+                if early_dispatch is not None:
+                    # Keep the tool that already ran in the saved history
+                    self._record_streamed_tool_call(early_dispatch, messages)
+                    if self.memory and conversation_id:
+                        self._save_messages_to_memory(messages, conversation_id)
                 yield ThinagentResponseStream(
                     content=f"Error: {e}",
                     content_type="error",
@@ -1175,7 +1742,7 @@ class Agent(Generic[_ExpectedContentType]):
             if call_name:
                 tool_execution_status = "success"
                 try:
-                    parsed_args = json.loads(call_args) if call_args else {}
+                    parsed_args = _json_loads(call_args) if call_args else {}
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse tool arguments: {e}")
                     parsed_args = {}
@@ -1200,8 +1767,38 @@ class Agent(Generic[_ExpectedContentType]):
                             is_subagent=self._is_subagent,
                     )
 
+                if early_dispatch is not None and early_dispatch[0] != (call_id, call_name, parsed_args):
+                    # A later call superseded the one started early; wait for it and keep its
+                    # result in the conversation rather than discarding a run it already began
+                    early_id, early_name, early_args = early_dispatch[0]
+                    logger.warning(f"Streamed tool call '{early_name}' was started early but superseded by '{call_name}'")
+                    early_content, early_status = self._record_streamed_tool_call(early_dispatch, messages)
+                    if stream_intermediate_steps:
+                        yield ThinagentResponseStream(
+                            content=early_content,
+                            content_type="tool_result",
+                            tool_name=early_name,
+                            tool_call_id=early_id or f"call_{early_name}",
+                            tool_call_args=early_args or None,
+                            response_id=None,
+                            created_timestamp=None,
+                            model_used=None,
+                            finish_reason=final_finish_reason,
+                            metrics=None,
+                            system_fingerprint=None,
+                            artifact=None,
+                            stream_options=None,
+                            tool_status=early_status,
+                            agent_name=self.name,
+                            is_subagent=self._is_subagent,
+                        )
+                    early_dispatch = None
+
                 try:
-                    tool_result = self._execute_tool(call_name, parsed_args)
+                    if early_dispatch is not None:
+                        tool_result = self._collect_streamed_tool_call(call_name, early_dispatch[1])
+                    else:
+                        tool_result = self._execute_tool(call_name, parsed_args)
                 except ToolExecutionError as e:
                     logger.error(f"Tool execution failed in stream: {e}")
                     tool_result = {"error": str(e), "message": "Tool execution failed"}
@@ -1274,7 +1871,6 @@ class Agent(Generic[_ExpectedContentType]):
                         }
                     ]
                 }
-                messages.append(assistant_message)
 
                 # Append the tool response with artifact and status
                 tool_message: Dict[str, Any] = {
@@ -1288,7 +1884,7 @@ class Agent(Generic[_ExpectedContentType]):
                 if self._should_include_artifacts_in_messages() and artifact_payload is not None:
                     tool_message["artifact"] = artifact_payload
 
-                messages.append(tool_message)
+                messages.extend((assistant_message, tool_message))
                 if self.memory and conversation_id:
                     self._save_messages_to_memory(messages, conversation_id)
 
@@ -1344,7 +1940,7 @@ class Agent(Generic[_ExpectedContentType]):
             raise ToolExecutionError(f"Tool '{tool_name}' not found.")
 
         try:
-            logger.debug(f"Executing tool '{tool_name}' (async context) with args: {tool_args}")
+            logger.debug("Executing tool '%s' (async context) with args: %s", tool_name, tool_args)
 
             # Prefer native async execution via __acall__ if available (e.g., for LangchainTool)
             if hasattr(tool, "__acall__"):
@@ -1358,7 +1954,7 @@ class Agent(Generic[_ExpectedContentType]):
             elif getattr(tool, "is_async_tool", False):
                 try:
                     result = await asyncio.wait_for(tool(**tool_args), timeout=self.tool_timeout)
-                    logger.debug(f"Async tool '{tool_name}' executed successfully")
+                    logger.debug("Async tool '%s' executed successfully", tool_name)
                     return result
                 except asyncio.TimeoutError as e:
                     logger.error(f"Async tool '{tool_name}' execution timed out after {self.tool_timeout}s")
@@ -1370,7 +1966,7 @@ class Agent(Generic[_ExpectedContentType]):
                     result = await execute_tool_in_thread(
                         tool, tool_args, self.tool_timeout, self._thread_pool_manager
                     )
-                    logger.debug(f"Sync tool '{tool_name}' executed successfully in thread pool")
+                    logger.debug("Sync tool '%s' executed successfully in thread pool", tool_name)
                     return result
                 except asyncio.TimeoutError as e:
                     logger.error(f"Sync tool '{tool_name}' execution (in thread pool) timed out after {self.tool_timeout}s")
@@ -1379,29 +1975,25 @@ class Agent(Generic[_ExpectedContentType]):
             logger.error(f"Tool '{tool_name}' execution failed in async context: {e}")
             raise ToolExecutionError(f"Tool '{tool_name}' execution failed in async context: {e}") from e
 
-    async def _execute_single_tool_call_async(self, tc: Any) -> Dict[str, Any]:
-        """Parse, execute (async), and format a single tool call."""
+    async def _execute_single_tool_call_async(self, tc: Any, tool_call_args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Parse (unless already parsed), execute (async), and format a single tool call."""
         tool_call_name = tc.function.name
         tool_call_id = tc.id
         tool = self.tool_maps.get(tool_call_name)
         return_type = getattr(tool, "return_type", "content")
-        try:
-            tool_call_args = json.loads(tc.function.arguments)
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing tool arguments for {tool_call_name} (ID: {tool_call_id}): {e}")
-            return {
-                "tool_call_id": tool_call_id,
-                "role": "tool",
-                "name": tool_call_name,
-                "content": json.dumps({
-                    "error": str(e),
-                    "message": "Failed to parse arguments",
-                }),
-                "status": "failed",
-            }
+        if tool_call_args is None:
+            tool_call_args, parse_error = self._parse_tool_call_args(tc)
+            if parse_error is not None:
+                return parse_error
 
         try:
-            raw_result = await self._execute_tool_async(tool_call_name, tool_call_args)
+            tool_cache_key = self._tool_cache_key(tool_call_name, tool_call_args, tool)
+            cached_result = self._get_cached_tool_result(tool_cache_key)
+            if cached_result is not None:
+                raw_result = cached_result[0]
+            else:
+                raw_result = await self._execute_tool_async(tool_call_name, tool_call_args)
+                self._store_cached_tool_result(tool_cache_key, raw_result)
             if return_type == "content_and_artifact" and isinstance(raw_result, tuple) and len(raw_result) == 2:
                 content_value, artifact = raw_result
                 self._tool_artifacts[tool_call_name] = artifact
@@ -1421,96 +2013,89 @@ class Agent(Generic[_ExpectedContentType]):
                 tool_message["artifact"] = artifact
             return tool_message
         except ToolExecutionError as e:
-            logger.error(f"Tool execution error for {tool_call_name} (ID: {tool_call_id}): {e}")
+            logger.error("Tool execution error for %s (ID: %s): %s", tool_call_name, tool_call_id, e)
             return {
                 "tool_call_id": tool_call_id,
                 "role": "tool",
                 "name": tool_call_name,
-                "content": json.dumps({
+                "content": _json_dumps({
                     "error": str(e),
                     "message": "Tool execution failed",
                 }),
                 "status": "failed",
             }
 
+    async def _execute_single_tool_call_bounded(
+        self, semaphore: asyncio.Semaphore, tc: Any, tool_call_args: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run _execute_single_tool_call_async while holding the given semaphore."""
+        async with semaphore:
+            return await self._execute_single_tool_call_async(tc, tool_call_args)
+
     async def _handle_tool_calls_async(self, tool_calls: List[Any], message: Any, messages: List[Dict], conversation_id: Optional[str] = None) -> None:
         """Handle tool calls execution asynchronously."""
         tool_call_outputs: List[Dict[str, Any]] = []
 
         if tool_calls:
-            if self.concurrent_tool_execution and len(tool_calls) > 1:
+            # Parse all arguments up front; malformed calls get their error message
+            # directly and are never scheduled
+            slots: List[Optional[Dict[str, Any]]] = []
+            pending: List[Tuple[int, Any, Dict[str, Any]]] = []
+            for i, tc in enumerate(tool_calls):
+                tool_call_args, parse_error = self._parse_tool_call_args(tc)
+                slots.append(parse_error)
+                if parse_error is None:
+                    pending.append((i, tc, cast(Dict[str, Any], tool_call_args)))
+            pending, duplicates = self._coalesce_tool_calls(pending)
+            pending, cpu_bound = self._partition_tool_calls(pending)
+
+            if self.concurrent_tool_execution and len(pending) > 1:
                 # Use asyncio.gather for concurrent execution of async tool calls
                 # The individual tool calls will use the thread pool manager for sync tools
                 try:
-                    # Apply concurrency limits if specified
-                    if self.max_concurrent_tools and len(tool_calls) > self.max_concurrent_tools:
-                        # Process in batches to respect concurrency limits
-                        batches = [
-                            tool_calls[i:i + self.max_concurrent_tools]
-                            for i in range(0, len(tool_calls), self.max_concurrent_tools)
+                    # Bound concurrency with a semaphore rather than fixed batches so a
+                    # slow tool doesn't hold back the start of the next batch
+                    if self.max_concurrent_tools and len(pending) > self.max_concurrent_tools:
+                        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+                        coros = [
+                            self._execute_single_tool_call_bounded(semaphore, tc, args)
+                            for _, tc, args in pending
                         ]
-                        
-                        for batch in batches:
-                            batch_results = await asyncio.gather(
-                                *(self._execute_single_tool_call_async(tc) for tc in batch),
-                                return_exceptions=True
-                            )
-                            for i, result in enumerate(batch_results):
-                                if isinstance(result, Exception):
-                                    failed_tc = batch[i]
-                                    logger.error(f"Async tool call {failed_tc.function.name} (ID: {failed_tc.id}) failed: {result}")
-                                    tool_call_outputs.append({
-                                        "tool_call_id": failed_tc.id,
-                                        "role": "tool",
-                                        "name": failed_tc.function.name,
-                                        "content": json.dumps({
-                                            "error": str(result),
-                                            "message": "Failed to retrieve tool result from concurrent async execution",
-                                        }),
-                                    })
-                                else:
-                                    tool_call_outputs.append(cast(Dict[str, Any], result))
                     else:
-                        # Execute all at once if within limits
-                        results = await asyncio.gather(
-                            *(self._execute_single_tool_call_async(tc) for tc in tool_calls),
-                            return_exceptions=True
-                        )
-                        for i, result in enumerate(results):
-                            if isinstance(result, Exception):
-                                failed_tc = tool_calls[i]
-                                logger.error(f"Async tool call {failed_tc.function.name} (ID: {failed_tc.id}) failed: {result}")
-                                tool_call_outputs.append({
-                                    "tool_call_id": failed_tc.id,
-                                    "role": "tool",
-                                    "name": failed_tc.function.name,
-                                    "content": json.dumps({
-                                        "error": str(result),
-                                        "message": "Failed to retrieve tool result from concurrent async execution",
-                                    }),
-                                })
-                            else:
-                                tool_call_outputs.append(cast(Dict[str, Any], result))
+                        coros = [self._execute_single_tool_call_async(tc, args) for _, tc, args in pending]
+
+                    results = await asyncio.gather(*coros, return_exceptions=True)
+                    for (i, failed_tc, _), result in zip(pending, results):
+                        if isinstance(result, Exception):
+                            logger.error("Async tool call %s (ID: %s) failed: %s", failed_tc.function.name, failed_tc.id, result)
+                            slots[i] = {
+                                "tool_call_id": failed_tc.id,
+                                "role": "tool",
+                                "name": failed_tc.function.name,
+                                "content": _json_dumps({
+                                    "error": str(result),
+                                    "message": "Failed to retrieve tool result from concurrent async execution",
+                                }),
+                            }
+                        else:
+                            slots[i] = cast(Dict[str, Any], result)
                 except Exception as e:
                     logger.error(f"Error in async concurrent tool execution: {e}")
                     # Fallback to sequential execution
-                    for tc in tool_calls:
-                        tool_call_outputs.append(await self._execute_single_tool_call_async(tc))
+                    for i, tc, args in pending:
+                        slots[i] = await self._execute_single_tool_call_async(tc, args)
             else:
                 # Execute sequentially if concurrent_tool_execution is False or only one tool call
-                for tc in tool_calls:
-                    tool_call_outputs.append(await self._execute_single_tool_call_async(tc))
+                for i, tc, args in pending:
+                    slots[i] = await self._execute_single_tool_call_async(tc, args)
+            for i, tc, args in cpu_bound:
+                slots[i] = await self._execute_single_tool_call_async(tc, args)
+
+            for i, source_index, tc in duplicates:
+                slots[i] = {**cast(Dict[str, Any], slots[source_index]), "tool_call_id": tc.id}
+            tool_call_outputs = cast(List[Dict[str, Any]], slots)
         try:
-            msg_dict = {
-                "role": getattr(message, "role", "assistant"),
-                "content": getattr(message, "content", None),
-            }
-
-            if tool_calls and isinstance(tool_calls, list):
-                msg_dict["tool_calls"] = self._serialize_tool_calls(tool_calls)
-
-            messages.append(msg_dict)
-            messages.extend(tool_call_outputs)
+            messages.extend((self._assistant_message_to_dict(message, tool_calls), *tool_call_outputs))
         except Exception as e:
             logger.error(f"Failed to add messages to conversation in async handler: {e}")
             raise AgentError(f"Failed to add messages to conversation in async handler: {e}") from e
@@ -1524,28 +2109,26 @@ class Agent(Generic[_ExpectedContentType]):
         steps = 0
         json_correction_attempts = 0
         while steps < self.max_steps:
+            cache_key = self._response_cache_key(messages)
+            response = self._get_cached_response(cache_key)
             try:
-                response = await litellm.acompletion(
-                    model=self.model,
-                    messages=messages,
-                    api_key=self.api_key,
-                    api_base=self.api_base,
-                    api_version=self.api_version,
-                    tools=self.tool_schemas,
-                    response_format=self.response_format_model_type,
-                    **self.kwargs,
-                )
-                assert not isinstance(response, litellm.CustomStreamWrapper), "Response should not be a stream in _run_loop_async"
+                if response is None:
+                    response = await litellm.acompletion(
+                        model=self.model,
+                        messages=messages,
+                        api_key=self.api_key,
+                        api_base=self.api_base,
+                        api_version=self.api_version,
+                        tools=self._request_tools,
+                        response_format=self.response_format_model_type,
+                        **self.kwargs,
+                    )
+                    assert not isinstance(response, litellm.CustomStreamWrapper), "Response should not be a stream in _run_loop_async"
+                    self._store_cached_response(cache_key, response)
             except Exception as e:
                 logger.error(f"LLM async completion failed: {e}")
                 raise AgentError(f"LLM async completion failed: {e}") from e
 
-            response_id = getattr(response, "id", None)
-            created_timestamp = getattr(response, "created", None)
-            model_used = getattr(response, "model", None)
-            system_fingerprint = getattr(response, "system_fingerprint", None)
-            metrics = self._extract_usage_metrics(response)
-
             try:
                 if not hasattr(response, "choices") or not response.choices:  # type: ignore
                     logger.error("Async response has no choices")
@@ -1558,11 +2141,23 @@ class Agent(Generic[_ExpectedContentType]):
                 raise AgentError(f"Failed to parse async LLM response: {e}") from e
 
             if finish_reason == "stop" and not tool_calls:
-                return self._handle_completion(
+                # Response metadata is only reported with the final answer, so it is not
+                # extracted for intermediate tool-call steps
+                response_id, created_timestamp, model_used, system_fingerprint, metrics = (
+                    self._extract_response_meta(response)
+                )
+                result = self._handle_completion(
                     message, response_id, created_timestamp, model_used,
                     finish_reason, metrics, system_fingerprint, messages,
                     json_correction_attempts, conversation_id
                 )
+                if result is None:
+                    # A correction prompt was appended; ask the model again
+                    json_correction_attempts += 1
+                    continue
+                if conversation_id is not None and self.memory is not None:
+                    await self._asave_messages_to_memory(messages, conversation_id)
+                return result
 
             if finish_reason == "tool_calls" or tool_calls:
                 # reuse sync handler in thread to avoid blocking event loop
@@ -1576,11 +2171,21 @@ class Agent(Generic[_ExpectedContentType]):
         raise MaxStepsExceededError(f"Max steps ({self.max_steps}) reached without final answer.")
 
     async def _run_async(self, input: str, conversation_id: Optional[str] = None, prompt_vars: Optional[Dict[str, Any]] = None) -> ThinagentResponse[_ExpectedContentType]:
-        self._tool_artifacts = {}
         # Ensure MCP tools are loaded before proceeding
         await self._ensure_mcp_tools_loaded()
+
+        namespace = self._semantic_cache_namespace(conversation_id, prompt_vars)
+        if namespace is not None:
+            cached = await cast(SemanticCache, self.semantic_cache).alookup(namespace, input)
+            if cached is not None:
+                return self._semantic_cache_hit(cached)
+
+        self._tool_artifacts = {}
         messages = await self._abuild_messages_with_memory(input, conversation_id, prompt_vars=prompt_vars)
-        return await self._run_loop_async(messages, conversation_id)
+        result = await self._run_loop_async(messages, conversation_id)
+        if namespace is not None:
+            await cast(SemanticCache, self.semantic_cache).astore(namespace, input, result)
+        return result
 
     async def _run_stream_async(
         self,
@@ -1598,7 +2203,8 @@ class Agent(Generic[_ExpectedContentType]):
 
         await self._ensure_mcp_tools_loaded()
         messages = await self._aprepare_stream(input, conversation_id, prompt_vars=prompt_vars)
-        accumulated_content = ""
+        # Streamed text is collected as parts and joined once when the reply is saved
+        content_parts: List[str] = []
 
         step_count = 0
         arg_accumulators: Dict[str, str] = {}
@@ -1617,7 +2223,7 @@ class Agent(Generic[_ExpectedContentType]):
                     api_key=self.api_key,
                     api_base=self.api_base,
                     api_version=self.api_version,
-                    tools=self.tool_schemas,
+                    tools=self._request_tools,
                     response_format=None,
                     stream=True,
                     **self.kwargs,
@@ -1626,24 +2232,7 @@ class Agent(Generic[_ExpectedContentType]):
                 async for chunk in response:  # type: ignore
                     if isinstance(chunk, tuple) and len(chunk) == 2:
                         raw, opts = chunk
-                        yield ThinagentResponseStream(
-                            content=raw,
-                            content_type="str",
-                            tool_name=None,
-                            tool_call_id=None,
-                            tool_call_args=None,
-                            response_id=None,
-                            created_timestamp=None,
-                            model_used=None,
-                            finish_reason=None,
-                            metrics=None,
-                            system_fingerprint=None,
-                            artifact=None,
-                            stream_options=opts,
-                            tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                        )
+                        yield self._text_chunk(raw, stream_options=opts)
                         continue
 
                     try:
@@ -1683,49 +2272,16 @@ class Agent(Generic[_ExpectedContentType]):
 
                     text = getattr(delta, "content", None)
                     if text:
-                        accumulated_content += text  # Accumulate content
+                        content_parts.append(text)  # Accumulate content
                         if self.granular_stream and len(text) > 1:
                             for ch in text:
-                                yield ThinagentResponseStream(
-                                    content=ch,
-                                    content_type="str",
-                                    tool_name=None,
-                                    tool_call_id=None,
-                                    tool_call_args=None,
-                                    response_id=getattr(chunk, "id", None),
-                                    created_timestamp=getattr(chunk, "created", None),
-                                    model_used=getattr(chunk, "model", None),
-                                    finish_reason=final_finish_reason,
-                                    metrics=None,
-                                    system_fingerprint=getattr(chunk, "system_fingerprint", None),
-                                    artifact=None,
-                                    stream_options=None,
-                                    tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                                )
+                                yield self._text_chunk(ch, chunk, finish_reason=final_finish_reason)
                             continue
-                        yield ThinagentResponseStream(
-                            content=text,
-                            content_type="str",
-                            tool_name=None,
-                            tool_call_id=None,
-                            tool_call_args=None,
-                            response_id=getattr(chunk, "id", None),
-                            created_timestamp=getattr(chunk, "created", None),
-                            model_used=getattr(chunk, "model", None),
-                            finish_reason=final_finish_reason,
-                            metrics=None,
-                            system_fingerprint=getattr(chunk, "system_fingerprint", None),
-                            artifact=None,
-                            stream_options=None,
-                            tool_status=None,
-                            agent_name=self.name,
-                            is_subagent=self._is_subagent,
-                        )
+                        yield self._text_chunk(text, chunk, finish_reason=final_finish_reason)
 
                     if finish_reason == "stop":
                         # Save accumulated content to memory if available
+                        accumulated_content = "".join(content_parts)
                         if conversation_id and self.memory and accumulated_content:
                             final_assistant_message = {"role": "assistant", "content": accumulated_content}
                             messages.append(final_assistant_message)
@@ -1784,7 +2340,7 @@ class Agent(Generic[_ExpectedContentType]):
             if call_name:
                 tool_execution_status = "success"
                 try:
-                    parsed_args = json.loads(call_args) if call_args else {}
+                    parsed_args = _json_loads(call_args) if call_args else {}
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse tool arguments: {e}")
                     parsed_args = {}
@@ -1882,8 +2438,6 @@ class Agent(Generic[_ExpectedContentType]):
                         }
                     ]
                 }
-                
-                messages.append(assistant_message)
 
                 tool_message: Dict[str, Any] = {
                     "role": "tool",
@@ -1896,7 +2450,7 @@ class Agent(Generic[_ExpectedContentType]):
                 if self._should_include_artifacts_in_messages() and artifact_payload is not None:
                     tool_message["artifact"] = artifact_payload
                 
-                messages.append(tool_message)
+                messages.extend((assistant_message, tool_message))
 
                 continue
 
@@ -1988,6 +2542,25 @@ class Agent(Generic[_ExpectedContentType]):
             raise ValueError("Streaming is not supported when response_format is specified.")
         return self._run_stream_async(input, stream_intermediate_steps, stream_subagents, conversation_id, prompt_vars=prompt_vars)
 
+    @staticmethod
+    def _filter_history_for_llm(history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Prepare stored history for the LLM.
+
+        System messages are skipped to avoid duplication, and artifacts are stripped from
+        tool messages since the LLM doesn't need them. Only messages that actually carry an
+        artifact are copied; all others are passed through as-is.
+        """
+        filtered_history = []
+        for msg in history:
+            role = msg.get("role")
+            if role == "system":
+                continue
+            if role == "tool" and "artifact" in msg:
+                msg = {k: v for k, v in msg.items() if k != "artifact"}
+            filtered_history.append(msg)
+        return filtered_history
+
     def _build_messages_with_memory(self, input: str, conversation_id: Optional[str] = None, prompt_vars: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Build messages list including memory history if available.
@@ -2003,29 +2576,13 @@ class Agent(Generic[_ExpectedContentType]):
         messages: List[Dict[str, Any]] = []
         
         # Add system prompt
-        system_prompt = self._build_system_prompt(prompt_vars=prompt_vars)
-        messages.append({"role": "system", "content": system_prompt})
+        messages.append(self._get_system_message(prompt_vars))
         
         # Add conversation history from memory if available
         if self.memory and conversation_id:
             try:
                 history = self.memory.get_messages(conversation_id)
-                # Filter out system messages from history to avoid duplication
-                # Also remove artifacts from tool messages since LLM doesn't need them
-                filtered_history = []
-                for msg in history:
-                    if msg.get("role") == "system":
-                        continue  # Skip system messages
-                    
-                    # Create a copy of the message for LLM
-                    llm_message = msg.copy()
-                    
-                    # Remove artifacts from tool messages - LLM doesn't need them
-                    if msg.get("role") == "tool" and "artifact" in llm_message:
-                        del llm_message["artifact"]
-                    
-                    filtered_history.append(llm_message)
-                
+                filtered_history = self._filter_history_for_llm(history)
                 messages.extend(filtered_history)
                 logger.debug(f"Added {len(filtered_history)} messages from memory for conversation '{conversation_id}' (artifacts filtered out)")
             except Exception as e:
@@ -2051,29 +2608,13 @@ class Agent(Generic[_ExpectedContentType]):
         messages: List[Dict[str, Any]] = []
         
         # Add system prompt
-        system_prompt = self._build_system_prompt(prompt_vars=prompt_vars)
-        messages.append({"role": "system", "content": system_prompt})
+        messages.append(self._get_system_message(prompt_vars))
         
         # Add conversation history from memory if available
         if self.memory and conversation_id:
             try:
                 history = await self.memory.aget_messages(conversation_id)
-                # Filter out system messages from history to avoid duplication
-                # Also remove artifacts from tool messages since LLM doesn't need them
-                filtered_history = []
-                for msg in history:
-                    if msg.get("role") == "system":
-                        continue  # Skip system messages
-                    
-                    # Create a copy of the message for LLM
-                    llm_message = msg.copy()
-                    
-                    # Remove artifacts from tool messages - LLM doesn't need them
-                    if msg.get("role") == "tool" and "artifact" in llm_message:
-                        del llm_message["artifact"]
-                    
-                    filtered_history.append(llm_message)
-                
+                filtered_history = self._filter_history_for_llm(history)
                 messages.extend(filtered_history)
                 logger.debug(f"Added {len(filtered_history)} messages from memory for conversation '{conversation_id}' (artifacts filtered out) (async)")
             except Exception as e:
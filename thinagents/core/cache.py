@@ -0,0 +1,303 @@
+"""
+Response caching for LLM completions.
+
+This module provides a minimal cache interface and an in-process LRU
+implementation that agents can use to skip repeated, deterministic
+completion calls, plus an embedding-based semantic cache for reusing
+answers to identical or paraphrased inputs.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Protocol for cache backends used by the Agent to store LLM responses."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (None means no expiry)."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        ...
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process LRU cache with optional per-entry TTL.
+
+    Entries are evicted in least-recently-used order once ``max_size`` is reached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    tools: Optional[Union[str, List[Dict[str, Any]]]],
+    response_format: Optional[Any] = None,
+    request_options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build a stable sha256 key for a completion request.
+
+    Args:
+        model: Model identifier.
+        messages: The message list sent to the model.
+        tools: Tool schemas sent to the model, or a pre-computed digest of them.
+        response_format: Optional structured output model.
+        request_options: Other settings that change the reply, such as sampling parameters
+            (max_tokens, top_p, seed, stop, ...) and the API endpoint.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "tools": tools,
+        "rf": getattr(response_format, "__name__", None) if response_format else None,
+        "options": request_options,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# Missed-lookup embeddings kept for the store() that usually follows
+_RECENT_EMBEDDINGS = 64
+
+EmbeddingFunction = Callable[[str], List[float]]
+AsyncEmbeddingFunction = Callable[[str], Awaitable[List[float]]]
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class SemanticCache:
+    """
+    Cache of final agent responses keyed by input text.
+
+    Lookups first try an exact match on the input, then fall back to the most similar
+    previously seen input (cosine similarity of embeddings) within the same namespace.
+    A namespace is typically the model plus a hash of the system prompt, so answers
+    are never shared between differently configured agents.
+
+    Embeddings are computed with `litellm.embedding` by default; pass `embed_fn` /
+    `aembed_fn` to use a local or fine-tuned embedder instead.
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "text-embedding-3-small",
+        similarity_threshold: float = 0.92,
+        max_entries: int = 1024,
+        embed_fn: Optional[EmbeddingFunction] = None,
+        aembed_fn: Optional[AsyncEmbeddingFunction] = None,
+        **embedding_kwargs: Any,
+    ):
+        if not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._embed_fn = embed_fn
+        self._aembed_fn = aembed_fn
+        self._embedding_kwargs = embedding_kwargs
+        # key -> (namespace, normalized embedding, value), in LRU order
+        self._entries: "OrderedDict[str, Tuple[str, List[float], Any]]" = OrderedDict()
+        # namespace -> {key: embedding}, so a lookup only scans its own namespace
+        self._namespaces: Dict[str, Dict[str, List[float]]] = {}
+        # Embeddings computed by a missed lookup, reused by the store that follows it
+        self._recent_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(namespace: str, text: str) -> str:
+        return hashlib.blake2b(f"{namespace}\x00{text}".encode()).hexdigest()
+
+    def _embed(self, text: str) -> List[float]:
+        if self._embed_fn is not None:
+            return _normalize(self._embed_fn(text))
+        import litellm
+
+        response = litellm.embedding(model=self.embedding_model, input=[text], **self._embedding_kwargs)
+        return _normalize(response.data[0]["embedding"])
+
+    async def _aembed(self, text: str) -> List[float]:
+        if self._aembed_fn is not None:
+            return _normalize(await self._aembed_fn(text))
+        if self._embed_fn is not None:
+            return _normalize(self._embed_fn(text))
+        import litellm
+
+        response = await litellm.aembedding(model=self.embedding_model, input=[text], **self._embedding_kwargs)
+        return _normalize(response.data[0]["embedding"])
+
+    def _exact(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def _nearest(self, namespace: str, embedding: List[float]) -> Optional[Any]:
+        # Snapshot under the lock, score without it so concurrent callers are not serialized
+        with self._lock:
+            candidates = list(self._namespaces.get(namespace, {}).items())
+        best_key, best_score = None, self.similarity_threshold
+        for key, entry_embedding in candidates:
+            score = sum(map(operator.mul, embedding, entry_embedding))
+            if score >= best_score:
+                best_key, best_score = key, score
+        if best_key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(best_key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return entry[2]
+
+    def _remember_embedding(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._recent_embeddings[key] = embedding
+            while len(self._recent_embeddings) > _RECENT_EMBEDDINGS:
+                self._recent_embeddings.popitem(last=False)
+
+    def _recall_embedding(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            return self._recent_embeddings.pop(key, None)
+
+    def _insert(self, key: str, namespace: str, embedding: List[float], value: Any) -> None:
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous[0] != namespace:
+                self._namespaces[previous[0]].pop(key, None)
+            self._entries[key] = (namespace, embedding, value)
+            self._entries.move_to_end(key)
+            self._namespaces.setdefault(namespace, {})[key] = embedding
+            while len(self._entries) > self.max_entries:
+                evicted_key, (evicted_namespace, _, _) = self._entries.popitem(last=False)
+                namespace_entries = self._namespaces[evicted_namespace]
+                namespace_entries.pop(evicted_key, None)
+                if not namespace_entries:
+                    del self._namespaces[evicted_namespace]
+
+    def lookup(self, namespace: str, text: str) -> Optional[Any]:
+        """Return the cached value for an identical or similar input, or None."""
+        key = self._key(namespace, text)
+        hit = self._exact(key)
+        if hit is not None:
+            return hit
+        try:
+            embedding = self._embed(text)
+            hit = self._nearest(namespace, embedding)
+            if hit is None:
+                self._remember_embedding(key, embedding)
+            return hit
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    async def alookup(self, namespace: str, text: str) -> Optional[Any]:
+        """Async version of lookup."""
+        key = self._key(namespace, text)
+        hit = self._exact(key)
+        if hit is not None:
+            return hit
+        try:
+            embedding = await self._aembed(text)
+            hit = self._nearest(namespace, embedding)
+            if hit is None:
+                self._remember_embedding(key, embedding)
+            return hit
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    def store(self, namespace: str, text: str, value: Any) -> None:
+        """Store value for text within namespace, reusing the embedding from a missed lookup."""
+        key = self._key(namespace, text)
+        embedding = self._recall_embedding(key)
+        if embedding is None:
+            try:
+                embedding = self._embed(text)
+            except Exception as e:
+                logger.warning(f"Semantic cache store failed: {e}")
+                return
+        self._insert(key, namespace, embedding, value)
+
+    async def astore(self, namespace: str, text: str, value: Any) -> None:
+        """Async version of store."""
+        key = self._key(namespace, text)
+        embedding = self._recall_embedding(key)
+        if embedding is None:
+            try:
+                embedding = await self._aembed(text)
+            except Exception as e:
+                logger.warning(f"Semantic cache store failed: {e}")
+                return
+        self._insert(key, namespace, embedding, value)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self._recent_embeddings.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,12 +5,23 @@ This module provides clean integration with MCP servers, allowing agents to use
 external tools through the MCP protocol.
 """
 
+import functools
+import hashlib
+import inspect
+import json
 import logging
 import asyncio
+import os
+import random
+import tempfile
 import time
-from typing import Dict, List, Any, Literal, Optional,  TYPE_CHECKING, TypedDict, Tuple, cast
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import AsyncContextManager, Callable, Deque, Dict, List, Any, Literal, Optional,  TYPE_CHECKING, TypedDict, Tuple, cast
 import secrets
 
+from thinagents.utils.serialization import to_json
+
 if TYPE_CHECKING:
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
@@ -19,11 +30,14 @@ if TYPE_CHECKING:
     # Available in newer mcp client versions; guarded by try/except at runtime
     from mcp.client.streamable_http import streamablehttp_client  # type: ignore
     from litellm import experimental_mcp_client
+    import httpx
 
 try:
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
     from mcp.client.sse import sse_client
+    from mcp.types import TextContent
+    import httpx
     try:
         # Prefer the new Streamable HTTP client when available
         from mcp.client.streamable_http import streamablehttp_client  # type: ignore
@@ -38,11 +52,18 @@ except ImportError:
     StdioServerParameters = None  # type: ignore
     stdio_client = None  # type: ignore
     sse_client = None  # type: ignore
+    TextContent = None  # type: ignore
+    httpx = None  # type: ignore
     streamablehttp_client = None  # type: ignore
     experimental_mcp_client = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # type: ignore # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # === Transport-agnostic server config ================================
 # Supports stdio-spawned servers, legacy HTTP+SSE servers, and the new
@@ -57,7 +78,8 @@ class MCPServerConfig(TypedDict, total=False):
     Required keys by transport:
       • stdio:              command, args
       • sse/http variants:  url
-    Optional keys: transport (defaults to "stdio"), name, headers, env.
+    Optional keys: transport (defaults to "stdio"), name, headers, env, no_share,
+    max_concurrency.
     """
 
     # Publicly support stdio, http (Streamable HTTP per spec), and legacy sse
@@ -73,6 +95,12 @@ class MCPServerConfig(TypedDict, total=False):
     # applied to the spawned process (when supported). For HTTP transports,
     # they are forwarded as headers with the prefix "x-env-".
     env: Dict[str, str]
+    # Set for stateful servers that must not be deduplicated with an
+    # identical config (each entry then gets its own connection).
+    no_share: bool
+    # Maximum number of in-flight tool calls to this server (defaults to
+    # the manager's max_in_flight_per_server).
+    max_concurrency: int
 
 
 class MCPServerConfigWithId(TypedDict, total=False):
@@ -86,6 +114,8 @@ class MCPServerConfigWithId(TypedDict, total=False):
     url: str  # http endpoint
     headers: Dict[str, str]
     env: Dict[str, str]
+    no_share: bool
+    max_concurrency: int
 
 
 class MCPConnectionInfo(TypedDict):
@@ -114,16 +144,285 @@ def ensure_mcp_available():
         )
 
 
+HTTPClientFactory = Callable[..., Any]
+"""Builds the httpx.AsyncClient for HTTP/SSE transports: (headers, timeout, auth) -> client."""
+
+
+def make_http_client_factory(limits: Any = None, http2: Optional[bool] = None) -> HTTPClientFactory:
+    """
+    Build an httpx client factory for the HTTP and SSE transports.
+
+    Args:
+        limits: httpx.Limits bounding the connections kept to each MCP server.
+            Defaults to 500 connections, 100 keep-alive, 30s keep-alive expiry.
+        http2: Negotiate HTTP/2. Defaults to True when the `h2` package is installed.
+
+    Returns:
+        A factory compatible with the `httpx_client_factory` argument of the mcp clients.
+    """
+    ensure_mcp_available()
+    if limits is None:
+        limits = httpx.Limits(max_connections=500, max_keepalive_connections=100, keepalive_expiry=30)
+    use_http2 = HTTP2_AVAILABLE if http2 is None else http2
+
+    def factory(headers: Optional[Dict[str, str]] = None, timeout: Any = None, auth: Any = None) -> Any:
+        return httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.Timeout(30.0),
+            auth=auth,
+            limits=limits,
+            http2=use_http2,
+            follow_redirects=True,
+        )
+
+    return factory
+
+
+ConnectFactory = Callable[[], AsyncContextManager[Any]]
+"""Opens a transport: yields (read, write) or (read, write, get_session_id)."""
+
+
+def _http_connect_factory(
+    client_fn: Any, s_cfg: MCPServerConfigWithId, http_client_factory: Optional[HTTPClientFactory]
+) -> ConnectFactory:
+    kwargs: Dict[str, Any] = {"headers": s_cfg.get("headers")}
+    if http_client_factory is not None:
+        if "httpx_client_factory" in inspect.signature(client_fn).parameters:
+            kwargs["httpx_client_factory"] = http_client_factory
+        else:
+            logger.debug("MCP client does not accept 'httpx_client_factory'; using its default HTTP client")
+    return functools.partial(client_fn, s_cfg["url"], **kwargs)  # type: ignore[index]
+
+
+def _make_connect_factory(
+    s_cfg: MCPServerConfigWithId,
+    http_client_factory: Optional[HTTPClientFactory] = None,
+) -> ConnectFactory:
+    """
+    Resolve a server config into a zero-argument callable that opens its transport.
+
+    The transport dispatch and the stdio parameters are worked out once per server
+    rather than on every connection.
+    """
+    transport = s_cfg.get("transport", "stdio")
+    if transport == "stdio":
+        command_val = cast(str, s_cfg["command"])  # type: ignore[index]
+        args_val = cast(List[str], s_cfg["args"])  # type: ignore[index]
+        # Best-effort support for passing env to the stdio server. Not all
+        # StdioServerParameters implementations support an 'env' kwarg; fall back gracefully.
+        try:
+            server_params_local = StdioServerParameters(
+                command=command_val,
+                args=args_val,
+                env=s_cfg.get("env"),  # type: ignore[arg-type]
+            )
+        except TypeError:
+            logger.debug("StdioServerParameters does not accept 'env'; starting without custom env")
+            server_params_local = StdioServerParameters(
+                command=command_val,
+                args=args_val,
+            )
+        return functools.partial(stdio_client, server_params_local)
+    elif transport == "http":
+        if streamablehttp_client is not None:
+            return _http_connect_factory(streamablehttp_client, s_cfg, http_client_factory)
+        # Best-effort fallback for very old servers – try SSE only if HTTP client is unavailable
+        if sse_client is not None:
+            return _http_connect_factory(sse_client, s_cfg, http_client_factory)
+        raise ValueError("HTTP transport requested but no compatible HTTP client is available.")
+    elif transport == "sse":
+        if sse_client is not None:
+            return _http_connect_factory(sse_client, s_cfg, http_client_factory)
+        raise ValueError("SSE transport requested but SSE client is not available.")
+    raise ValueError(f"Unknown MCP transport '{transport}'.")
+
+
+def _unpack_streams(conn_tuple: Any) -> Tuple[Any, Any]:
+    """Return (read, write) from a transport, which may also yield a session id getter."""
+    try:
+        read, write, _get_session_id = conn_tuple  # type: ignore[misc]
+    except Exception:
+        read, write = conn_tuple  # type: ignore[misc]
+    return read, write
+
+
+def _content_part_text(part: Any) -> str:
+    """Render one part of an MCP tool result as text for the LLM."""
+    if TextContent is not None and type(part) is TextContent:
+        return part.text
+    txt = getattr(part, "text", None)
+    if txt is not None:
+        return txt
+    cont = getattr(part, "content", None)
+    if isinstance(cont, (dict, list)):
+        return to_json(cont)
+    return str(cont) if cont is not None else str(part)
+
+
+class _PooledSession:
+    """
+    A live, initialized MCP ClientSession for one server.
+
+    The transport and session contexts are entered and exited by a dedicated
+    background task: the MCP transports use anyio cancel scopes, which must be
+    closed by the task that opened them, while tool calls come from arbitrary tasks.
+    """
+
+    def __init__(self, server_id: str, connect: ConnectFactory):
+        self.server_id = server_id
+        self._connect = connect
+        self.session: Any = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self._close_event = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def open(self) -> "_PooledSession":
+        loop = asyncio.get_running_loop()
+        ready: "asyncio.Future[Any]" = loop.create_future()
+        self._task = loop.create_task(self._run(ready))
+        self.session = await ready
+        return self
+
+    async def _run(self, ready: "asyncio.Future[Any]") -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                conn_tuple = await stack.enter_async_context(self._connect())
+                read, write = _unpack_streams(conn_tuple)
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                ready.set_result(session)
+                await self._close_event.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e if isinstance(e, Exception) else MCPError(f"MCP session closed: {e!r}"))
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.debug(f"MCP session for {self.server_id} closed with error: {e}")
+            if isinstance(e, asyncio.CancelledError):
+                raise
+
+    @property
+    def closed(self) -> bool:
+        return self._task is None or self._task.done()
+
+    async def aclose(self) -> None:
+        self._close_event.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await self._task
+            except BaseException as e:  # noqa: BLE001 - closing must never raise
+                logger.debug(f"Error while closing MCP session for {self.server_id}: {e}")
+
+
+class MCPSessionPool:
+    """
+    Pool of initialized MCP sessions, keyed by server id.
+
+    Tool calls borrow an idle session instead of spawning a transport and running
+    the initialize handshake on every call. Sessions idle for longer than
+    `health_check_after` seconds are pinged before reuse, and sessions older than
+    `session_ttl` seconds are replaced.
+
+    A pool belongs to a single event loop; when used from a new loop (e.g. a
+    later `asyncio.run`), sessions from the previous loop are dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_ttl: float = 300.0,
+        health_check_after: float = 30.0,
+    ):
+        self._session_ttl = session_ttl
+        self._health_check_after = health_check_after
+        self._idle: Dict[str, Deque[_PooledSession]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                logger.debug("MCP session pool used from a new event loop; dropping stale sessions")
+            self._idle = {}
+            self._locks = {}
+            self._loop = loop
+
+    async def _is_healthy(self, pooled: _PooledSession) -> bool:
+        if pooled.closed:
+            return False
+        now = time.monotonic()
+        if self._session_ttl and now - pooled.created_at > self._session_ttl:
+            return False
+        if self._health_check_after and now - pooled.last_used > self._health_check_after:
+            try:
+                await pooled.session.send_ping()
+            except Exception as e:
+                logger.debug(f"MCP session health check failed: {e}")
+                return False
+        return True
+
+    async def acquire(self, server_id: str, connect: ConnectFactory) -> _PooledSession:
+        """Borrow an idle session for the server, opening one with `connect` if none is usable."""
+        self._bind_loop()
+        lock = self._locks.setdefault(server_id, asyncio.Lock())
+        async with lock:
+            idle = self._idle.setdefault(server_id, deque())
+            while idle:
+                pooled = idle.pop()
+                if await self._is_healthy(pooled):
+                    return pooled
+                await pooled.aclose()
+            logger.debug(f"Opening new pooled MCP session for {server_id}")
+            return await _PooledSession(server_id, connect).open()
+
+    async def release(self, pooled: _PooledSession, *, discard: bool = False) -> None:
+        """Return a borrowed session to the pool, or close it if it may be broken."""
+        if discard or pooled.closed or self._loop is not asyncio.get_running_loop():
+            await pooled.aclose()
+            return
+        pooled.last_used = time.monotonic()
+        self._idle.setdefault(pooled.server_id, deque()).append(pooled)
+
+    async def aclose(self) -> None:
+        """Close all idle sessions."""
+        idle, self._idle = self._idle, {}
+        for sessions in idle.values():
+            for pooled in sessions:
+                await pooled.aclose()
+
+
 class MCPManager:
     """
     Manages MCP server connections and tool loading with automatic cleanup.
     
-    Creates fresh connections for each tool loading request to avoid
-    issues with reusing connections across different async tasks.
+    Tool discovery and tool calls borrow initialized sessions from an
+    MCPSessionPool, so warm calls skip the transport setup and initialize
+    handshake. Call `aclose()` to shut the pooled sessions down.
     """
     
-    def __init__(self, *, max_parallel_calls: int = 10, failure_threshold: int = 3, backoff_seconds: int = 60):
+    def __init__(
+        self,
+        *,
+        max_parallel_calls: int = 10,
+        failure_threshold: int = 3,
+        backoff_seconds: int = 60,
+        max_backoff_seconds: int = 600,
+        session_ttl: float = 300.0,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 86400.0,
+        http_limits: Any = None,
+        http2: Optional[bool] = None,
+        max_in_flight_per_server: int = 5,
+    ):
         self._servers: List[MCPServerConfigWithId] = []
+        self._cache_dir = cache_dir
+        """Directory for persisted tool listings, or None to always discover on startup."""
+        self._cache_ttl = cache_ttl
+        # HTTP/SSE sessions share one connection-limited httpx client config
+        self._http_client_factory = make_http_client_factory(http_limits, http2) if httpx is not None else None
+        self._session_pool = MCPSessionPool(session_ttl=session_ttl)
+        self._connect_factories: Dict[str, ConnectFactory] = {}
         self._tool_cache: Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]] = None
 
         self._semaphore = asyncio.Semaphore(max_parallel_calls)
@@ -131,36 +430,111 @@ class MCPManager:
         We use a semaphore to limit the number of concurrent calls to the MCP servers.
         This is to avoid overwhelming the servers and to avoid rate limiting.
         """
+        self._max_in_flight_per_server = max_in_flight_per_server
+        self._per_server_semaphores: Dict[str, asyncio.Semaphore] = {}
+        """Per-server limits, so one slow server can't take every global slot."""
 
         self._failure_counts: Dict[str, int] = {}
         self._skip_until: Dict[str, float] = {}
+        self._last_backoff: Dict[str, float] = {}
 
         self._failure_threshold = failure_threshold
         self._backoff_seconds = backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
     
     def add_servers(self, servers: List[MCPServerConfigWithId]) -> None:
         """Add MCP servers to be managed."""
         self._servers.extend(servers)
+        for server in servers:
+            limit = server.get("max_concurrency") or self._max_in_flight_per_server
+            self._per_server_semaphores.setdefault(
+                cast(str, server["id"]), asyncio.Semaphore(limit)  # type: ignore[index]
+            )
         self._tool_cache = None
         logger.debug(f"Added {len(servers)} MCP servers and invalidated tool cache")
     
+    def _connect_factory(self, server_config: MCPServerConfigWithId) -> ConnectFactory:
+        """Return the cached transport opener for a server, building it on first use."""
+        server_id = cast(str, server_config["id"])  # type: ignore[index]
+        connect = self._connect_factories.get(server_id)
+        if connect is None:
+            connect = self._connect_factories[server_id] = _make_connect_factory(
+                server_config, self._http_client_factory
+            )
+        return connect
+
+    def _next_backoff(self, server_id: str) -> float:
+        """
+        Pick the next back-off delay using exponential back-off with decorrelated jitter.
+
+        Each delay is drawn between the base delay and three times the previous one
+        (capped), so repeated failures back off quickly while agents sharing a flapping
+        server don't all retry at the same moment.
+        """
+        base = float(self._backoff_seconds)
+        previous = self._last_backoff.get(server_id, base)
+        delay = min(float(self._max_backoff_seconds), random.uniform(base, max(base, previous * 3)))
+        self._last_backoff[server_id] = delay
+        return delay
+
+    def _disk_cache_path(self, server_config: MCPServerConfigWithId) -> Optional[str]:
+        if self._cache_dir is None:
+            return None
+        # The random per-run id is left out so the key is stable across processes;
+        # credentials in env/headers only ever appear hashed
+        stable_config = {k: v for k, v in server_config.items() if k != "id"}
+        key = hashlib.blake2b(json.dumps(stable_config, sort_keys=True, default=str).encode()).hexdigest()
+        return os.path.join(os.path.expanduser(self._cache_dir), f"{key}.json")
+
+    def _read_disk_cache(self, server_config: MCPServerConfigWithId) -> Optional[List[Dict[str, Any]]]:
+        """Return the persisted tool schemas of a server, or None if missing or expired."""
+        path = self._disk_cache_path(server_config)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if self._cache_ttl and time.time() - data["created"] > self._cache_ttl:
+                return None
+            return cast(List[Dict[str, Any]], data["tools"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable MCP tool cache {path}: {e}")
+            return None
+
+    def _write_disk_cache(self, server_config: MCPServerConfigWithId, tools: List[Dict[str, Any]]) -> None:
+        path = self._disk_cache_path(server_config)
+        if path is None:
+            return
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"created": time.time(), "tools": tools}, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to persist MCP tool cache {path}: {e}")
+
     async def load_tools(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
-        Load tools from all configured MCP servers with fresh connections.
-        
-        Each call creates new connections to avoid issues with reusing
-        connections across different async tasks or agent runs.
-        
+        Load tools from all configured MCP servers.
+
+        Servers are contacted concurrently (bounded by `max_parallel_calls`), so cold
+        discovery takes as long as the slowest server rather than the sum of all.
+        The result is cached until servers are added; with a `cache_dir`, tool listings
+        are also persisted so later processes skip discovery for unchanged configs.
+
         Returns:
             Tuple of (tool_schemas, tool_mappings)
         """
         ensure_mcp_available()
 
-        from mcp import ClientSession, StdioServerParameters  # type: ignore
-        from mcp.client.stdio import stdio_client  # type: ignore
-        from mcp.client.sse import sse_client  # type: ignore
-        from litellm import experimental_mcp_client  # type: ignore
-
         if self._tool_cache is not None:
             logger.debug("Returning cached MCP tool schemas/mappings")
             return self._tool_cache
@@ -168,140 +542,68 @@ class MCPManager:
         if not self._servers:
             return [], {}
 
+        results = await asyncio.gather(
+            *(self._load_from_server(server_config) for server_config in self._servers),
+            return_exceptions=True,
+        )
+
         all_schemas: List[Dict[str, Any]] = []
         all_mappings: Dict[str, Any] = {}
-
-        def connection_cm(s_cfg: MCPServerConfigWithId):  # returns an async CM yielding (read, write) or (read, write, get_session_id)
-            transport = s_cfg.get("transport", "stdio")
-            if transport == "stdio":
-                command_val = cast(str, s_cfg["command"])  # type: ignore[index]
-                args_val = cast(List[str], s_cfg["args"])  # type: ignore[index]
-                # Best-effort support for passing env to the stdio server. Not all
-                # StdioServerParameters implementations support an 'env' kwarg; fall back gracefully.
-                try:
-                    server_params_local = StdioServerParameters(
-                        command=command_val,
-                        args=args_val,
-                        env=s_cfg.get("env"),  # type: ignore[arg-type]
-                    )
-                except TypeError:
-                    logger.debug("StdioServerParameters does not accept 'env'; starting without custom env")
-                    server_params_local = StdioServerParameters(
-                        command=command_val,
-                        args=args_val,
-                    )
-                return stdio_client(server_params_local)
-            elif transport == "http":
-                if streamablehttp_client is not None:
-                    return streamablehttp_client(s_cfg["url"], headers=s_cfg.get("headers"))  # type: ignore[arg-type]
-                # Best-effort fallback for very old servers – try SSE only if HTTP client is unavailable
-                if sse_client is not None:
-                    return sse_client(s_cfg["url"], headers=s_cfg.get("headers"))  # type: ignore[arg-type]
-                raise ValueError("HTTP transport requested but no compatible HTTP client is available.")
-            elif transport == "sse":
-                if sse_client is not None:
-                    return sse_client(s_cfg["url"], headers=s_cfg.get("headers"))  # type: ignore[arg-type]
-                raise ValueError("SSE transport requested but SSE client is not available.")
-            raise ValueError(f"Unknown MCP transport '{transport}'.")
-
-        for server_config in self._servers:
+        for server_config, result in zip(self._servers, results):
             server_id = cast(str, server_config["id"])  # type: ignore[index]
-
-            now = time.time()
-            skip_until_ts = self._skip_until.get(server_id)
-            if skip_until_ts and now < skip_until_ts:
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
                 logger.warning(
-                    f"Skipping MCP server {server_id} due to previous failures. Will retry after {int(skip_until_ts - now)}s."
+                    "Failed to load tools from MCP server %s (config=%s): %s. Skipping but continuing with other servers.",
+                    server_id,
+                    server_config,
+                    result,
                 )
                 continue
 
-            logger.debug(f"Creating fresh connection to MCP server {server_id}")
+            schemas, mappings = result
+            for tool_dict in schemas:
+                original_name = tool_dict["function"]["name"]
+                if original_name in all_mappings:
+                    logger.warning(
+                        f"Duplicate MCP tool name '{original_name}' detected while loading from server {server_id}; "
+                        "keeping the first one. Ensure tool names are unique across MCP servers or prefix them explicitly."
+                    )
+                    continue
+                all_schemas.append(tool_dict)
+                all_mappings[original_name] = mappings[original_name]
+
+        self._tool_cache = (all_schemas, all_mappings)
+        return all_schemas, all_mappings
+
+    async def _load_from_server(
+        self, server_config: MCPServerConfigWithId
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Discover the tools of a single server and build their wrappers."""
+        from litellm import experimental_mcp_client  # type: ignore
 
-            try:
-                async with connection_cm(server_config) as conn_tuple:
-                    try:
-                        read, write, _get_session_id = conn_tuple  # type: ignore[misc]
-                    except Exception:
-                        read, write = conn_tuple  # type: ignore[misc]
-                    async with ClientSession(read, write) as session:
-                        await session.initialize()
-                        logger.debug(f"Initialized fresh MCP session for {server_id}")
-
-                        try:
-                            tools = await experimental_mcp_client.load_mcp_tools(
-                                session=session, 
-                                format="openai"
-                            )
-
-                            for tool in tools:
-                                if isinstance(tool, dict) and "function" in tool:
-                                    original_name = tool["function"]["name"]
-                                    
-                                    tool_dict = cast(Dict[str, Any], tool)
-                                    all_schemas.append(tool_dict)
-
-                                    def create_tool_wrapper(s_config, orig_name, sem):
-                                        async def tool_wrapper(*, _s_config=s_config, _orig_name=orig_name, _sem=sem, **kwargs):
-                                            async with _sem:
-                                                async with connection_cm(_s_config) as conn_tuple_inner:
-                                                    try:
-                                                        read_inner, write_inner, _get_session_id_inner = conn_tuple_inner  # type: ignore[misc]
-                                                    except Exception:
-                                                        read_inner, write_inner = conn_tuple_inner  # type: ignore[misc]
-                                                    async with ClientSession(read_inner, write_inner) as session_inner:
-                                                        await session_inner.initialize()
-
-
-                                                        tool_call_dict = {
-                                                            "id": f"call_{_orig_name}_{secrets.token_hex(4)}",
-                                                            "type": "function",
-                                                            "function": {
-                                                                "name": _orig_name,
-                                                                "arguments": __import__('json').dumps(kwargs)
-                                                            }
-                                                        }
-
-                                                        result = await experimental_mcp_client.call_openai_tool(
-                                                            session=session_inner,
-                                                            openai_tool=tool_call_dict  # type: ignore
-                                                        )
-
-                                                        if result.content:
-                                                            first = result.content[0]
-                                                            txt = getattr(first, "text", None)
-                                                            if txt is not None:
-                                                                return txt
-                                                            cont = getattr(first, "content", None)
-                                                            return str(cont) if cont is not None else str(first)
-                                                        return f"Tool {_orig_name} executed successfully"
-
-                                        tool_wrapper.is_async_tool = True  # type: ignore[attr-defined]
-                                        tool_wrapper.__name__ = orig_name
-                                        return tool_wrapper
-
-                                    wrapper = create_tool_wrapper(server_config, original_name, self._semaphore)
-
-                                    if original_name in all_mappings:
-                                        raise ValueError(
-                                            f"Duplicate MCP tool name '{original_name}' detected while loading from server {server_id}. "
-                                            "Ensure tool names are unique across MCP servers or prefix them explicitly."
-                                        )
-
-                                    all_mappings[original_name] = wrapper
-
-                            logger.info(f"Loaded {len(tools)} tools from MCP server {server_id}")
-
-                            self._failure_counts.pop(server_id, None)
-                            self._skip_until.pop(server_id, None)
-
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to load tools from MCP server %s (config=%s): %s. Skipping but continuing with other servers.",
-                                server_id,
-                                server_config,
-                                e,
-                            )
+        server_id = cast(str, server_config["id"])  # type: ignore[index]
 
+        now = time.time()
+        skip_until_ts = self._skip_until.get(server_id)
+        if skip_until_ts and now < skip_until_ts:
+            logger.warning(
+                f"Skipping MCP server {server_id} due to previous failures. Will retry after {int(skip_until_ts - now)}s."
+            )
+            return [], {}
+
+        cached_tools = self._read_disk_cache(server_config)
+        if cached_tools is not None:
+            logger.debug(f"Using persisted tool listing for MCP server {server_id}")
+            return self._build_tool_mappings(server_config, cached_tools)
+
+        async with self._semaphore:
+            try:
+                # The discovery session goes back to the pool afterwards, so the first
+                # tool call on this server reuses it instead of reconnecting
+                pooled = await self._session_pool.acquire(server_id, self._connect_factory(server_config))
+                logger.debug(f"Initialized MCP session for {server_id}")
             except Exception as e:
                 # Connection failure – log as warning without full traceback to keep logs clean.
                 logger.warning(
@@ -314,18 +616,123 @@ class MCPManager:
                 # Increment failure count and maybe back-off
                 self._failure_counts[server_id] = self._failure_counts.get(server_id, 0) + 1
                 if self._failure_counts[server_id] >= self._failure_threshold:
-                    self._skip_until[server_id] = time.time() + self._backoff_seconds
+                    delay = self._next_backoff(server_id)
+                    self._skip_until[server_id] = time.time() + delay
                     logger.warning(
-                        f"MCP server {server_id} failed {self._failure_counts[server_id]} times — backing off for {self._backoff_seconds}s."
+                        f"MCP server {server_id} failed {self._failure_counts[server_id]} times — backing off for {delay:.0f}s."
                     )
-                continue
+                return [], {}
+
+            discard = False
+            try:
+                tools = await experimental_mcp_client.load_mcp_tools(
+                    session=pooled.session,
+                    format="openai"
+                )
+            except BaseException:
+                discard = True
+                raise
+            finally:
+                await self._session_pool.release(pooled, discard=discard)
+
+        logger.info(f"Loaded {len(tools)} tools from MCP server {server_id}")
+
+        self._failure_counts.pop(server_id, None)
+        self._skip_until.pop(server_id, None)
+        self._last_backoff.pop(server_id, None)
+
+        schemas, mappings = self._build_tool_mappings(server_config, tools)
+        self._write_disk_cache(server_config, schemas)
+        return schemas, mappings
+
+    def _build_tool_mappings(
+        self, server_config: MCPServerConfigWithId, tools: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Keep the function tools of a listing and create a wrapper for each."""
+        server_id = cast(str, server_config["id"])  # type: ignore[index]
+        schemas: List[Dict[str, Any]] = []
+        mappings: Dict[str, Any] = {}
+        for tool in tools:
+            if isinstance(tool, dict) and "function" in tool:
+                original_name = tool["function"]["name"]
+                if original_name in mappings:
+                    logger.warning(f"MCP server {server_id} lists tool '{original_name}' more than once; keeping the first")
+                    continue
+                schemas.append(cast(Dict[str, Any], tool))
+                mappings[original_name] = self._create_tool_wrapper(server_config, original_name)
+        return schemas, mappings
+
+    def _create_tool_wrapper(self, server_config: MCPServerConfigWithId, orig_name: str) -> Any:
+        """Build the async callable that runs one MCP tool on a pooled session."""
+        from litellm import experimental_mcp_client  # type: ignore
+
+        semaphore = self._semaphore
+        server_id = cast(str, server_config["id"])  # type: ignore[index]
+        server_semaphore = self._per_server_semaphores.get(server_id)
+        if server_semaphore is None:
+            server_semaphore = self._per_server_semaphores.setdefault(
+                server_id, asyncio.Semaphore(server_config.get("max_concurrency") or self._max_in_flight_per_server)
+            )
+        pool = self._session_pool
+        connect = self._connect_factory(server_config)
+
+        async def tool_wrapper(**kwargs):
+            # Wait for the server's own slot first so calls queued on a slow
+            # server don't hold global slots other servers could use.
+            async with server_semaphore, semaphore:
+                pooled = await pool.acquire(server_id, connect)
+                discard = False
+                try:
+                    tool_call_dict = {
+                        "id": f"call_{orig_name}_{secrets.token_hex(4)}",
+                        "type": "function",
+                        "function": {
+                            "name": orig_name,
+                            "arguments": to_json(kwargs)
+                        }
+                    }
+
+                    result = await experimental_mcp_client.call_openai_tool(
+                        session=pooled.session,
+                        openai_tool=tool_call_dict  # type: ignore
+                    )
+                except BaseException:
+                    # The session may be in an unknown state; don't hand it out again
+                    discard = True
+                    raise
+                finally:
+                    await pool.release(pooled, discard=discard)
+
+                content = result.content
+                if not content:
+                    return f"Tool {orig_name} executed successfully"
+                if len(content) == 1:
+                    return _content_part_text(content[0])
+                return "\n".join(_content_part_text(part) for part in content)
+
+        tool_wrapper.is_async_tool = True  # type: ignore[attr-defined]
+        tool_wrapper.__name__ = orig_name
+        return tool_wrapper
+
+    async def aclose(self) -> None:
+        """Close all pooled MCP sessions (stdio server processes, HTTP connections)."""
+        await self._session_pool.aclose()
+
+
+def _stable_server_id(server_config: MCPServerConfigWithId) -> str:
+    """Derive a server ID from the config. Dict keys (env, headers) are order-independent; args keep their order."""
+    stable_config = {k: v for k, v in server_config.items() if k != "id"}
+    canonical = json.dumps(stable_config, sort_keys=True, separators=(",", ":"), default=str)
+    return "mcp_" + hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
 
-        self._tool_cache = (all_schemas, all_mappings)
-        return all_schemas, all_mappings
-    
 def normalize_mcp_servers(servers: Optional[List[MCPServerConfig]]) -> List[MCPServerConfigWithId]:
     """
-    Normalize MCP server configurations by adding unique IDs.
+    Normalize MCP server configurations and assign each a server ID.
+
+    IDs are derived from a hash of the normalized config, so the same server gets the
+    same ID across calls and agents, and identical entries are collapsed into one.
+    Servers with `no_share` set get a unique ID instead.
     
     Args:
         servers: List of MCP server configurations or None
@@ -337,12 +744,11 @@ def normalize_mcp_servers(servers: Optional[List[MCPServerConfig]]) -> List[MCPS
         return []
     
     normalized: List[MCPServerConfigWithId] = []
+    seen_ids: set = set()
 
     for server in servers:
         transport = server.get("transport", "stdio")
 
-        server_id = f"mcp_{secrets.token_hex(4)}"
-
         if transport == "stdio":
             command = server.get("command")
             args = server.get("args")
@@ -350,7 +756,6 @@ def normalize_mcp_servers(servers: Optional[List[MCPServerConfig]]) -> List[MCPS
                 raise ValueError("stdio MCP server config must include 'command' and 'args'.")
 
             normalized_server: MCPServerConfigWithId = {
-                "id": server_id,
                 "transport": "stdio",
                 "name": server.get("name", ""),
                 "command": command,
@@ -371,21 +776,18 @@ def normalize_mcp_servers(servers: Optional[List[MCPServerConfig]]) -> List[MCPS
                     "Transport 'streamable-http' is deprecated; coercing to 'http'."
                 )
                 normalized_server = {
-                    "id": server_id,
                     "transport": cast(Literal["http"], "http"),
                     "name": server.get("name", ""),
                     "url": url,
                 }
             elif transport == "http":
                 normalized_server = {
-                    "id": server_id,
                     "transport": cast(Literal["http"], "http"),
                     "name": server.get("name", ""),
                     "url": url,
                 }
             else:  # transport == "sse"
                 normalized_server = {
-                    "id": server_id,
                     "transport": cast(Literal["sse"], "sse"),
                     "name": server.get("name", ""),
                     "url": url,
@@ -409,6 +811,23 @@ def normalize_mcp_servers(servers: Optional[List[MCPServerConfig]]) -> List[MCPS
         else:
             raise ValueError(f"Unknown MCP transport '{transport}'.")
 
+        # Part of the hashed config, so entries differing only in their limit stay separate
+        max_concurrency = server.get("max_concurrency")
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError("MCP server 'max_concurrency' must be at least 1.")
+            normalized_server["max_concurrency"] = max_concurrency  # type: ignore[index]
+
+        if server.get("no_share"):
+            normalized_server["no_share"] = True  # type: ignore[index]
+            server_id = f"mcp_{secrets.token_hex(8)}"
+        else:
+            server_id = _stable_server_id(normalized_server)
+        if server_id in seen_ids:
+            logger.debug(f"Ignoring duplicate MCP server config {server_id}")
+            continue
+        seen_ids.add(server_id)
+        normalized_server["id"] = server_id
         normalized.append(normalized_server)
 
     return normalized 
\ No newline at end of file
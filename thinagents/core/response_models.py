@@ -11,7 +11,7 @@ class PromptTokensDetails(BaseModel):
     text_tokens: Optional[int] = Field(None, description="Number of text tokens in the prompt.")
     image_tokens: Optional[int] = Field(None, description="Number of image tokens in the prompt.")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
 
 
 class CompletionTokensDetails(BaseModel):
@@ -21,7 +21,7 @@ class CompletionTokensDetails(BaseModel):
     rejected_prediction_tokens: Optional[int] = Field(None, description="Number of rejected prediction tokens in the completion.")
     text_tokens: Optional[int] = Field(None, description="Number of text tokens in the completion.")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
 
 
 class UsageMetrics(BaseModel):
@@ -31,7 +31,7 @@ class UsageMetrics(BaseModel):
     completion_tokens_details: Optional[CompletionTokensDetails] = Field(None, description="Detailed breakdown of completion tokens.")
     prompt_tokens_details: Optional[PromptTokensDetails] = Field(None, description="Detailed breakdown of prompt tokens.")
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
 
 
 class ThinagentResponse(BaseModel, Generic[_ContentType]):
@@ -4,11 +4,31 @@ Base memory module for ThinAgents providing conversation history storage and ret
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TypedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
 
 logger = logging.getLogger(__name__)
 
 
+def stamp_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the messages with a "timestamp" added to those that lack one.
+
+    The clock is read once per batch, so messages added together share one
+    timestamp; their order is kept by their position in the history.
+    Messages that need a timestamp are copied, the others are returned as is.
+    """
+    timestamp: Optional[str] = None
+    stamped: List[Dict[str, Any]] = []
+    for message in messages:
+        if "timestamp" not in message:
+            if timestamp is None:
+                timestamp = datetime.now(timezone.utc).isoformat()
+            message = {**message, "timestamp": timestamp}
+        stamped.append(message)
+    return stamped
+
+
 class ConversationInfo(TypedDict):
     """Type definition for conversation metadata."""
     conversation_id: str
@@ -187,6 +207,19 @@ class BaseMemory(ABC):
         """
         return len(await self.aget_messages(conversation_id))
     
+    def _contains(self, conversation_id: str) -> bool:
+        """
+        Membership check behind conversation_exists.
+
+        Falls back to scanning all conversation IDs; backends that can look up
+        a single conversation directly should override it.
+        """
+        return conversation_id in self.list_conversation_ids()
+
+    async def _acontains(self, conversation_id: str) -> bool:
+        """Async version of _contains."""
+        return conversation_id in await self.alist_conversation_ids()
+
     def conversation_exists(self, conversation_id: str) -> bool:
         """
         Check if a conversation exists.
@@ -197,7 +230,7 @@ class BaseMemory(ABC):
         Returns:
             True if conversation exists, False otherwise
         """
-        return conversation_id in self.list_conversation_ids()
+        return self._contains(conversation_id)
     
     async def aconversation_exists(self, conversation_id: str) -> bool:
         """
@@ -209,8 +242,49 @@ class BaseMemory(ABC):
         Returns:
             True if conversation exists, False otherwise
         """
-        return conversation_id in await self.alist_conversation_ids()
+        return await self._acontains(conversation_id)
     
+    @staticmethod
+    def _peek_messages(
+        messages: List[Dict[str, Any]],
+    ) -> Tuple[int, Optional[str], Optional[Dict[str, Any]]]:
+        if not messages:
+            return 0, None, None
+        return len(messages), messages[0].get("timestamp"), messages[-1]
+
+    def _peek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        """
+        Return (message_count, created_at, last_message) for a conversation.
+
+        Returns None if the conversation doesn't exist. The default reads the
+        whole history; backends that track this metadata should override it.
+        """
+        if not self._contains(conversation_id):
+            return None
+        return self._peek_messages(self.get_messages(conversation_id))
+
+    async def _apeek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        """Async version of _peek."""
+        if not await self._acontains(conversation_id):
+            return None
+        return self._peek_messages(await self.aget_messages(conversation_id))
+
+    @staticmethod
+    def _info_from_peek(
+        conversation_id: str,
+        peeked: Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]],
+    ) -> Optional[ConversationInfo]:
+        if peeked is None:
+            return None
+        message_count, created_at, last_message = peeked
+        return {
+            "conversation_id": conversation_id,
+            "message_count": message_count,
+            "last_message": last_message,
+            "created_at": created_at,
+            "updated_at": last_message.get("timestamp") if last_message else None,
+        }
+
     def get_conversation_info(self, conversation_id: str) -> Optional[ConversationInfo]:
         """
         Get detailed information about a specific conversation.
@@ -221,30 +295,7 @@ class BaseMemory(ABC):
         Returns:
             ConversationInfo dictionary or None if conversation doesn't exist
         """
-        if not self.conversation_exists(conversation_id):
-            return None
-            
-        messages = self.get_messages(conversation_id)
-        
-        created_at = None
-        updated_at = None
-        last_message = None
-        
-        if messages:
-            last_message = messages[-1]
-            
-            if "timestamp" in messages[0]:
-                created_at = messages[0]["timestamp"]
-            if "timestamp" in last_message:
-                updated_at = last_message["timestamp"]
-        
-        return {
-            "conversation_id": conversation_id,
-            "message_count": len(messages),
-            "last_message": last_message,
-            "created_at": created_at,
-            "updated_at": updated_at,
-        }
+        return self._info_from_peek(conversation_id, self._peek(conversation_id))
     
     async def aget_conversation_info(self, conversation_id: str) -> Optional[ConversationInfo]:
         """
@@ -256,27 +307,4 @@ class BaseMemory(ABC):
         Returns:
             ConversationInfo dictionary or None if conversation doesn't exist
         """
-        if not await self.aconversation_exists(conversation_id):
-            return None
-            
-        messages = await self.aget_messages(conversation_id)
-        
-        created_at = None
-        updated_at = None
-        last_message = None
-        
-        if messages:
-            last_message = messages[-1]
-            
-            if "timestamp" in messages[0]:
-                created_at = messages[0]["timestamp"]
-            if "timestamp" in last_message:
-                updated_at = last_message["timestamp"]
-        
-        return {
-            "conversation_id": conversation_id,
-            "message_count": len(messages),
-            "last_message": last_message,
-            "created_at": created_at,
-            "updated_at": updated_at,
-        } 
\ No newline at end of file
+        return self._info_from_peek(conversation_id, await self._apeek(conversation_id)) 
\ No newline at end of file
@@ -3,16 +3,30 @@ File-based storage for ThinAgents conversation history.
 """
 
 import asyncio
+import copy
+import functools
 import json
 import logging
 import os
-from typing import Any, Dict, List, Literal, Optional
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from datetime import datetime, timezone
 
-from thinagents.memory.base_memory import BaseMemory, ConversationInfo
+from thinagents.memory.base_memory import BaseMemory, ConversationInfo, stamp_messages
 
 logger = logging.getLogger(__name__)
 
+# Characters kept in conversation file names: unicode letters and digits, "_", "-" and "."
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_conversation_id(conversation_id: str) -> str:
+    """Strip characters that are not safe in file names from a conversation ID."""
+    return _UNSAFE_FILENAME_CHARS.sub("", conversation_id)
+
+
 # Check if aiofiles is available
 try:
     import aiofiles  # type: ignore
@@ -32,18 +46,36 @@ class FileMemory(BaseMemory):
     Supports both sync and async operations for optimal performance.
     """
     
-    def __init__(self, storage_dir: str = "./conversations", file_format: Literal["jsonl", "json"] = "jsonl"):
+    def __init__(
+        self,
+        storage_dir: str = "./conversations",
+        file_format: Literal["jsonl", "json"] = "jsonl",
+        cache_size: int = 128,
+    ):
         """
         Initialize the file-based memory store.
         
         Args:
             storage_dir: Directory to store conversation files.
             file_format: The file format to use. Either 'jsonl' (default) or 'json'.
+            cache_size: Number of recently used conversations whose encoded messages are kept
+                in memory, so a read skips the file but still decodes fresh objects. A cached
+                copy is only used while the file's modification time and size are unchanged.
+                Set to 0 to disable.
         """
         self.storage_dir = storage_dir
         if file_format not in ["jsonl", "json"]:
             raise ValueError("file_format must be either 'jsonl' or 'json'")
         self.file_format = file_format
+        self._file_extension = f".{file_format}"
+        # Conversation metadata by id, tagged with the (mtime_ns, size) of the file it
+        # describes. Writes made through this instance update it in place; files changed
+        # by anyone else no longer match their signature and are re-read on demand.
+        self._meta: Dict[str, Tuple[Tuple[int, int], ConversationInfo]] = {}
+        self.cache_size = cache_size
+        # Each message is cached as its JSON text and decoded on every read, so callers
+        # never share (possibly nested) objects with the cache or with each other
+        self._messages_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[str]]]" = OrderedDict()
         
         # Create directory if it doesn't exist
         os.makedirs(storage_dir, exist_ok=True)
@@ -55,28 +87,168 @@ class FileMemory(BaseMemory):
     
     def _get_file_path(self, conversation_id: str) -> str:
         """Get the file path for a conversation."""
-        # Sanitize conversation_id for filesystem
-        safe_id = "".join(c for c in conversation_id if c.isalnum() or c in ('-', '_', '.'))
-        return os.path.join(self.storage_dir, f"{safe_id}.{self.file_format}")
+        return os.path.join(self.storage_dir, f"{_sanitize_conversation_id(conversation_id)}{self._file_extension}")
     
+    @staticmethod
+    def _file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _cached_messages(self, conversation_id: str, signature: Tuple[int, int]) -> Optional[List[Dict[str, Any]]]:
+        cached = self._messages_cache.get(conversation_id)
+        if cached is None or cached[0] != signature:
+            return None
+        self._messages_cache.move_to_end(conversation_id)
+        return json.loads(f"[{','.join(cached[1])}]")
+
+    def _cache_messages(
+        self, conversation_id: str, signature: Optional[Tuple[int, int]], encoded: List[str]
+    ) -> None:
+        if self.cache_size <= 0 or signature is None:
+            return
+        self._messages_cache[conversation_id] = (signature, encoded)
+        self._messages_cache.move_to_end(conversation_id)
+        while len(self._messages_cache) > self.cache_size:
+            self._messages_cache.popitem(last=False)
+
+    def _cache_file_messages(
+        self,
+        conversation_id: str,
+        signature: Tuple[int, int],
+        messages: List[Dict[str, Any]],
+        lines: Optional[List[str]],
+    ) -> None:
+        """Cache a history just read from disk, reusing the JSONL lines when there are any."""
+        if self.cache_size <= 0:
+            return
+        if lines is None:
+            lines = [json.dumps(m, ensure_ascii=False) for m in messages]
+        self._cache_messages(conversation_id, signature, lines)
+
+    def _meta_after_append(
+        self,
+        conversation_id: str,
+        file_path: str,
+        signature_before: Optional[Tuple[int, int]],
+        appended: List[Dict[str, Any]],
+    ) -> None:
+        """Update cached metadata after messages were appended to a conversation file."""
+        cached = self._meta.get(conversation_id)
+        signature = self._file_signature(file_path)
+        cached_messages = self._messages_cache.pop(conversation_id, None)
+        if signature is None or not appended:
+            self._meta.pop(conversation_id, None)
+            return
+        if self.cache_size > 0:
+            encoded = [json.dumps(m, ensure_ascii=False) for m in appended]
+            if signature_before is None:
+                self._cache_messages(conversation_id, signature, encoded)
+            elif cached_messages is not None and cached_messages[0] == signature_before:
+                self._cache_messages(conversation_id, signature, cached_messages[1] + encoded)
+        last_message = copy.deepcopy(appended[-1])
+        if signature_before is None:
+            info: ConversationInfo = {
+                "conversation_id": conversation_id,
+                "message_count": len(appended),
+                "last_message": last_message,
+                "created_at": appended[0].get("timestamp"),
+                "updated_at": last_message.get("timestamp"),
+            }
+        elif cached is not None and cached[0] == signature_before:
+            info = {
+                **cached[1],
+                "message_count": cached[1]["message_count"] + len(appended),
+                "last_message": last_message,
+                "updated_at": last_message.get("timestamp"),
+            }
+        else:
+            # Counts from before the write are unknown; recompute when next needed
+            self._meta.pop(conversation_id, None)
+            return
+        self._meta[conversation_id] = (signature, info)
+
+    def _meta_after_rewrite(self, conversation_id: str, file_path: str, messages: List[Dict[str, Any]]) -> None:
+        """Update cached metadata after a conversation file was rewritten with its full history."""
+        self._meta.pop(conversation_id, None)
+        self._messages_cache.pop(conversation_id, None)
+        self._meta_after_append(conversation_id, file_path, None, messages)
+
+    def _fresh_meta(self, conversation_id: str, stat_result: os.stat_result) -> Optional[ConversationInfo]:
+        cached = self._meta.get(conversation_id)
+        if cached is not None and cached[0] == (stat_result.st_mtime_ns, stat_result.st_size):
+            return {**cached[1], "last_message": copy.deepcopy(cached[1]["last_message"])}
+        return None
+
+    def _conversation_info(self, conversation_id: str, stat_result: os.stat_result) -> ConversationInfo:
+        """Return conversation metadata, reading the file only if it changed since last seen."""
+        info = self._fresh_meta(conversation_id, stat_result)
+        if info is not None:
+            return info
+        return self._store_meta(conversation_id, stat_result, self.get_messages(conversation_id))
+
+    def _store_meta(
+        self, conversation_id: str, stat_result: os.stat_result, messages: List[Dict[str, Any]]
+    ) -> ConversationInfo:
+        """Build metadata from a freshly read history and cache it against the file's signature."""
+        last_message = messages[-1] if messages else None
+        first_message = messages[0] if messages else None
+        info: ConversationInfo = {
+            "conversation_id": conversation_id,
+            "message_count": len(messages),
+            "last_message": last_message,
+            "created_at": first_message.get("timestamp") if first_message else datetime.fromtimestamp(stat_result.st_ctime).isoformat(),
+            "updated_at": last_message.get("timestamp") if last_message else datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+        }
+        self._meta[conversation_id] = ((stat_result.st_mtime_ns, stat_result.st_size), {**info, "last_message": copy.deepcopy(last_message)})
+        return info
+
+    def _peek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        try:
+            stat_result = os.stat(self._get_file_path(conversation_id))
+        except FileNotFoundError:
+            return None
+        info = self._conversation_info(conversation_id, stat_result)
+        return info["message_count"], info["created_at"], info["last_message"]
+
+    async def _apeek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        try:
+            stat_result = os.stat(self._get_file_path(conversation_id))
+        except FileNotFoundError:
+            return None
+        info = self._fresh_meta(conversation_id, stat_result)
+        if info is None:
+            info = self._store_meta(conversation_id, stat_result, await self.aget_messages(conversation_id))
+        return info["message_count"], info["created_at"], info["last_message"]
+
     def get_messages(self, conversation_id: str) -> List[Dict[str, Any]]:
         """Retrieve messages from a file."""
         file_path = self._get_file_path(conversation_id)
         
-        if not os.path.exists(file_path):
+        signature = self._file_signature(file_path)
+        if signature is None:
             logger.debug(f"No file found for conversation '{conversation_id}'")
             return []
+
+        cached = self._cached_messages(conversation_id, signature)
+        if cached is not None:
+            return cached
         
         messages: List[Dict[str, Any]] = []
+        lines: List[str] = []
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 if self.file_format == "jsonl":
-                    messages.extend(json.loads(line) for line in f if line.strip())
+                    lines = [line for line in (raw.strip() for raw in f) if line]
+                    messages = json.loads(f"[{','.join(lines)}]")
                 else:
                     content = f.read()
                     if content:
                         messages = json.loads(content)
             logger.debug(f"Retrieved {len(messages)} messages for conversation '{conversation_id}' from file")
+            self._cache_file_messages(conversation_id, signature, messages, lines if self.file_format == "jsonl" else None)
             return messages
         except (json.JSONDecodeError, IOError) as e:
             logger.error(f"Error reading conversation file '{file_path}': {e}")
@@ -90,23 +262,34 @@ class FileMemory(BaseMemory):
         
         file_path = self._get_file_path(conversation_id)
         
-        if not await aiofiles.os.path.exists(file_path):
+        try:
+            stat_result = await aiofiles.os.stat(file_path)
+        except OSError:
             logger.debug(f"No file found for conversation '{conversation_id}'")
             return []
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        cached = self._cached_messages(conversation_id, signature)
+        if cached is not None:
+            return cached
         
         messages: List[Dict[str, Any]] = []
+        lines: List[str] = []
         try:
             async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                 if self.file_format == "jsonl":
                     async for line in f:
-                        if line.strip():
-                            messages.append(json.loads(line))
+                        line = line.strip()
+                        if line:
+                            lines.append(line)
+                    messages = json.loads(f"[{','.join(lines)}]")
                 else:
                     content = await f.read()
                     if content:
                         messages = json.loads(content)
 
             logger.debug(f"Retrieved {len(messages)} messages for conversation '{conversation_id}' from file (async)")
+            self._cache_file_messages(conversation_id, signature, messages, lines if self.file_format == "jsonl" else None)
             return messages
         except (json.JSONDecodeError, IOError) as e:
             logger.error(f"Error reading conversation file '{file_path}': {e}")
@@ -123,14 +306,17 @@ class FileMemory(BaseMemory):
         try:
             if self.file_format == "jsonl":
                 line_to_write = json.dumps(message, ensure_ascii=False) + "\n"
+                signature_before = self._file_signature(file_path)
                 with open(file_path, 'a', encoding='utf-8') as f:
                     f.write(line_to_write)
+                self._meta_after_append(conversation_id, file_path, signature_before, [message])
                 logger.debug(f"Appended message to conversation '{conversation_id}' file")
             else: # json
                 messages = self.get_messages(conversation_id)
                 messages.append(message)
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(messages, f, indent=2, ensure_ascii=False)
+                self._meta_after_rewrite(conversation_id, file_path, messages)
                 logger.debug(f"Added message to conversation '{conversation_id}' file (total: {len(messages)})")
         except IOError as e:
             logger.error(f"Error writing to conversation file '{file_path}': {e}")
@@ -151,14 +337,17 @@ class FileMemory(BaseMemory):
         try:
             if self.file_format == "jsonl":
                 line_to_write = json.dumps(message, ensure_ascii=False) + "\n"
+                signature_before = self._file_signature(file_path)
                 async with aiofiles.open(file_path, 'a', encoding='utf-8') as f:
                     await f.write(line_to_write)
+                self._meta_after_append(conversation_id, file_path, signature_before, [message])
                 logger.debug(f"Appended message to conversation '{conversation_id}' file (async)")
             else: # json
                 messages = await self.aget_messages(conversation_id)
                 messages.append(message)
                 async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                     await f.write(json.dumps(messages, indent=2, ensure_ascii=False))
+                self._meta_after_rewrite(conversation_id, file_path, messages)
                 logger.debug(f"Added message to conversation '{conversation_id}' file (total: {len(messages)}) (async)")
         except IOError as e:
             logger.error(f"Error writing to conversation file '{file_path}': {e}")
@@ -171,6 +360,8 @@ class FileMemory(BaseMemory):
         if os.path.exists(file_path):
             try:
                 os.remove(file_path)
+                self._meta.pop(conversation_id, None)
+                self._messages_cache.pop(conversation_id, None)
                 logger.info(f"Cleared conversation '{conversation_id}' (deleted file)")
             except OSError as e:
                 logger.error(f"Error deleting conversation file '{file_path}': {e}")
@@ -190,6 +381,8 @@ class FileMemory(BaseMemory):
         if await aiofiles.os.path.exists(file_path):
             try:
                 await aiofiles.os.remove(file_path)
+                self._meta.pop(conversation_id, None)
+                self._messages_cache.pop(conversation_id, None)
                 logger.info(f"Cleared conversation '{conversation_id}' (deleted file) (async)")
             except OSError as e:
                 logger.error(f"Error deleting conversation file '{file_path}': {e}")
@@ -197,20 +390,29 @@ class FileMemory(BaseMemory):
         else:
             logger.warning(f"Conversation file '{file_path}' not found for clearing")
     
-    def list_conversation_ids(self) -> List[str]:
-        """List all conversation IDs by scanning files."""
-        conversations: List[str] = []
+    def _scan_conversation_files(self) -> List[Tuple[str, os.DirEntry]]:
+        """Return (conversation_id, directory entry) for every conversation file."""
+        file_extension = self._file_extension
+        try:
+            with os.scandir(self.storage_dir) as it:
+                return [
+                    (entry.name[:-len(file_extension)], entry)
+                    for entry in it
+                    if entry.name.endswith(file_extension) and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
 
-        if not os.path.exists(self.storage_dir):
-            return conversations
+    def _contains(self, conversation_id: str) -> bool:
+        return os.path.isfile(self._get_file_path(conversation_id))
 
-        file_extension = f".{self.file_format}"
-        conversations.extend(
-            filename[:-len(file_extension)]
-            for filename in os.listdir(self.storage_dir)
-            if filename.endswith(file_extension)
-        )
-        return conversations
+    async def _acontains(self, conversation_id: str) -> bool:
+        # A single stat; not worth a round trip through the thread pool
+        return self._contains(conversation_id)
+
+    def list_conversation_ids(self) -> List[str]:
+        """List all conversation IDs by scanning files."""
+        return [conversation_id for conversation_id, _ in self._scan_conversation_files()]
     
     async def alist_conversation_ids(self) -> List[str]:
         """Async version of list_conversation_ids."""
@@ -224,14 +426,8 @@ class FileMemory(BaseMemory):
             return conversations
 
         try:
-            file_extension = f".{self.file_format}"
-            # aiofiles doesn't have listdir, so we use asyncio.to_thread for this
-            files = await asyncio.to_thread(os.listdir, self.storage_dir)
-            conversations.extend(
-                filename[:-len(file_extension)]
-                for filename in files
-                if filename.endswith(file_extension)
-            )
+            # aiofiles doesn't have scandir, so we use asyncio.to_thread for this
+            conversations.extend(await asyncio.to_thread(self.list_conversation_ids))
         except OSError as e:
             logger.error(f"Error listing conversation files: {e}")
             
@@ -242,22 +438,19 @@ class FileMemory(BaseMemory):
         if not messages:
             return
 
-        processed_messages = []
-        for message in messages:
-            if "timestamp" not in message:
-                m = message.copy()
-                m["timestamp"] = datetime.now(timezone.utc).isoformat()
-                processed_messages.append(m)
-            else:
-                processed_messages.append(message)
+        processed_messages = stamp_messages(messages)
         
         if self.file_format == "jsonl":
             content_to_write = "\n".join(json.dumps(m, ensure_ascii=False) for m in processed_messages) + "\n"
+            file_path = self._get_file_path(conversation_id)
+            signature_before = self._file_signature(file_path)
             self._append_messages_sync(conversation_id, content_to_write)
+            self._meta_after_append(conversation_id, file_path, signature_before, processed_messages)
         else: # json
             existing_messages = self.get_messages(conversation_id)
             all_messages = existing_messages + processed_messages
             self._write_messages_sync(conversation_id, all_messages)
+            self._meta_after_rewrite(conversation_id, self._get_file_path(conversation_id), all_messages)
 
     async def aadd_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
         """
@@ -271,14 +464,7 @@ class FileMemory(BaseMemory):
             return
         
         # Add timestamps to messages that don't have them
-        processed_messages = []
-        for message in messages:
-            if "timestamp" not in message:
-                m = message.copy()
-                m["timestamp"] = datetime.now(timezone.utc).isoformat()
-                processed_messages.append(m)
-            else:
-                processed_messages.append(message)
+        processed_messages = stamp_messages(messages)
 
         if not AIOFILES_AVAILABLE:
             # Fallback to sync version in thread pool
@@ -289,14 +475,17 @@ class FileMemory(BaseMemory):
         try:
             if self.file_format == "jsonl":
                 content_to_write = "\n".join(json.dumps(m, ensure_ascii=False) for m in processed_messages) + "\n"
+                signature_before = self._file_signature(file_path)
                 async with aiofiles.open(file_path, 'a', encoding='utf-8') as f:
                     await f.write(content_to_write)
+                self._meta_after_append(conversation_id, file_path, signature_before, processed_messages)
                 logger.debug(f"Appended {len(messages)} messages to conversation '{conversation_id}' file (async batch)")
             else: # json
                 existing_messages = await self.aget_messages(conversation_id)
                 all_messages = existing_messages + processed_messages
                 async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                     await f.write(json.dumps(all_messages, indent=2, ensure_ascii=False))
+                self._meta_after_rewrite(conversation_id, file_path, all_messages)
                 logger.debug(f"Wrote {len(all_messages)} total messages to conversation '{conversation_id}' file (async batch)")
 
         except IOError as e:
@@ -327,25 +516,11 @@ class FileMemory(BaseMemory):
         """List all conversations with metadata by inspecting files."""
         conversation_infos: List[ConversationInfo] = []
         
-        for conversation_id in self.list_conversation_ids():
-            file_path = self._get_file_path(conversation_id)
+        for conversation_id, entry in self._scan_conversation_files():
             try:
-                stat_result = os.stat(file_path)
-                
-                messages = self.get_messages(conversation_id)
-                
-                message_count = len(messages)
-                last_message = messages[-1] if messages else None
-                first_message = messages[0] if messages else None
-
-                info: ConversationInfo = {
-                    "conversation_id": conversation_id,
-                    "message_count": message_count,
-                    "last_message": last_message,
-                    "created_at": first_message.get("timestamp") if first_message else datetime.fromtimestamp(stat_result.st_ctime).isoformat(),
-                    "updated_at": last_message.get("timestamp") if last_message else datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
-                }
-                conversation_infos.append(info)
+                # DirEntry.stat() is cached from the directory scan where the OS provides it
+                stat_result = entry.stat()
+                conversation_infos.append(dict(self._conversation_info(conversation_id, stat_result)))  # type: ignore[arg-type]
             except (IOError, IndexError, json.JSONDecodeError, FileNotFoundError) as e:
                 logger.warning(f"Could not retrieve metadata for conversation '{conversation_id}': {e}")
 
@@ -369,21 +544,10 @@ class FileMemory(BaseMemory):
             file_path = self._get_file_path(conversation_id)
             try:
                 stat_result = await aiofiles.os.stat(file_path)
-                
-                messages = await self.aget_messages(conversation_id)
-                
-                message_count = len(messages)
-                last_message = messages[-1] if messages else None
-                first_message = messages[0] if messages else None
-
-                info: ConversationInfo = {
-                    "conversation_id": conversation_id,
-                    "message_count": message_count,
-                    "last_message": last_message,
-                    "created_at": first_message.get("timestamp") if first_message else datetime.fromtimestamp(stat_result.st_ctime).isoformat(),
-                    "updated_at": last_message.get("timestamp") if last_message else datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
-                }
-                return info
+                info = self._fresh_meta(conversation_id, stat_result)
+                if info is None:
+                    info = self._store_meta(conversation_id, stat_result, await self.aget_messages(conversation_id))
+                return dict(info)  # type: ignore[return-value]
             except (IOError, IndexError, json.JSONDecodeError, FileNotFoundError) as e:
                 logger.warning(f"Could not retrieve metadata for conversation '{conversation_id}' (async): {e}")
                 return None
@@ -416,8 +580,7 @@ class FileMemory(BaseMemory):
             return
 
         if target_file_path is None:
-            safe_id = "".join(c for c in conversation_id if c.isalnum() or c in ('-', '_', '.'))
-            target_file_path = os.path.join(self.storage_dir, f"{safe_id}.json")
+            target_file_path = os.path.join(self.storage_dir, f"{_sanitize_conversation_id(conversation_id)}.json")
 
         try:
             with open(target_file_path, 'w', encoding='utf-8') as f:
@@ -437,8 +600,7 @@ class FileMemory(BaseMemory):
             return
 
         if target_file_path is None:
-            safe_id = "".join(c for c in conversation_id if c.isalnum() or c in ('-', '_', '.'))
-            target_file_path = os.path.join(self.storage_dir, f"{safe_id}.json")
+            target_file_path = os.path.join(self.storage_dir, f"{_sanitize_conversation_id(conversation_id)}.json")
 
         if not AIOFILES_AVAILABLE:
             await asyncio.to_thread(self.save_as_json, conversation_id, target_file_path)
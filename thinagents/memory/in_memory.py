@@ -4,10 +4,10 @@ In-memory storage for ThinAgents conversation history.
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple, cast
 from datetime import datetime, timezone
 
-from thinagents.memory.base_memory import BaseMemory, ConversationInfo
+from thinagents.memory.base_memory import BaseMemory, ConversationInfo, stamp_messages
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,9 @@ class InMemoryStore(BaseMemory):
                 Defaults to False to avoid unnecessary memory usage.
         """
         self._conversations: Dict[str, List[Dict[str, Any]]] = {}
+        # Conversation metadata, kept up to date on every write so that listings
+        # never have to look at the messages themselves
+        self._meta: Dict[str, ConversationInfo] = {}
         self.store_tool_artifacts = store_tool_artifacts
         self._lock = asyncio.Lock()  # For thread safety in async operations
         logger.debug(f"Initialized InMemoryStore with store_tool_artifacts={store_tool_artifacts}")
@@ -59,6 +62,7 @@ class InMemoryStore(BaseMemory):
             message["timestamp"] = datetime.now(timezone.utc).isoformat()
         
         self._conversations[conversation_id].append(message)
+        self._record_added(conversation_id, [message])
         logger.debug(f"Added message to conversation '{conversation_id}' (total: {len(self._conversations[conversation_id])})")
     
     async def aadd_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
@@ -73,12 +77,14 @@ class InMemoryStore(BaseMemory):
                 message["timestamp"] = datetime.now(timezone.utc).isoformat()
             
             self._conversations[conversation_id].append(message)
+            self._record_added(conversation_id, [message])
             logger.debug(f"Added message to conversation '{conversation_id}' (total: {len(self._conversations[conversation_id])}) (async)")
     
     def clear_conversation(self, conversation_id: str) -> None:
         """Clear a conversation from memory."""
         if conversation_id in self._conversations:
             del self._conversations[conversation_id]
+            self._meta.pop(conversation_id, None)
             logger.info(f"Cleared conversation '{conversation_id}'")
         else:
             logger.warning(f"Conversation '{conversation_id}' not found for clearing")
@@ -88,6 +94,7 @@ class InMemoryStore(BaseMemory):
         async with self._lock:
             if conversation_id in self._conversations:
                 del self._conversations[conversation_id]
+                self._meta.pop(conversation_id, None)
                 logger.info(f"Cleared conversation '{conversation_id}' (async)")
             else:
                 logger.warning(f"Conversation '{conversation_id}' not found for clearing")
@@ -101,67 +108,93 @@ class InMemoryStore(BaseMemory):
         async with self._lock:
             return list(self._conversations.keys())
     
+    def _contains(self, conversation_id: str) -> bool:
+        return conversation_id in self._conversations
+
+    async def _acontains(self, conversation_id: str) -> bool:
+        return conversation_id in self._conversations
+
+    def _record_added(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Update the metadata of a conversation after messages were appended to it."""
+        if not messages:
+            return
+        meta = self._meta.get(conversation_id)
+        if meta is None:
+            meta = self._meta[conversation_id] = {
+                "conversation_id": conversation_id,
+                "message_count": 0,
+                "last_message": None,
+                "created_at": messages[0].get("timestamp"),
+                "updated_at": None,
+            }
+        last_message = messages[-1]
+        meta["message_count"] += len(messages)
+        meta["last_message"] = last_message
+        meta["updated_at"] = last_message.get("timestamp")
+
+    def _peek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        """
+        Return (message_count, created_at, last_message) without touching the history.
+
+        Returns None if the conversation doesn't exist.
+        """
+        if conversation_id not in self._conversations:
+            return None
+        meta = self._meta.get(conversation_id)
+        if meta is None:
+            return 0, None, None
+        return meta["message_count"], meta["created_at"], meta["last_message"]
+
+    async def _apeek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        async with self._lock:
+            return self._peek(conversation_id)
+
+    def _info(self, conversation_id: str) -> Optional[ConversationInfo]:
+        if conversation_id not in self._conversations:
+            return None
+        meta = self._meta.get(conversation_id)
+        if meta is None:
+            return {
+                "conversation_id": conversation_id,
+                "message_count": 0,
+                "last_message": None,
+                "created_at": None,
+                "updated_at": None,
+            }
+        return cast(ConversationInfo, dict(meta))
+
     def list_conversations(self) -> List[ConversationInfo]:
         """List all conversations with detailed metadata."""
-        conversations = []
-        for conversation_id in self._conversations.keys():
-            messages = self._conversations[conversation_id]
-            
-            created_at = None
-            updated_at = None
-            last_message = None
-            
-            if messages:
-                last_message = messages[-1]
-                
-                if "timestamp" in messages[0]:
-                    created_at = messages[0]["timestamp"]
-                if "timestamp" in last_message:
-                    updated_at = last_message["timestamp"]
-            
-            conversations.append({
-                "conversation_id": conversation_id,
-                "message_count": len(messages),
-                "last_message": last_message,
-                "created_at": created_at,
-                "updated_at": updated_at,
-            })
-        
-        return conversations
+        return [cast(ConversationInfo, self._info(conversation_id)) for conversation_id in self._conversations]
     
     async def alist_conversations(self) -> List[ConversationInfo]:
         """Async version of list_conversations."""
         async with self._lock:
-            conversations = []
-            for conversation_id in self._conversations.keys():
-                messages = self._conversations[conversation_id]
-                
-                created_at = None
-                updated_at = None
-                last_message = None
-                
-                if messages:
-                    last_message = messages[-1]
-                    
-                    if "timestamp" in messages[0]:
-                        created_at = messages[0]["timestamp"]
-                    if "timestamp" in last_message:
-                        updated_at = last_message["timestamp"]
-                
-                conversations.append({
-                    "conversation_id": conversation_id,
-                    "message_count": len(messages),
-                    "last_message": last_message,
-                    "created_at": created_at,
-                    "updated_at": updated_at,
-                })
-            
-            return conversations
+            return self.list_conversations()
+
+    def get_conversation_info(self, conversation_id: str) -> Optional[ConversationInfo]:
+        """Get conversation metadata without copying its messages."""
+        return self._info(conversation_id)
+
+    async def aget_conversation_info(self, conversation_id: str) -> Optional[ConversationInfo]:
+        """Async version of get_conversation_info."""
+        async with self._lock:
+            return self._info(conversation_id)
+
+    def get_conversation_length(self, conversation_id: str) -> int:
+        """Get the number of messages in a conversation without copying them."""
+        return len(self._conversations.get(conversation_id, ()))
+
+    async def aget_conversation_length(self, conversation_id: str) -> int:
+        """Async version of get_conversation_length."""
+        async with self._lock:
+            return len(self._conversations.get(conversation_id, ()))
     
     def clear_all(self) -> None:
         """Clear all conversations from memory."""
         count = len(self._conversations)
         self._conversations.clear()
+        self._meta.clear()
         logger.info(f"Cleared all conversations ({count} total)")
     
     async def aclear_all(self) -> None:
@@ -169,9 +202,30 @@ class InMemoryStore(BaseMemory):
         async with self._lock:
             count = len(self._conversations)
             self._conversations.clear()
+            self._meta.clear()
             logger.info(f"Cleared all conversations ({count} total) (async)")
     
     # Optimized batch operations
+    def add_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """
+        Optimized version of add_messages that adds all messages at once.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            messages: List of message dictionaries to store
+        """
+        if not messages:
+            return
+
+        conversation = self._conversations.setdefault(conversation_id, [])
+
+        # Add timestamps to messages that don't have them
+        processed_messages = stamp_messages(messages)
+
+        conversation.extend(processed_messages)
+        self._record_added(conversation_id, processed_messages)
+        logger.debug(f"Added {len(processed_messages)} messages to conversation '{conversation_id}' (total: {len(conversation)}) (batch)")
+
     async def aadd_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
         """
         Optimized async version of add_messages that adds all messages at once.
@@ -188,14 +242,10 @@ class InMemoryStore(BaseMemory):
                 self._conversations[conversation_id] = []
             
             # Add timestamps to messages that don't have them
-            processed_messages = []
-            for message in messages:
-                if "timestamp" not in message:
-                    message = message.copy()
-                    message["timestamp"] = datetime.now(timezone.utc).isoformat()
-                processed_messages.append(message)
+            processed_messages = stamp_messages(messages)
             
             self._conversations[conversation_id].extend(processed_messages)
+            self._record_added(conversation_id, processed_messages)
             logger.debug(f"Added {len(processed_messages)} messages to conversation '{conversation_id}' (total: {len(self._conversations[conversation_id])}) (async batch)")
     
     def get_memory_usage(self) -> Dict[str, Any]:
@@ -2,10 +2,12 @@ import asyncio
 import sqlite3
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from contextlib import contextmanager, asynccontextmanager
 from threading import Lock, local
 from thinagents.memory.base_memory import BaseMemory, ConversationInfo
+from thinagents.utils.serialization import from_json, to_json
 
 logger = logging.getLogger(__name__)
 
@@ -18,15 +20,90 @@ except ImportError:
 
 _thread_local = local()
 
+# Upper bound on remembered conversation_id -> row id mappings per SQLiteMemory
+_CONVERSATION_ID_CACHE_SIZE = 4096
+
+# Message counts are kept on the conversations row by triggers, so listing
+# conversations is a single scan of that table plus one index seek per row
+# for the last message.
+_LIST_CONVERSATIONS_SQL = """
+SELECT
+    c.conversation_id,
+    c.message_count,
+    (SELECT message_json FROM messages WHERE conversation_ref_id = c.id ORDER BY timestamp DESC, id DESC LIMIT 1) as last_message,
+    c.created_at,
+    c.updated_at
+FROM conversations c
+ORDER BY c.updated_at DESC, c.conversation_id ASC;
+"""
+
+
+# Like get_conversation_info's default, created_at and updated_at come from the first and
+# last message, ordered the same way as _SELECT_MESSAGES_SQL
+_PEEK_CONVERSATION_SQL = """
+SELECT
+    c.message_count,
+    (SELECT message_json FROM messages WHERE conversation_ref_id = c.id ORDER BY timestamp ASC, id ASC LIMIT 1) as first_message,
+    (SELECT message_json FROM messages WHERE conversation_ref_id = c.id ORDER BY timestamp DESC, id DESC LIMIT 1) as last_message
+FROM conversations c
+WHERE c.conversation_id = ?;
+"""
+
+
+def _peek_from_row(row: Any) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+    if row is None:
+        return None
+    first_message = from_json(row[1]) if row[1] else None
+    return row[0], first_message.get("timestamp") if first_message else None, from_json(row[2]) if row[2] else None
+
+
+def _conversation_info_from_row(row: Any) -> ConversationInfo:
+    last_message_json = row[2]
+    return {
+        "conversation_id": row[0],
+        "message_count": row[1],
+        "last_message": from_json(last_message_json) if last_message_json else None,
+        "created_at": row[3],
+        "updated_at": row[4],
+    }
+
+# Statements shared by the sync and async code paths. sqlite3 caches prepared
+# statements per connection, keyed by the SQL text.
+_SELECT_CONVERSATION_ID_SQL = "SELECT id FROM conversations WHERE conversation_id = ?"
+_INSERT_CONVERSATION_SQL = "INSERT INTO conversations (conversation_id) VALUES (?)"
+# SQLite 3.35+ returns the new row id from the INSERT itself
+_INSERT_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+if _INSERT_RETURNING:
+    _INSERT_CONVERSATION_SQL += " RETURNING id"
+_INSERT_MESSAGE_SQL = "INSERT INTO messages (conversation_ref_id, message_json, timestamp) VALUES (?, ?, ?)"
+_SELECT_MESSAGES_SQL = "SELECT message_json FROM messages WHERE conversation_ref_id = ? ORDER BY timestamp ASC, id ASC"
+_DELETE_MESSAGES_SQL = "DELETE FROM messages WHERE conversation_ref_id = ?"
+
+
+def _message_rows(conv_db_id: int, messages: List[Dict[str, Any]]) -> List[Tuple[int, str, Optional[str]]]:
+    """Rows for _INSERT_MESSAGE_SQL; only string timestamps are kept for ordering."""
+    rows = []
+    for message in messages:
+        timestamp = message.get("timestamp")
+        rows.append((conv_db_id, to_json(message), timestamp if isinstance(timestamp, str) else None))
+    return rows
+
+
 def get_sync_db_connection(db_path: str) -> sqlite3.Connection:
-    """Get a thread-local synchronous database connection."""
-    if not hasattr(_thread_local, "sqlite_connection"):
+    """Get a thread-local synchronous database connection for db_path."""
+    connections = getattr(_thread_local, "sqlite_connections", None)
+    if connections is None:
+        connections = _thread_local.sqlite_connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
         conn = sqlite3.connect(db_path, check_same_thread=False)
         conn.execute("PRAGMA foreign_keys = ON;")
         conn.execute("PRAGMA journal_mode = WAL;")
         conn.execute("PRAGMA synchronous = NORMAL;")
-        _thread_local.sqlite_connection = conn
-    return _thread_local.sqlite_connection
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA cache_size = -64000;")
+        connections[db_path] = conn
+    return conn
 
 @contextmanager
 def managed_sync_connection(db_path: str):
@@ -58,6 +135,10 @@ class SQLiteMemory(BaseMemory):
                      If ":memory:", an in-memory database will be used.
         """
         self.db_path = db_path
+        # Conversation rows are never deleted (clearing only removes messages),
+        # so a resolved row id stays valid for the lifetime of the store
+        self._conv_id_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._conv_id_cache_lock = Lock()
         
         # Initialize database
         self._init_db()
@@ -75,10 +156,20 @@ class SQLiteMemory(BaseMemory):
             CREATE TABLE IF NOT EXISTS conversations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 conversation_id TEXT UNIQUE NOT NULL,
+                message_count INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """)
+
+            # Databases created before message_count existed: add and backfill it
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(conversations)")}
+            if "message_count" not in columns:
+                cursor.execute("ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("""
+                UPDATE conversations
+                SET message_count = (SELECT COUNT(*) FROM messages WHERE conversation_ref_id = conversations.id)
+                """)
             
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS messages (
@@ -98,108 +189,135 @@ class SQLiteMemory(BaseMemory):
             cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_messages_conversation_ref_id ON messages (conversation_ref_id);
             """)
+            # History reads filter on the conversation and order by (timestamp, id);
+            # this index returns them pre-sorted. It supersedes the old global
+            # timestamp index, which no query used.
             cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_messages_conversation_timestamp ON messages (conversation_ref_id, timestamp, id);
             """)
+            cursor.execute("DROP INDEX IF EXISTS idx_messages_timestamp")
             cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (created_at);
             """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_updated_at ON conversations (updated_at);
+            """)
             
-            # Create trigger to update updated_at
+            # Triggers keeping updated_at and message_count in sync with messages.
+            # They replace the older timestamp-only trigger.
+            cursor.execute("DROP TRIGGER IF EXISTS update_conversation_timestamp")
             cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS update_conversation_timestamp
+            CREATE TRIGGER IF NOT EXISTS conversation_stats_after_insert
             AFTER INSERT ON messages
             BEGIN
                 UPDATE conversations 
-                SET updated_at = CURRENT_TIMESTAMP 
+                SET updated_at = CURRENT_TIMESTAMP,
+                    message_count = message_count + 1
                 WHERE id = NEW.conversation_ref_id;
             END;
             """)
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS conversation_stats_after_delete
+            AFTER DELETE ON messages
+            BEGIN
+                UPDATE conversations 
+                SET message_count = message_count - 1
+                WHERE id = OLD.conversation_ref_id;
+            END;
+            """)
             
             conn.commit()
 
+    def _cached_conversation_db_id(self, conversation_id: str) -> Optional[int]:
+        with self._conv_id_cache_lock:
+            conv_db_id = self._conv_id_cache.get(conversation_id)
+            if conv_db_id is not None:
+                self._conv_id_cache.move_to_end(conversation_id)
+            return conv_db_id
+
+    def _remember_conversation_db_id(self, conversation_id: str, conv_db_id: Optional[int]) -> Optional[int]:
+        if conv_db_id is not None:
+            with self._conv_id_cache_lock:
+                self._conv_id_cache[conversation_id] = conv_db_id
+                self._conv_id_cache.move_to_end(conversation_id)
+                if len(self._conv_id_cache) > _CONVERSATION_ID_CACHE_SIZE:
+                    self._conv_id_cache.popitem(last=False)
+        return conv_db_id
+
     def _get_conversation_db_id(self, conversation_id: str, create_if_not_exists: bool = True) -> Optional[int]:
         """Get the internal DB ID for a conversation_id. Optionally create if not found."""
+        conv_db_id = self._cached_conversation_db_id(conversation_id)
+        if conv_db_id is not None:
+            return conv_db_id
+
         with managed_sync_connection(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id FROM conversations WHERE conversation_id = ?", (conversation_id,))
+            cursor.execute(_SELECT_CONVERSATION_ID_SQL, (conversation_id,))
             row = cursor.fetchone()
             if row:
-                return row[0]
+                return self._remember_conversation_db_id(conversation_id, row[0])
             elif create_if_not_exists:
-                cursor.execute("INSERT INTO conversations (conversation_id) VALUES (?)", (conversation_id,))
+                cursor.execute(_INSERT_CONVERSATION_SQL, (conversation_id,))
+                conv_db_id = cursor.fetchone()[0] if _INSERT_RETURNING else cursor.lastrowid
                 conn.commit()
-                return cursor.lastrowid
+                return self._remember_conversation_db_id(conversation_id, conv_db_id)
+            # Misses are not cached: the conversation may be created later
             return None
 
     async def _aget_conversation_db_id(self, conversation_id: str, create_if_not_exists: bool = True) -> Optional[int]:
         """Async version of _get_conversation_db_id."""
+        conv_db_id = self._cached_conversation_db_id(conversation_id)
+        if conv_db_id is not None:
+            return conv_db_id
+
         if not AIOSQLITE_AVAILABLE:
             return await asyncio.to_thread(self._get_conversation_db_id, conversation_id, create_if_not_exists)
         
         async with aiosqlite.connect(self.db_path) as conn:
             await conn.execute("PRAGMA foreign_keys = ON;")
             cursor = await conn.cursor()
-            await cursor.execute("SELECT id FROM conversations WHERE conversation_id = ?", (conversation_id,))
+            await cursor.execute(_SELECT_CONVERSATION_ID_SQL, (conversation_id,))
             row = await cursor.fetchone()
             if row:
-                return row[0]
+                return self._remember_conversation_db_id(conversation_id, row[0])
             elif create_if_not_exists:
-                await cursor.execute("INSERT INTO conversations (conversation_id) VALUES (?)", (conversation_id,))
+                await cursor.execute(_INSERT_CONVERSATION_SQL, (conversation_id,))
+                conv_db_id = (await cursor.fetchone())[0] if _INSERT_RETURNING else cursor.lastrowid
                 await conn.commit()
-                return cursor.lastrowid
+                return self._remember_conversation_db_id(conversation_id, conv_db_id)
             return None
 
+    def _contains(self, conversation_id: str) -> bool:
+        return self._get_conversation_db_id(conversation_id, create_if_not_exists=False) is not None
+
+    async def _acontains(self, conversation_id: str) -> bool:
+        return await self._aget_conversation_db_id(conversation_id, create_if_not_exists=False) is not None
+
+    def _peek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        with managed_sync_connection(self.db_path) as conn:
+            row = conn.execute(_PEEK_CONVERSATION_SQL, (conversation_id,)).fetchone()
+        return _peek_from_row(row)
+
+    async def _apeek(self, conversation_id: str) -> Optional[Tuple[int, Optional[str], Optional[Dict[str, Any]]]]:
+        if not AIOSQLITE_AVAILABLE:
+            return await asyncio.to_thread(self._peek, conversation_id)
+
+        async with aiosqlite.connect(self.db_path) as conn:
+            cursor = await conn.execute(_PEEK_CONVERSATION_SQL, (conversation_id,))
+            row = await cursor.fetchone()
+        return _peek_from_row(row)
+
     def add_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
         """
         Store a new message in the conversation history.
         """
-        conv_db_id = self._get_conversation_db_id(conversation_id, create_if_not_exists=True)
-        if conv_db_id is None:
-            logger.error(f"Failed to get or create conversation DB ID for {conversation_id}. Message not added.")
-            return
-
-        message_json = json.dumps(message)
-        
-        msg_timestamp_str: Optional[str] = None
-        if "timestamp" in message and isinstance(message["timestamp"], str):
-            msg_timestamp_str = message["timestamp"]
-
-        with managed_sync_connection(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO messages (conversation_ref_id, message_json, timestamp) VALUES (?, ?, ?)",
-                (conv_db_id, message_json, msg_timestamp_str)
-            )
-            conn.commit()
+        self.add_messages(conversation_id, [message])
 
     async def aadd_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
         """
         Async version of add_message.
         """
-        if not AIOSQLITE_AVAILABLE:
-            await asyncio.to_thread(self.add_message, conversation_id, message)
-            return
-        
-        conv_db_id = await self._aget_conversation_db_id(conversation_id, create_if_not_exists=True)
-        if conv_db_id is None:
-            logger.error(f"Failed to get or create conversation DB ID for {conversation_id}. Message not added.")
-            return
-
-        message_json = json.dumps(message)
-        
-        msg_timestamp_str: Optional[str] = None
-        if "timestamp" in message and isinstance(message["timestamp"], str):
-            msg_timestamp_str = message["timestamp"]
-
-        async with aiosqlite.connect(self.db_path) as conn:
-            await conn.execute("PRAGMA foreign_keys = ON;")
-            cursor = await conn.cursor()
-            await cursor.execute(
-                "INSERT INTO messages (conversation_ref_id, message_json, timestamp) VALUES (?, ?, ?)",
-                (conv_db_id, message_json, msg_timestamp_str)
-            )
-            await conn.commit()
+        await self.aadd_messages(conversation_id, [message])
 
     def get_messages(self, conversation_id: str) -> List[Dict[str, Any]]:
         """
@@ -207,23 +325,28 @@ class SQLiteMemory(BaseMemory):
         Messages are returned in chronological order based on their 'timestamp'
         field (if present and sortable), otherwise by insertion order (message.id).
         """
+        return list(self.iter_messages(conversation_id))
+
+    def iter_messages(self, conversation_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the messages of a conversation one at a time, in the same order as get_messages.
+
+        Rows are decoded as the cursor advances, so long histories are never
+        materialized all at once.
+        """
         conv_db_id = self._get_conversation_db_id(conversation_id, create_if_not_exists=False)
         if conv_db_id is None:
-            return []
+            return
 
-        messages_list: List[Dict[str, Any]] = []
         with managed_sync_connection(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT message_json FROM messages WHERE conversation_ref_id = ? ORDER BY timestamp ASC, id ASC",
-                (conv_db_id,)
-            )
-            for row in cursor.fetchall():
+            cursor = conn.execute(_SELECT_MESSAGES_SQL, (conv_db_id,))
+            for row in cursor:
                 try:
-                    messages_list.append(json.loads(row[0]))
+                    message = from_json(row[0])
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to decode message JSON for conversation {conversation_id}: {e} - Data: {row[0][:100]}...")
-        return messages_list
+                    continue
+                yield message
 
     async def aget_messages(self, conversation_id: str) -> List[Dict[str, Any]]:
         """
@@ -240,13 +363,10 @@ class SQLiteMemory(BaseMemory):
         async with aiosqlite.connect(self.db_path) as conn:
             await conn.execute("PRAGMA foreign_keys = ON;")
             cursor = await conn.cursor()
-            await cursor.execute(
-                "SELECT message_json FROM messages WHERE conversation_ref_id = ? ORDER BY timestamp ASC, id ASC",
-                (conv_db_id,)
-            )
+            await cursor.execute(_SELECT_MESSAGES_SQL, (conv_db_id,))
             async for row in cursor:
                 try:
-                    messages_list.append(json.loads(row[0]))
+                    messages_list.append(from_json(row[0]))
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to decode message JSON for conversation {conversation_id}: {e} - Data: {row[0][:100]}...")
         return messages_list
@@ -264,7 +384,7 @@ class SQLiteMemory(BaseMemory):
 
         with managed_sync_connection(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM messages WHERE conversation_ref_id = ?", (conv_db_id,))
+            cursor.execute(_DELETE_MESSAGES_SQL, (conv_db_id,))
             conn.commit()
             logger.info(f"Cleared all messages for conversation ID '{conversation_id}' (DB ID: {conv_db_id}).")
 
@@ -284,7 +404,7 @@ class SQLiteMemory(BaseMemory):
         async with aiosqlite.connect(self.db_path) as conn:
             await conn.execute("PRAGMA foreign_keys = ON;")
             cursor = await conn.cursor()
-            await cursor.execute("DELETE FROM messages WHERE conversation_ref_id = ?", (conv_db_id,))
+            await cursor.execute(_DELETE_MESSAGES_SQL, (conv_db_id,))
             await conn.commit()
             logger.info(f"Cleared all messages for conversation ID '{conversation_id}' (DB ID: {conv_db_id}) (async).")
 
@@ -316,74 +436,48 @@ class SQLiteMemory(BaseMemory):
 
     def list_conversations(self) -> List[ConversationInfo]:
         """List all conversations with metadata using an efficient query."""
-        query = """
-        SELECT
-            c.conversation_id,
-            COUNT(m.id) as message_count,
-            (SELECT message_json FROM messages WHERE conversation_ref_id = c.id ORDER BY created_at DESC LIMIT 1) as last_message,
-            MIN(c.created_at) as created_at,
-            MAX(c.updated_at) as updated_at
-        FROM conversations c
-        LEFT JOIN messages m ON c.id = m.conversation_ref_id
-        GROUP BY c.id
-        ORDER BY updated_at DESC;
-        """
         with managed_sync_connection(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute(query)
+            cursor.execute(_LIST_CONVERSATIONS_SQL)
             rows = cursor.fetchall()
 
-        infos = []
-        for row in rows:
-            last_message_json = row[2]
-            info: ConversationInfo = {
-                "conversation_id": row[0],
-                "message_count": row[1],
-                "last_message": json.loads(last_message_json) if last_message_json else None,
-                "created_at": row[3],
-                "updated_at": row[4],
-            }
-            infos.append(info)
-        
-        return infos
+        return [_conversation_info_from_row(row) for row in rows]
 
     async def alist_conversations(self) -> List[ConversationInfo]:
         """Async version of list_conversations."""
         if not AIOSQLITE_AVAILABLE:
             return await asyncio.to_thread(self.list_conversations)
 
-        query = """
-        SELECT
-            c.conversation_id,
-            COUNT(m.id) as message_count,
-            (SELECT message_json FROM messages WHERE conversation_ref_id = c.id ORDER BY created_at DESC LIMIT 1) as last_message,
-            MIN(c.created_at) as created_at,
-            MAX(c.updated_at) as updated_at
-        FROM conversations c
-        LEFT JOIN messages m ON c.id = m.conversation_ref_id
-        GROUP BY c.id
-        ORDER BY updated_at DESC;
-        """
         async with aiosqlite.connect(self.db_path) as conn:
             cursor = await conn.cursor()
-            await cursor.execute(query)
+            await cursor.execute(_LIST_CONVERSATIONS_SQL)
             rows = await cursor.fetchall()
 
-        infos = []
-        for row in rows:
-            last_message_json = row[2]
-            info: ConversationInfo = {
-                "conversation_id": row[0],
-                "message_count": row[1],
-                "last_message": json.loads(last_message_json) if last_message_json else None,
-                "created_at": row[3],
-                "updated_at": row[4],
-            }
-            infos.append(info)
-        
-        return infos
+        return [_conversation_info_from_row(row) for row in rows]
 
     # Optimized batch operations
+    def add_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """
+        Store several messages with one executemany and a single commit.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            messages: List of message dictionaries to store
+        """
+        if not messages:
+            return
+
+        conv_db_id = self._get_conversation_db_id(conversation_id, create_if_not_exists=True)
+        if conv_db_id is None:
+            logger.error(f"Failed to get or create conversation DB ID for {conversation_id}. Messages not added.")
+            return
+
+        batch_data = _message_rows(conv_db_id, messages)
+        with managed_sync_connection(self.db_path) as conn:
+            conn.executemany(_INSERT_MESSAGE_SQL, batch_data)
+            conn.commit()
+        logger.debug(f"Added {len(messages)} messages to conversation '{conversation_id}' (batch)")
+
     async def aadd_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
         """
         Optimized async version of add_messages that uses batch inserts.
@@ -404,28 +498,22 @@ class SQLiteMemory(BaseMemory):
             logger.error(f"Failed to get or create conversation DB ID for {conversation_id}. Messages not added.")
             return
 
-        # Prepare batch data
-        batch_data = []
-        for message in messages:
-            message_json = json.dumps(message)
-            msg_timestamp_str = message.get("timestamp") if isinstance(message.get("timestamp"), str) else None
-            batch_data.append((conv_db_id, message_json, msg_timestamp_str))
+        batch_data = _message_rows(conv_db_id, messages)
 
         async with aiosqlite.connect(self.db_path) as conn:
             await conn.execute("PRAGMA foreign_keys = ON;")
             cursor = await conn.cursor()
-            await cursor.executemany(
-                "INSERT INTO messages (conversation_ref_id, message_json, timestamp) VALUES (?, ?, ?)",
-                batch_data
-            )
+            await cursor.executemany(_INSERT_MESSAGE_SQL, batch_data)
             await conn.commit()
             logger.debug(f"Added {len(messages)} messages to conversation '{conversation_id}' (batch async)")
 
     def close(self) -> None:
-        """Close the thread-local database connection."""
-        if hasattr(_thread_local, "sqlite_connection"):
-            _thread_local.sqlite_connection.close()
-            del _thread_local.sqlite_connection
+        """Close this thread's connection to the database."""
+        connections = getattr(_thread_local, "sqlite_connections", None)
+        if connections:
+            conn = connections.pop(self.db_path, None)
+            if conn is not None:
+                conn.close()
 
     def __del__(self):
         """Ensure the connection is closed when the object is destroyed."""
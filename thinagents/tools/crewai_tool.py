@@ -192,8 +192,8 @@ class CrewaiTool:
                 raise CrewaiIntegrationError(f"CrewAI async tool execution failed: {e}") from e
         elif self.sync_func:
             # Fallback to running sync version in thread pool
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, self.__call__, *args, **kwargs)
+            # run_in_executor cannot forward keyword arguments, to_thread can
+            return await asyncio.to_thread(self.__call__, *args, **kwargs)
         else:
             raise RuntimeError(
                 f"CrewAI tool '{self.__name__}' does not have an execution method."
@@ -269,7 +269,7 @@ class CrewaiTool:
                         "required": ["input"],
                     }
                 
-                params_schema["required"] = sorted(list(set(params_schema["required"])))
+                params_schema["required"].sort()
 
         # Construct the final OpenAI-compatible schema
         final_schema = {
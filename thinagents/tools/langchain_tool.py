@@ -91,8 +91,8 @@ class LangchainTool:
         if not self.async_func:
             # Fallback to running sync version in a thread if no async version exists
             if self.sync_func:
-                loop = asyncio.get_running_loop()
-                return await loop.run_in_executor(None, self.__call__, *args, **kwargs)
+                # run_in_executor cannot forward keyword arguments, to_thread can
+                return await asyncio.to_thread(self.__call__, *args, **kwargs)
             raise RuntimeError(f"Tool '{self.__name__}' does not have an asynchronous implementation.")
         
         tool_run_args = {k: v for k, v in kwargs.items() if k != "run_manager"}
@@ -160,7 +160,7 @@ class LangchainTool:
                     params_schema["properties"][name] = generate_param_schema(name, param, annotation)
                     if is_required_parameter(param, annotation):
                         params_schema["required"].append(name)
-                params_schema["required"] = sorted(list(set(params_schema["required"])))
+                params_schema["required"].sort()
 
         # Construct the final OpenAI-compatible schema
         final_schema = {
@@ -1,6 +1,7 @@
 import contextlib
 import functools
 import re
+import types
 from typing import (
     Any,
     Callable,
@@ -30,7 +31,7 @@ except ImportError:
 import inspect
 from collections.abc import Sequence, Mapping
 import enum
-from dataclasses import is_dataclass, fields
+from dataclasses import MISSING, is_dataclass, fields
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +119,15 @@ with contextlib.suppress(ImportError):
         IS_PYDANTIC_AVAILABLE = True
 
 
+# Chosen once at import time so pydantic-less installs never pay for the check
+if IS_PYDANTIC_AVAILABLE:
+    def _is_pydantic_model(cls: type) -> bool:
+        return issubclass(cls, _BaseModel)
+else:
+    def _is_pydantic_model(cls: type) -> bool:
+        return False
+
+
 @runtime_checkable
 class ThinAgentsTool(Protocol[P, R]):
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R: ...
@@ -136,20 +146,69 @@ _PRIMITIVE_TYPE_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_type_hints(cls: type) -> Dict[str, Any]:
+    return get_type_hints(cls, include_extras=True)
+
+
+def _type_hints(cls: type) -> Dict[str, Any]:
+    """
+    get_type_hints(cls, include_extras=True), cached per class. Do not mutate the result.
+
+    Tool functions are not cached here (they are often per-agent closures the cache would
+    keep alive); each tool already memoizes its own schema.
+    """
+    try:
+        return _cached_type_hints(cls)
+    except TypeError:
+        return get_type_hints(cls, include_extras=True)
+
+
 def _handle_enum(py_type: Any) -> JSONSchemaType:
     """
     Convert a Python Enum type to a JSON schema representation.
     Handles string, integer, and number enums.
     """
-    values = [e.value for e in py_type]
-    if all(isinstance(v, str) for v in values):
-        return {"type": "string", "enum": values}
-    elif all(isinstance(v, int) for v in values):
-        return {"type": "integer", "enum": values}
-    elif all(isinstance(v, (int, float)) for v in values):
-        return {"type": "number", "enum": values}
-    else:
-        return {"enum": values}
+    return _enum_values_schema([e.value for e in py_type])
+
+def _handle_literal(args: tuple) -> JSONSchemaType:
+    """
+    Convert a Literal type to a JSON schema enum of its values.
+    """
+    return _enum_values_schema(list(args))
+
+_VALUE_KINDS = {str: "string", bool: "boolean", int: "integer", float: "number"}
+
+
+def _value_kind(value: Any) -> Optional[str]:
+    kind = _VALUE_KINDS.get(type(value))
+    if kind is not None:
+        return kind
+    # Subclasses, e.g. values of a str-mixin enum; bool before int as it subclasses it
+    for cls in (bool, str, int, float):
+        if isinstance(value, cls):
+            return _VALUE_KINDS[cls]
+    return None
+
+
+def _enum_values_schema(values: List[Any]) -> JSONSchemaType:
+    """
+    Build an enum schema, typed when all values share one JSON type.
+
+    Integers mixed with floats are typed as "number"; any other mix is left untyped.
+    """
+    kind: Optional[str] = "string" if not values else None
+    for value in values:
+        value_kind = _value_kind(value)
+        if value_kind is None:
+            return {"enum": values}
+        if kind is None or kind == value_kind:
+            kind = value_kind
+        elif {kind, value_kind} == {"integer", "number"}:
+            kind = "number"
+        else:
+            return {"enum": values}
+    return {"type": kind, "enum": values}
 
 def _handle_sequence(py_type: Any, args: tuple) -> JSONSchemaType:
     """
@@ -175,103 +234,237 @@ def _handle_dataclass(py_type: Any) -> JSONSchemaType:
     props = {}
     required = []
     dc_fields = fields(py_type)
-    type_hints_for_dc = get_type_hints(py_type, include_extras=True)
+    type_hints_for_dc = _type_hints(py_type)
 
     for field in dc_fields:
         field_type = type_hints_for_dc.get(field.name, field.type)
         props[field.name] = map_type_to_schema(field_type)
         if _is_required_field(field, field_type):
             required.append(field.name)
+    # Field names are unique, so sorting is enough
+    required.sort()
 
     return {
         "type": "object",
         "properties": props,
-        "required": sorted(list(set(required))),
+        "required": required,
         "additionalProperties": False,
     }
 
+_NONE_TYPE = type(None)
+# Shared by union schemas; map_type_to_schema hands callers copies, never this dict
+_NULL_SCHEMA: JSONSchemaType = {"type": "null"}
+_UNION_ORIGINS = (Union, types.UnionType)
+
+
+def _origin_and_args(py_type: Any) -> Tuple[Any, tuple]:
+    """
+    Equivalent of (get_origin(py_type), get_args(py_type)) for the constructs schemas use.
+
+    Reads the `__origin__` / `__args__` attributes that typing already stores instead of
+    going through the normalizing helpers; only Annotated and PEP 604 unions, which
+    store them differently, are special-cased.
+    """
+    origin = getattr(py_type, "__origin__", None)
+    if origin is None:
+        if isinstance(py_type, types.UnionType):
+            return types.UnionType, py_type.__args__
+        return None, ()
+    metadata = getattr(py_type, "__metadata__", None)
+    if metadata is not None:
+        return Annotated, (origin, *metadata)
+    return origin, getattr(py_type, "__args__", ())
+
+
+def _accepts_none(annotation: Any) -> bool:
+    """Whether an annotation (optionally wrapped in Annotated) is a Union that includes None."""
+    origin, args = _origin_and_args(annotation)
+    if origin is Annotated:
+        origin, args = _origin_and_args(args[0])
+    if origin not in _UNION_ORIGINS:
+        return False
+    for arg in args:
+        if arg is _NONE_TYPE:
+            return True
+    return False
+
+
 def _is_required_field(field: Any, field_type: Any) -> bool:
     """
     Determine if a dataclass field is required based on its default value and type annotation.
     """
-    if field.default is not inspect.Parameter.empty:
+    if field.default is not MISSING or field.default_factory is not MISSING:
         return False
-    origin = get_origin(field_type)
-    args = get_args(field_type)
-    return (origin is not Union or type(None) not in args) and (
-        origin is Union or origin is not Optional
-    )
+    return not _accepts_none(field_type)
 
 def _handle_union(args: tuple) -> JSONSchemaType:
     """
     Convert a Union type (including Optional) to a JSON schema using anyOf.
     """
-    non_none_args = [a for a in args if a is not type(None)]
-    if not non_none_args:
+    # Optional[T], by far the most common shape, needs no scan
+    if len(args) == 2:
+        first, second = args
+        if second is _NONE_TYPE:
+            return {"anyOf": [map_type_to_schema(first), _NULL_SCHEMA]}
+        if first is _NONE_TYPE:
+            return {"anyOf": [map_type_to_schema(second), _NULL_SCHEMA]}
+
+    schemas = []
+    has_none = False
+    for arg in args:
+        if arg is _NONE_TYPE:
+            has_none = True
+        else:
+            schemas.append(map_type_to_schema(arg))
+    if not schemas:
         return {"type": "null"}
-    
-    schemas = [map_type_to_schema(a) for a in non_none_args]
-    if type(None) in args:
-        schemas.append({"type": "null"})
+    if has_none:
+        schemas.append(_NULL_SCHEMA)
     return {"anyOf": schemas}
 
 
+def _copy_schema(schema: Any) -> Any:
+    """Deep-copy the dicts and lists of a JSON schema, sharing the leaf values."""
+    if isinstance(schema, dict):
+        return {k: _copy_schema(v) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return [_copy_schema(v) for v in schema]
+    return schema
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_type_schema(py_type: Any) -> Tuple[JSONSchemaType, bool]:
+    """Return the schema for a type and whether it is flat (no nested dicts or lists)."""
+    schema = _build_type_schema(py_type)
+    return schema, not any(isinstance(v, (dict, list)) for v in schema.values())
+
+
 def map_type_to_schema(py_type: Any) -> JSONSchemaType:
     """
     Main entry point for mapping a Python type annotation to a JSON schema type.
+
+    Schemas are cached per (hashable) type annotation; callers get their own copy
+    and may modify it freely.
     """
-    if py_type in _PRIMITIVE_TYPE_MAP:
-        return _PRIMITIVE_TYPE_MAP[py_type]
+    try:
+        schema, flat = _cached_type_schema(py_type)
+    except TypeError:
+        # Unhashable annotation (e.g. a Literal of lists); build it every time
+        return _copy_schema(_build_type_schema(py_type))
+    # Scalar schemas such as {"type": "string"} only need a shallow copy
+    return schema.copy() if flat else _copy_schema(schema)
+
+
+def _handle_set(args: tuple) -> JSONSchemaType:
+    """
+    Convert a set type to a JSON schema array of unique items.
+    """
+    return {"type": "array", "items": map_type_to_schema(args[0] if args else Any), "uniqueItems": True}
+
+def _handle_mapping(args: tuple) -> JSONSchemaType:
+    """
+    Convert a dict type to a JSON schema object, typing its values when known.
+    """
+    if not args or len(args) != 2:
+        return {"type": "object"}
+    return {"type": "object", "additionalProperties": map_type_to_schema(args[1])}
+
+
+# Handlers for parameterized typing constructs, keyed by their origin. Bare
+# typing aliases (List, Dict, ...) report the builtin as their origin too.
+_ORIGIN_HANDLERS: Dict[Any, Callable[[Any, tuple], JSONSchemaType]] = {
+    list: _handle_sequence,
+    tuple: lambda py_type, args: _handle_tuple(args),
+    set: lambda py_type, args: _handle_set(args),
+    frozenset: lambda py_type, args: _handle_set(args),
+    dict: lambda py_type, args: _handle_mapping(args),
+    Union: lambda py_type, args: _handle_union(args),
+    types.UnionType: lambda py_type, args: _handle_union(args),
+    Literal: lambda py_type, args: _handle_literal(args),
+    Annotated: lambda py_type, args: map_type_to_schema(args[0]),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _pydantic_model_schema(model: type) -> JSONSchemaType:
+    """JSON schema of a Pydantic model class (v2 or v1 API), cached per class. Do not mutate the result."""
+    if hasattr(model, "model_json_schema"):
+        return model.model_json_schema()  # type: ignore
+    if hasattr(model, "schema"):
+        return model.schema()  # type: ignore
+    raise ValueError("Provided pydantic_schema does not have a model_json_schema or schema method.")
+
+
+@functools.lru_cache(maxsize=512)
+def _is_sequence_type(cls: type) -> bool:
+    # issubclass against the collections.abc ABCs goes through __subclasshook__
+    return issubclass(cls, Sequence) and not issubclass(cls, (str, bytes, bytearray))
+
+
+@functools.lru_cache(maxsize=512)
+def _is_mapping_type(cls: type) -> bool:
+    return issubclass(cls, Mapping)
+
+
+def _build_type_schema(py_type: Any) -> JSONSchemaType:
+    try:
+        primitive = _PRIMITIVE_TYPE_MAP.get(py_type)
+    except TypeError:
+        primitive = None
+    if primitive is not None:
+        return primitive
+
+    origin, args = _origin_and_args(py_type)
+    if origin is not None:
+        handler = _ORIGIN_HANDLERS.get(origin)
+        if handler is not None:
+            return handler(py_type, args)
+        # Parameterized ABCs and user generics, e.g. Sequence[int] or Mapping[str, float]
+        if isinstance(origin, type):
+            if _is_sequence_type(origin):
+                return _handle_sequence(py_type, args)
+            if _is_mapping_type(origin):
+                return _handle_mapping(args)
     
     if py_type is Any:
         return {}
     
-    if isinstance(py_type, type) and issubclass(py_type, enum.Enum):
-        return _handle_enum(py_type)
-    
-    if IS_PYDANTIC_AVAILABLE and isinstance(py_type, type) and issubclass(py_type, _BaseModel):
-        try:
-            if _PYDANTIC_V2 and hasattr(py_type, "model_json_schema"):
-                return py_type.model_json_schema()  # type: ignore
-            elif _PYDANTIC_V1 and hasattr(py_type, "schema"):
-                return py_type.schema()  # type: ignore
-        except Exception as e:
-            logger.error(f"Error generating Pydantic schema for {py_type}: {e}", exc_info=True)
-            return {"type": "object"}
-        return {"type": "object"}
+    if isinstance(py_type, type):
+        if issubclass(py_type, enum.Enum):
+            return _handle_enum(py_type)
+
+        if _is_pydantic_model(py_type):
+            try:
+                return _pydantic_model_schema(py_type)
+            except Exception as e:
+                logger.error(f"Error generating Pydantic schema for {py_type}: {e}", exc_info=True)
+                return {"type": "object"}
     
     if is_dataclass(py_type):
         return _handle_dataclass(py_type)
     
-    origin = get_origin(py_type)
-    args = get_args(py_type)
-    
-    if origin in (list, List):
-        return _handle_sequence(py_type, args)
-    
-    if isinstance(py_type, type) and issubclass(py_type, Sequence) and not issubclass(py_type, (str, bytes, bytearray)):
-        return _handle_sequence(py_type, args)
-    
-    if origin in (tuple, Tuple):
-        return _handle_tuple(args)
-    
-    if origin in (set, Set):
-        return {"type": "array", "items": map_type_to_schema(args[0] if args else Any), "uniqueItems": True}
-    
-    if origin in (dict, Dict) or (isinstance(py_type, type) and issubclass(py_type, Mapping)):
-        if not args or len(args) != 2:
+    if isinstance(py_type, type):
+        if _is_sequence_type(py_type):
+            return _handle_sequence(py_type, ())
+        if _is_mapping_type(py_type):
             return {"type": "object"}
-        return {"type": "object", "additionalProperties": map_type_to_schema(args[1])}
-    
-    if origin is Union:
-        return _handle_union(args)
-    
-    if origin is Literal:
-        return _handle_enum(lambda: args)
     
     return {"type": "object"}
 
 
+def _unwrap_annotated(annotation: Any) -> Tuple[Any, Optional[str]]:
+    """Split Annotated[T, "description", ...] into (T, description); other annotations pass through."""
+    origin, args = _origin_and_args(annotation)
+    if origin is not Annotated:
+        return annotation, None
+    base_type, *metadata = args
+    for m in metadata:
+        # Exact type check: description metadata is always a plain str
+        if type(m) is str:
+            return base_type, m
+    return base_type, None
+
+
 def generate_param_schema(param_name: str, param: inspect.Parameter, annotation: Any) -> JSONSchemaType:
     """
     Generate JSON schema for a function parameter.
@@ -298,18 +491,7 @@ def is_required_parameter(param: inspect.Parameter, annotation: Any) -> bool:
     """
     if param.default is not inspect.Parameter.empty:
         return False
-    current_type_to_check = annotation
-    if get_origin(current_type_to_check) is Annotated:
-        args = get_args(current_type_to_check)
-        if args:
-            current_type_to_check = args[0]
-
-    origin = get_origin(current_type_to_check)
-    args = get_args(current_type_to_check)
-
-    return (origin is not Union or type(None) not in args) and (
-        origin is Union or origin is not Optional
-    )
+    return not _accepts_none(annotation)
 
 
 @overload
@@ -319,6 +501,8 @@ def tool(
     return_type: Literal["content", "content_and_artifact"] = "content",
     pydantic_schema: Optional[Any] = None,
     name: Optional[str] = None,
+    io_bound: bool = True,
+    cacheable: bool = False,
 ) -> ThinAgentsTool[P, R]: ...
 
 @overload
@@ -328,6 +512,8 @@ def tool(
     return_type: Literal["content", "content_and_artifact"] = "content",
     pydantic_schema: Optional[Any] = None,
     name: Optional[str] = None,
+    io_bound: bool = True,
+    cacheable: bool = False,
 ) -> Callable[[Callable[P, R]], ThinAgentsTool[P, R]]: ...
 
 def tool(
@@ -336,6 +522,8 @@ def tool(
     return_type: Literal["content", "content_and_artifact"] = "content",
     pydantic_schema: Optional[Any] = None,
     name: Optional[str] = None,
+    io_bound: bool = True,
+    cacheable: bool = False,
 ) -> Union[ThinAgentsTool[P, R], Callable[[Callable[P, R]], ThinAgentsTool[P, R]]]:
     """
     Decorator to register a function as a ThinAgentsTool, optionally specifying the return type and/or a pydantic schema.
@@ -348,18 +536,21 @@ def tool(
             - "content_and_artifact": The tool returns both content and an artifact, where the artifact is something that can be sent downstream.
         pydantic_schema: If provided, should be a Pydantic BaseModel class. The schema will be extracted internally and validated against the function signature.
         name: If provided, use this as the tool's name in the schema and for the wrapper. Otherwise, use the function's name.
+        io_bound: Whether the tool mostly waits on I/O (network, disk, subprocesses). This is the default.
+            Set to False for CPU-bound tools; when a step has several tool calls, the agent
+            then runs them one after another on its own thread instead of in parallel worker
+            threads, where they would only contend for the GIL. tool_timeout cannot interrupt
+            such an inline call.
+        cacheable: Whether the tool's result depends only on its arguments. Results of cacheable
+            tools are reused for identical arguments by agents configured with a `tool_cache`.
 
     Returns:
         A ThinAgentsTool object that can be used to execute the tool.
     """
     if fn_for_tool is None:
-        return lambda fn: tool(fn, return_type=return_type, pydantic_schema=pydantic_schema, name=name)  # type: ignore
-    annotated_desc = ""
-    actual_func = fn_for_tool
-    if get_origin(fn_for_tool) is Annotated:
-        unwrapped_func, *meta = get_args(fn_for_tool)
-        actual_func = unwrapped_func
-        annotated_desc = next((m for m in meta if isinstance(m, str)), "")
+        return lambda fn: tool(fn, return_type=return_type, pydantic_schema=pydantic_schema, name=name, io_bound=io_bound, cacheable=cacheable)  # type: ignore
+    actual_func, annotated_description = _unwrap_annotated(fn_for_tool)
+    annotated_desc = annotated_description or ""
 
     raw_name = name if name is not None else actual_func.__name__
     try:
@@ -379,7 +570,8 @@ def tool(
             )
         origin = get_origin(ret_ann)
         args = get_args(ret_ann)
-        if origin not in (tuple, Tuple) or len(args) != 2:
+        # get_origin normalizes Tuple[...] to tuple
+        if origin is not tuple or len(args) != 2:
             raise ValueError(
                 f"Tool '{tool_name}' declared return_type='content_and_artifact' but return annotation is {ret_ann!r}, expected Tuple[content_type, artifact_type]"
             )
@@ -388,34 +580,47 @@ def tool(
     if pydantic_schema is not None:
         if not IS_PYDANTIC_AVAILABLE:
             raise ImportError("Pydantic is not available. Please install pydantic to use pydantic_schema.")
-        if not (isinstance(pydantic_schema, type) and issubclass(pydantic_schema, _BaseModel)):
+        if not (isinstance(pydantic_schema, type) and _is_pydantic_model(pydantic_schema)):
             raise ValueError("pydantic_schema must be a Pydantic BaseModel class")
-        if hasattr(pydantic_schema, "model_json_schema"):
-            schema_dict = pydantic_schema.model_json_schema()  # type: ignore
-        elif hasattr(pydantic_schema, "schema"):
-            schema_dict = pydantic_schema.schema()  # type: ignore
-        else:
-            raise ValueError("Provided pydantic_schema does not have a model_json_schema or schema method.")
-        if "title" in schema_dict:
-            schema_dict = dict(schema_dict)
-            schema_dict.pop("title")
-
-    @functools.wraps(actual_func)
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
-        # call the actual tool function
-        result = actual_func(*args, **kwargs)
-        # if the tool declares content_and_artifact, enforce a 2-tuple return
-        if return_type == "content_and_artifact" and not (isinstance(result, tuple) and len(result) == 2):
-            raise ValueError(
-                f"Tool '{tool_name}' declared return_type='content_and_artifact' but returned {result!r}"
-            )
-        return result
+        schema_dict = _copy_schema(_pydantic_model_schema(pydantic_schema))
+        schema_dict.pop("title", None)
+
+    # The wrapper is a separate object even when it only forwards: the tool
+    # attributes and sanitized name below must not leak onto the user's function,
+    # which may be registered several times with different options
+    if return_type == "content_and_artifact":
+        @functools.wraps(actual_func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            # call the actual tool function
+            result = actual_func(*args, **kwargs)
+            # the tool declares content_and_artifact, enforce a 2-tuple return
+            if not (isinstance(result, tuple) and len(result) == 2):
+                raise ValueError(
+                    f"Tool '{tool_name}' declared return_type='content_and_artifact' but returned {result!r}"
+                )
+            return result
+    else:
+        @functools.wraps(actual_func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            return actual_func(*args, **kwargs)
 
     # store desired return_type on the wrapper
     wrapper.return_type = return_type  # type: ignore
     wrapper.is_async_tool = is_async_tool # type: ignore
+    wrapper.io_bound = io_bound  # type: ignore
+    wrapper.cacheable = cacheable  # type: ignore
+
+    # The signature is fixed at decoration time, so the schema is built on first
+    # use and the same dict is returned afterwards
+    cached_schema: Optional[Dict[str, Any]] = None
 
     def tool_schema() -> Dict[str, Any]:
+        nonlocal cached_schema
+        if cached_schema is None:
+            cached_schema = _build_tool_schema()
+        return cached_schema
+
+    def _build_tool_schema() -> Dict[str, Any]:
         sig = inspect.signature(actual_func)
         func_doc = inspect.getdoc(actual_func)
         description = annotated_desc or func_doc or ""
@@ -437,15 +642,15 @@ def tool(
                 if annotation is inspect.Parameter.empty:
                     annotation = Any
                 
-                param_def = map_type_to_schema(annotation)
-                
-                if param.default is not inspect.Parameter.empty and param.default is not None:
-                    param_def["default"] = param.default
-                
-                generated_params_schema["properties"][name] = param_def  # type: ignore
+                # Annotated is unwrapped once here; its first string becomes the description
+                base_type, param_description = _unwrap_annotated(annotation)
+                param_schema = generate_param_schema(name, param, base_type)
+                if param_description:
+                    param_schema["description"] = param_description
+                generated_params_schema["properties"][name] = param_schema  # type: ignore
                 if is_required_parameter(param, annotation):
                     generated_params_schema["required"].append(name)
-            generated_params_schema["required"] = sorted(list(set(generated_params_schema["required"])))
+            generated_params_schema["required"].sort()
             params_schema = generated_params_schema
         
         function_schema = {
@@ -0,0 +1,166 @@
+"""
+Compact serialization of tool results for the LLM.
+
+Tool results are appended to the conversation and re-read by the model on every
+following step, so their encoding directly affects prompt size. Besides JSON this
+module supports TOON (Token-Oriented Object Notation) for flat and tabular data,
+and YAML when PyYAML is installed.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, List, Literal, Optional, Union
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def from_json(data: Union[str, bytes]) -> Any:
+    """Decode JSON text with orjson."""
+    return orjson.loads(data)
+
+
+def to_json(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Encode obj as compact JSON with orjson.
+
+    orjson rejects integers wider than 64 bits, so those payloads (and anything else it
+    cannot encode) go through the standard library instead, keeping the output identical
+    to json.dumps rather than failing or stringifying the number.
+    """
+    try:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"))
+
+try:
+    import yaml  # type: ignore
+    YAML_AVAILABLE = True
+except ImportError:
+    yaml = None  # type: ignore[assignment]
+    YAML_AVAILABLE = False
+
+ToolResultFormat = Literal["json", "toon", "yaml"]
+
+TOON_FORMAT_HINT = (
+    "Some tool results are encoded in TOON: `key: value` lines, `key[N]: a,b,c` for lists, "
+    "and `key[N]{f1,f2}:` followed by one comma-separated row per item for tables."
+)
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+_UNQUOTED_STRING = re.compile(r"^[^\s,:\"'\[\]{}#\n\r\t](?:[^,:\"\n\r\t]*[^\s,:\"\n\r\t])?$")
+# Anything a decoder could read back as a number, including forms like ".5", "5." and "+1"
+_NUMBER_LIKE = re.compile(r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$|^[+-]?(?:inf|infinity|nan)$", re.IGNORECASE)
+_RESERVED_WORDS = ("true", "false", "null")
+
+
+class _NotTabular(Exception):
+    """Raised when a value has no compact TOON form and JSON should be used instead."""
+
+
+def _toon_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    text = str(value)
+    if (
+        _UNQUOTED_STRING.match(text)
+        and not _NUMBER_LIKE.match(text)
+        and text.lower() not in _RESERVED_WORDS
+    ):
+        return text
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _toon_key(key: Any) -> str:
+    text = str(key)
+    return text if _UNQUOTED_STRING.match(text) and not _NUMBER_LIKE.match(text) else json.dumps(text, ensure_ascii=False)
+
+
+def _toon_lines(key: Optional[str], value: Any, indent: int) -> List[str]:
+    pad = "  " * indent
+    label = "" if key is None else _toon_key(key)
+
+    if isinstance(value, _PRIMITIVES):
+        if key is None:
+            raise _NotTabular
+        return [f"{pad}{label}: {_toon_scalar(value)}"]
+
+    if isinstance(value, dict):
+        if not value and key is not None:
+            # "key:" alone would read as a missing value
+            return [f"{pad}{label}: {{}}"]
+        lines = [] if key is None else [f"{pad}{label}:"]
+        child_indent = indent if key is None else indent + 1
+        for child_key, child_value in value.items():
+            lines.extend(_toon_lines(child_key, child_value, child_indent))
+        return lines
+
+    if isinstance(value, (list, tuple)):
+        items = list(value)
+        if all(isinstance(item, _PRIMITIVES) for item in items):
+            return [f"{pad}{label}[{len(items)}]: " + ",".join(_toon_scalar(item) for item in items)]
+        if items and all(isinstance(item, dict) for item in items):
+            fields = list(items[0].keys())
+            for item in items:
+                if list(item.keys()) != fields or not all(isinstance(v, _PRIMITIVES) for v in item.values()):
+                    raise _NotTabular
+            header = f"{pad}{label}[{len(items)}]{{{','.join(_toon_key(f) for f in fields)}}}:"
+            rows = [f"{pad}  " + ",".join(_toon_scalar(item[f]) for f in fields) for item in items]
+            return [header, *rows]
+
+    raise _NotTabular
+
+
+def to_toon(value: Any) -> str:
+    """
+    Encode a dict or list in TOON.
+
+    Nested dicts become indented blocks and empty ones are written as `{}`. Strings that
+    would read back as a number, boolean or null, and empty strings, are quoted.
+
+    Raises:
+        ValueError: If the value has no compact TOON form: a bare scalar, a list mixing
+            dicts with other values or nesting lists, or a list of dicts with differing
+            keys or non-scalar values.
+    """
+    try:
+        return "\n".join(_toon_lines(None, value, 0))
+    except _NotTabular as e:
+        raise ValueError("Value has no compact TOON representation") from e
+
+
+def encode_for_llm(
+    value: Any,
+    fmt: ToolResultFormat = "json",
+    json_dumps: Callable[[Any], str] = json.dumps,
+) -> str:
+    """
+    Encode a JSON-compatible tool result in the requested format.
+
+    Values that have no compact form in the requested format (e.g. irregular nested
+    data for TOON, or YAML without PyYAML) fall back to JSON.
+
+    Args:
+        value: The tool result (already converted to plain Python data).
+        fmt: Target format: "json", "toon" or "yaml".
+        json_dumps: JSON encoder used for the JSON output and fallbacks.
+
+    Returns:
+        str: Encoded tool result.
+    """
+    if fmt == "toon" and isinstance(value, (dict, list, tuple)) and value:
+        try:
+            return to_toon(value)
+        except ValueError:
+            pass
+    elif fmt == "yaml" and isinstance(value, (dict, list, tuple)):
+        if YAML_AVAILABLE:
+            return yaml.safe_dump(value, sort_keys=False, allow_unicode=True).rstrip("\n")
+        logger.debug("PyYAML is not installed, falling back to JSON tool results")
+    return json_dumps(value)
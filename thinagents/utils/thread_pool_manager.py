@@ -8,7 +8,8 @@ concurrency control for tool execution.
 
 import asyncio
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, Future, TimeoutError, wait
 from typing import Any, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass
 from contextlib import contextmanager
@@ -17,6 +18,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class ToolNotStartedError(RuntimeError):
+    """Returned in place of a result for a call that could not be submitted to the pool."""
+
 
 @dataclass
 class ThreadPoolConfig:
@@ -109,47 +113,63 @@ class ThreadPoolManager:
         
         Args:
             tool_calls: List of (tool_func, tool_args) tuples
-            timeout: Optional timeout for each tool execution
-            max_concurrent: Maximum number of concurrent executions (defaults to config max_workers)
+            timeout: Optional timeout for each tool execution, counted from when the call
+                gets a slot rather than from the start of the batch
+            max_concurrent: Maximum number of concurrent executions (defaults to all calls at once)
             
         Returns:
-            List of results in the same order as tool_calls
+            List of results in the same order as tool_calls. A call that failed has its
+            exception in place of the result: TimeoutError if it ran past its timeout, or
+            ToolNotStartedError if it could not be submitted at all.
         """
         if not tool_calls:
             return []
 
-        # Submit all tasks
-        future_to_index = {}
-        for i, (tool_func, tool_args) in enumerate(tool_calls):
-            future = self.submit_tool_execution(tool_func, tool_args, timeout)
-            future_to_index[future] = i
-
-        # Collect results
+        # Calls are submitted to the shared executor as slots free up, so max_concurrent
+        # caps how many run at once without creating a smaller pool for this batch
+        limit = max_concurrent if max_concurrent is not None and 0 < max_concurrent < len(tool_calls) else len(tool_calls)
         results: List[Union[Any, Exception]] = [None] * len(tool_calls)
-        exceptions = {}
-
-        try:
-            for future in as_completed(future_to_index.keys(), timeout=timeout):
-                index = future_to_index[future]
+        running: Dict[int, Future] = {}
+        deadlines: Dict[int, float] = {}
+        next_index = 0
+        while next_index < len(tool_calls) or running:
+            while next_index < len(tool_calls) and len(running) < limit:
+                tool_func, tool_args = tool_calls[next_index]
                 try:
-                    results[index] = future.result(timeout=0.1)  # Small timeout since future is done
+                    running[next_index] = self.submit_tool_execution(tool_func, tool_args, timeout)
                 except Exception as e:
-                    exceptions[index] = e
-                    logger.error(f"Tool execution {index} failed: {e}")
-        except Exception as e:
-            logger.error(f"Error in concurrent tool execution: {e}")
-            # Cancel remaining futures
-            for future in future_to_index:
-                if not future.done():
+                    logger.error(f"Tool execution {next_index} could not be submitted: {e}")
+                    for index in range(next_index, len(tool_calls)):
+                        results[index] = ToolNotStartedError(f"Tool execution {index} was not started: {e}")
+                    next_index = len(tool_calls)
+                    break
+                if timeout is not None:
+                    deadlines[next_index] = time.monotonic() + timeout
+                next_index += 1
+            if not running:
+                break
+
+            wait_for = max(0.0, min(deadlines.values()) - time.monotonic()) if timeout is not None else None
+            wait(running.values(), timeout=wait_for, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for index, future in list(running.items()):
+                if future.done():
+                    # Exceptions are included in the results so the caller can handle them
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Tool execution {index} failed: {e}")
+                        results[index] = e
+                elif timeout is not None and deadlines[index] <= now:
+                    # A running future cannot be cancelled; its slot is given up so the
+                    # remaining calls are not held back by a hung tool
                     future.cancel()
-            raise
-
-        # Raise exceptions if any occurred
-        if exceptions:
-            # For now, we'll include exceptions in the results
-            # This allows the caller to handle them appropriately
-            for index, exception in exceptions.items():
-                results[index] = exception
+                    logger.error(f"Tool execution {index} did not finish within {timeout}s")
+                    results[index] = TimeoutError(f"Tool execution {index} timed out after {timeout}s")
+                else:
+                    continue
+                del running[index]
+                deadlines.pop(index, None)
 
         return results
     
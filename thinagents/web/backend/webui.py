@@ -6,8 +6,22 @@ import time
 import sys
 import os
 import signal
+import shutil
+import socket
 from pathlib import Path
 
+_WEB_DIR = Path(__file__).resolve().parent.parent
+_FRONTEND_DIR = _WEB_DIR.parent / "frontend"
+_FRONTEND_SRC = _FRONTEND_DIR / "src"
+_BUILD_DIR = _WEB_DIR / "ui" / "build"
+
+_PNPM = shutil.which("pnpm")
+
+# uvicorn's default "auto" loop/http settings already pick uvloop and httptools
+# when installed (the web extra pulls them in via uvicorn[standard]) and fall
+# back to asyncio/h11 elsewhere, e.g. uvloop on Windows.
+_UVICORN_OPTIONS = {"log_level": "warning", "access_log": False}
+
 
 class WebUI:
     """
@@ -30,21 +44,22 @@ class WebUI:
         self._frontend_process = None
         self._backend_process = None
         self._file_watcher = None
+        self._stop_event = threading.Event()
 
     def run(self, host=None, port=None, open_browser=True, dev_mode=None):
         host = host or self.host
         port = port or self.port
         
-        frontend_src = Path(__file__).parent.parent.parent / "frontend" / "src"
+        has_frontend_src = _FRONTEND_SRC.exists()
         
         if dev_mode is None and self.dev_mode is None:
-            auto_dev = frontend_src.exists()
+            auto_dev = has_frontend_src
             if auto_dev:
-                print(f"🔍 Auto-detected dev mode (found frontend source at {frontend_src})")
+                print(f"🔍 Auto-detected dev mode (found frontend source at {_FRONTEND_SRC})")
         else:
             auto_dev = dev_mode if dev_mode is not None else self.dev_mode
         
-        if auto_dev and frontend_src.exists():
+        if auto_dev and has_frontend_src:
             self._run_dev(host, port, open_browser)
         else:
             self._run_prod(host, port, open_browser)
@@ -54,26 +69,41 @@ class WebUI:
         print(f"\n🚀 ThinAgents Web UI (DEV)\n📍 Backend: http://{host}:{port}\n📍 Frontend: http://{host}:{frontend_port}\n")
         print("🔄 Auto-reload enabled for backend and main script\n")
         
+        frontend_command = self._frontend_command()
+        self._stop_event.clear()
         self._start_file_watcher()
-        self._start_backend(host, port)
-        time.sleep(2)
-        self._start_frontend(host, frontend_port)
+        threading.Thread(
+            target=self._start_frontend_when_ready,
+            args=(host, port, frontend_port, frontend_command, open_browser),
+            daemon=True,
+        ).start()
+
+        # uvicorn runs on the main thread so it can install its own signal handlers
+        # and shut down gracefully. It restores the handlers below when it exits and
+        # re-raises the signal it caught; they only flag the stop so the cleanup
+        # in finally always runs.
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self._stop_event.set())
+        try:
+            self._run_backend(host, port)
+        finally:
+            self._stop_event.set()
+            self.stop()
+        sys.exit(0)
+
+    def _start_frontend_when_ready(self, host, port, frontend_port, frontend_command, open_browser):
+        self._wait_port(host, port)
+        if self._stop_event.is_set():
+            return
+        self._start_frontend(host, frontend_port, frontend_command)
         
         if open_browser:
             threading.Timer(3, lambda: webbrowser.open(f"http://{host}:{frontend_port}")).start()
-        
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.stop()
-            sys.exit(0)
 
     def _run_prod(self, host, port, open_browser):
         from .server import create_app
         
-        build_dir = Path(__file__).parent.parent / "ui" / "build"
-        if not build_dir.exists():
+        if not _BUILD_DIR.exists():
             print("❌ UI build not found! Run: python scripts/build_ui.py")
             sys.exit(1)
 
@@ -83,7 +113,7 @@ class WebUI:
         if open_browser:
             threading.Timer(1.5, lambda: webbrowser.open(f"http://{host}:{port}")).start()
         
-        uvicorn.run(app, host=host, port=port, log_level="warning")
+        uvicorn.run(app, host=host, port=port, **_UVICORN_OPTIONS)
 
     def _start_file_watcher(self):
         try:
@@ -91,24 +121,46 @@ class WebUI:
             from watchdog.events import FileSystemEventHandler
             
             class RestartHandler(FileSystemEventHandler):
-                def __init__(self, script_path):
+                # Editors emit bursts of events per save; restart once they settle
+                debounce = 0.3
+
+                def __init__(self, script_path, restart):
                     self.script_path = script_path
-                    self.last_restart = 0
-                    
+                    self.restart = restart
+                    self._pending = None
+                    self._lock = threading.Lock()
+
+                def _changed(self):
+                    with self._lock:
+                        if self._pending is not None:
+                            self._pending.cancel()
+                        self._pending = threading.Timer(self.debounce, self._restart)
+                        self._pending.daemon = True
+                        self._pending.start()
+
+                def _restart(self):
+                    print(f"\n🔄 Detected change in {Path(self.script_path).name}, restarting...\n")
+                    self.restart()
+
                 def on_modified(self, event):
-                    if event.src_path == self.script_path:
-                        current_time = time.time()
-                        if current_time - self.last_restart > 1:
-                            self.last_restart = current_time
-                            print(f"\n🔄 Detected change in {Path(self.script_path).name}, restarting...\n")
-                            os.kill(os.getpid(), signal.SIGTERM)
+                    if not event.is_directory and event.src_path == self.script_path:
+                        self._changed()
+
+                # Editors that save by writing a temp file and renaming it over
+                # the script produce created/moved events, not modified ones
+                def on_created(self, event):
+                    self.on_modified(event)
+
+                def on_moved(self, event):
+                    if not event.is_directory and event.dest_path == self.script_path:
+                        self._changed()
             
             main_script = sys.argv[0]
             if main_script and os.path.exists(main_script):
                 main_script = os.path.abspath(main_script)
                 watch_dir = os.path.dirname(main_script)
                 
-                event_handler = RestartHandler(main_script)
+                event_handler = RestartHandler(main_script, self._restart)
                 observer = Observer()
                 observer.schedule(event_handler, watch_dir, recursive=False)
                 observer.start()
@@ -117,37 +169,75 @@ class WebUI:
             print("⚠️  watchdog not installed. Main script auto-reload disabled.")
             print("   Install with: pip install 'thinagents[web]' or pip install watchdog")
     
-    def _start_backend(self, host, port):
+    def _restart(self):
+        """Replace the running process with a fresh run of the same script."""
+        if os.name == "nt":
+            # execv on Windows spawns a new process instead of replacing this one
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+        # Free the frontend port and stop the watcher; the backend's listening
+        # socket is not inheritable, so exec releases it
+        self.stop()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+
+    def _run_backend(self, host, port):
         from .server import create_app
         
         app = create_app(self.agent)
-        
-        def run():
-            uvicorn.run(
-                app,
-                host=host,
-                port=port,
-                log_level="warning"
-            )
-        
-        threading.Thread(target=run, daemon=True).start()
+        uvicorn.run(app, host=host, port=port, **_UVICORN_OPTIONS)
 
-    def _start_frontend(self, host, port):
-        frontend_dir = Path(__file__).parent.parent.parent / "frontend"
-        
-        try:
-            self._frontend_process = subprocess.Popen(
-                ["pnpm", "run", "dev", "--host", host, "--port", str(port)],
-                cwd=frontend_dir,
-            )
-        except FileNotFoundError:
-            print("❌ pnpm not found. Install: npm install -g pnpm")
-            sys.exit(1)
+    @staticmethod
+    def _wait_port(host, port, timeout=5.0):
+        """Wait until something accepts connections on host:port; returns False on timeout."""
+        # Wildcard bind addresses are not connectable everywhere; probe loopback instead
+        probe_host = {"0.0.0.0": "127.0.0.1", "::": "::1", "": "127.0.0.1"}.get(host, host)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection((probe_host, port), timeout=0.05):
+                    return True
+            except OSError:
+                time.sleep(0.02)
+        return False
+
+    def _frontend_command(self):
+        # Start the installed vite binary directly; going through `pnpm run dev`
+        # adds a package-manager process and script lookup to every start
+        vite_bin = _FRONTEND_DIR / "node_modules" / ".bin" / ("vite.cmd" if os.name == "nt" else "vite")
+        if vite_bin.exists():
+            return [str(vite_bin), "dev"]
+        if _PNPM is not None:
+            return [_PNPM, "run", "dev"]
+        print("❌ pnpm not found. Install: npm install -g pnpm")
+        sys.exit(1)
+
+    def _start_frontend(self, host, port, command):
+        # A separate session lets stop() signal the dev server and its children together
+        self._frontend_process = subprocess.Popen(
+            [*command, "--host", host, "--port", str(port)],
+            cwd=_FRONTEND_DIR,
+            start_new_session=True,
+        )
+
+    def _signal_frontend(self, force=False):
+        """Terminate (or kill) the frontend's whole process group where supported."""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self._frontend_process.pid, signal.SIGKILL if force else signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        elif force:
+            self._frontend_process.kill()
+        else:
+            self._frontend_process.terminate()
 
     def stop(self):
         if self._file_watcher:
             self._file_watcher.stop()
             self._file_watcher.join()
+            self._file_watcher = None
         
         if self._backend_process:
             self._backend_process.terminate()
@@ -157,10 +247,10 @@ class WebUI:
                 self._backend_process.kill()
         
         if self._frontend_process:
-            self._frontend_process.terminate()
+            self._signal_frontend()
             try:
                 self._frontend_process.wait(timeout=5)
             except subprocess.TimeoutExpired:
-                self._frontend_process.kill()
+                self._signal_frontend(force=True)
         print("✅ Stopped")
 